@@ -0,0 +1,120 @@
+"""
+Benchmark of ANSI escape stripping on a 1 MB colored screen dump.
+
+Compares the shared strip_ansi and AnsiStripper with the previous per-module
+implementations (char-by-char loop, index walking loop and the lab7 regex).
+Run from the src folder: python -m benchmarks.ansi_escape_benchmark
+"""
+
+import random
+import re
+from time import perf_counter
+
+from shared.services.ansi_escape import AnsiStripper, strip_ansi
+
+DUMP_SIZE = 1024 * 1024
+CHUNK_SIZE = 4096
+REPEATS = 5
+
+
+def make_screen_dump(size=DUMP_SIZE, seed=0):
+    """
+    :param size: Approximate size of the dump in characters.
+    :param seed: Seed for the pseudo random colors.
+    :return: Rows of characters colored per cell with 24-bit escape codes.
+    """
+    rng = random.Random(seed)
+    chars = "@#S%?*+;:,."
+    rows = []
+    total = 0
+    while total < size:
+        cells = []
+        for _ in range(120):
+            r, g, b = rng.randrange(256), rng.randrange(256), rng.randrange(256)
+            cells.append(f"\033[38;2;{r};{g};{b}m{rng.choice(chars)}\033[0m")
+        row = "".join(cells)
+        rows.append(row)
+        total += len(row) + 1
+    return "\n".join(rows)
+
+
+def legacy_char_loop(string):
+    result = []
+    in_ansi_sequence = False
+    for char in string:
+        if char == "\x1b":
+            in_ansi_sequence = True
+        elif in_ansi_sequence and char == "m":
+            in_ansi_sequence = False
+        elif not in_ansi_sequence:
+            result.append(char)
+    return "".join(result)
+
+
+def legacy_index_walk(screen):
+    stripped_scene = []
+    for line in screen.split("\n"):
+        stripped_line = ""
+        i = 0
+        while i < len(line):
+            if line[i : i + 2] == "\033[":
+                i = line.find("m", i) + 1
+            else:
+                stripped_line += line[i]
+                i += 1
+        stripped_scene.append(stripped_line)
+    return "\n".join(stripped_scene)
+
+
+def legacy_regex(styled_text):
+    ansi_escape_pattern = re.compile(r"\x1B[@-_][0-?]*[ -/]*[@-~]")
+    return ansi_escape_pattern.sub("", styled_text)
+
+
+def streamed(dump):
+    stripper = AnsiStripper()
+    parts = [
+        stripper.feed(dump[index : index + CHUNK_SIZE])
+        for index in range(0, len(dump), CHUNK_SIZE)
+    ]
+    parts.append(stripper.flush())
+    return "".join(parts)
+
+
+def measure(function, data, repeats=REPEATS):
+    """
+    :return: Best time of the repeats in seconds and the function result.
+    """
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = perf_counter()
+        result = function(data)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run():
+    dump = make_screen_dump()
+    dump_bytes = dump.encode("utf-8")
+    expected = legacy_regex(dump)
+    print(f"Screen dump: {len(dump_bytes) / 1024 / 1024:.2f} MB")
+    cases = [
+        ("legacy char loop", legacy_char_loop, dump, 1),
+        ("legacy index walk", legacy_index_walk, dump, 1),
+        ("legacy regex", legacy_regex, dump, REPEATS),
+        ("strip_ansi str", strip_ansi, dump, REPEATS),
+        ("strip_ansi bytes", strip_ansi, dump_bytes, REPEATS),
+        ("AnsiStripper stream", streamed, dump, REPEATS),
+    ]
+    for name, function, data, repeats in cases:
+        elapsed, result = measure(function, data, repeats)
+        if isinstance(result, bytes):
+            result = result.decode("utf-8")
+        status = "ok" if result == expected else "MISMATCH"
+        print(f"{name:<22}{elapsed * 1000:10.2f} ms  {status}")
+
+
+if __name__ == "__main__":
+    run()
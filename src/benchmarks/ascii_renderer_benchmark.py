@@ -0,0 +1,124 @@
+"""
+Benchmark of converting a framebuffer into colored ASCII art.
+
+Compares AsciiRenderer.frame_to_ascii (lookup table and whole-frame painting)
+with the previous per-pixel implementation (PIL resize and grayscale, one
+f-string with a 24-bit escape per character) for grids from 80x24 to 400x120,
+then the time and size of a frame in every color mode.
+Run from the src folder: python -m benchmarks.ascii_renderer_benchmark
+"""
+
+from time import perf_counter
+
+import numpy as np
+from PIL import Image
+
+from labs.lab5.bll.ColorQuantizer import COLOR_MODES
+from labs.lab5.ui.Renderer import AsciiRenderer
+from shared.services.ansi_escape import strip_ansi
+
+ASCII_CHARS = ["@", "#", "S", "%", "?", "*", "+", ";", ":", ",", "."]
+GRIDS = [(80, 24), (160, 48), (240, 72), (320, 96), (400, 120)]
+# framebuffer pixels per character row
+PIXELS_PER_ROW = 10
+REPEATS = 5
+COLOR_PALETTE = [
+    {"r": 255, "g": 0, "b": 0},
+    {"r": 0, "g": 255, "b": 0},
+    {"r": 0, "g": 0, "b": 255},
+    {"r": 255, "g": 255, "b": 0},
+    {"r": 255, "g": 0, "b": 255},
+    {"r": 0, "g": 255, "b": 255},
+]
+
+
+def make_framebuffer(columns, rows, seed=0):
+    """
+    :param columns: Columns of the art the framebuffer is scaled to.
+    :param rows: Rows of the art the framebuffer is scaled to.
+    :param seed: Seed for the pseudo random shapes.
+    :return: Bottom-up RGB framebuffer with a dark background and shaded shapes.
+    """
+    rng = np.random.default_rng(seed)
+    height = rows * PIXELS_PER_ROW
+    width = columns * PIXELS_PER_ROW // 3
+    ys, xs = np.mgrid[0:height, 0:width]
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    palette = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (0, 255, 255)]
+    for color in palette:
+        cx, cy = rng.uniform(0, width), rng.uniform(0, height)
+        radius = rng.uniform(0.15, 0.35) * min(width, height)
+        distance = np.hypot(xs - cx, ys - cy) / radius
+        inside = distance < 1
+        shade = (1 - distance[inside] * 0.7)[:, None]
+        frame[inside] = (np.array(color) * shade).astype(np.uint8)
+    return frame
+
+
+def legacy_frame_to_ascii(renderer, frame):
+    height, width = frame.shape[:2]
+    image = Image.fromarray(frame)
+    scaled_height = renderer.ascii_height
+    scaled_width = int(scaled_height * (width / height) * 3)
+    image = image.resize((scaled_width, scaled_height), Image.NEAREST)
+    pixel_data = np.array(image.convert("L"))
+    color_image = np.array(image)
+
+    def map_pixel_to_ascii(gray_value, color_value):
+        scale = gray_value / 255
+        char = ASCII_CHARS[int(scale * (len(ASCII_CHARS) - 1))]
+        r, g, b = color_value
+        return f"\033[38;2;{r};{g};{b}m{char}\033[0m"
+
+    ascii_image = []
+    for row, color_row in zip(pixel_data[::-1], color_image[::-1]):
+        ascii_image.append("".join(map(map_pixel_to_ascii, row, color_row)))
+    return "\n".join(ascii_image)
+
+
+def measure(function, *args, repeats=REPEATS):
+    """
+    :return: Best time of the repeats in seconds and the function result.
+    """
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = perf_counter()
+        result = function(*args)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run():
+    header = ["legacy ms", "vector ms", "speedup", "KB legacy", "KB vector"]
+    print(f"{'grid':>9}" + "".join(f"{name:>12}" for name in header))
+    for columns, rows in GRIDS:
+        frame = make_framebuffer(columns, rows)
+        height, width = frame.shape[:2]
+        renderer = AsciiRenderer(width, height, rows, ASCII_CHARS)
+        legacy_time, legacy = measure(legacy_frame_to_ascii, renderer, frame)
+        vector_time, vector = measure(renderer.frame_to_ascii, frame)
+        status = "" if strip_ansi(legacy) == strip_ansi(vector) else "  MISMATCH"
+        print(
+            f"{columns:>5}x{rows:<3}{legacy_time * 1000:12.2f}{vector_time * 1000:12.2f}"
+            f"{legacy_time / vector_time:11.1f}x{len(legacy) / 1024:12.1f}"
+            f"{len(vector) / 1024:12.1f}{status}"
+        )
+    print()
+    print(f"{'grid':>9}" + "".join(f"{mode + ' ms':>14}{'KB':>8}" for mode in COLOR_MODES))
+    for columns, rows in GRIDS:
+        frame = make_framebuffer(columns, rows)
+        height, width = frame.shape[:2]
+        line = f"{columns:>5}x{rows:<3}"
+        for mode in COLOR_MODES:
+            renderer = AsciiRenderer(
+                width, height, rows, ASCII_CHARS, COLOR_PALETTE, mode
+            )
+            mode_time, art = measure(renderer.frame_to_ascii, frame)
+            line += f"{mode_time * 1000:14.2f}{len(art.encode()) / 1024:8.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    run()
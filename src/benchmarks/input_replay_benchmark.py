@@ -0,0 +1,77 @@
+"""
+Benchmark and correctness check of the lab5 renderer with a recorded session.
+
+Replays an input recording (saved by the menu option "Specify file to record
+input", <scenes folder>/<name>.input.json) headless with the software
+rasterizer: the scene the session started with is opened, the recorded keys,
+clicks and drags are passed to the controller and every recorded frame is
+drawn again. Prints the time and the hash of every frame and a summary. With
+a second argument, a report of an earlier replay (.json), prints the frames
+that differ from it, an optimization of the renderer must not change them.
+Run from the src folder:
+python -m benchmarks.input_replay_benchmark <recording> [<report to compare>] [--save <report>]
+"""
+
+import json
+import os
+import sys
+from statistics import median
+
+from labs.lab5 import init
+from labs.lab5.bll.InputReplayer import InputReplayer
+from labs.lab5.dal.InputRecording import load_recording
+
+
+def compare(frames, expected_frames):
+    """
+    :return: Indexes of the frames with hashes different from the expected ones.
+    """
+    different = [
+        frame["index"]
+        for frame, expected in zip(frames, expected_frames)
+        if frame["hash"] != expected["hash"]
+    ]
+    if len(frames) != len(expected_frames):
+        different.append(min(len(frames), len(expected_frames)))
+    return different
+
+
+def run(arguments):
+    save_path = None
+    if "--save" in arguments:
+        position = arguments.index("--save")
+        save_path = arguments[position + 1]
+        arguments = arguments[:position] + arguments[position + 2 :]
+    if not arguments:
+        print(__doc__)
+        return 1
+    recording_path = arguments[0]
+    recording = load_recording(recording_path)
+    controller = init.set_up(init.create_scene(), init.settings_path_lab5)
+    replayer = InputReplayer(controller)
+    report = replayer.replay(recording, os.path.dirname(recording_path))
+    frames = report["frames"]
+    print(f"{'frame':>6}{'time s':>10}{'ms':>10}  hash")
+    for frame in frames:
+        print(f"{frame['index']:>6}{frame['time']:10.3f}{frame['ms']:10.2f}  {frame['hash']}")
+    times = [frame["ms"] for frame in frames] or [0.0]
+    print(
+        f"{len(frames)} frames, median {median(times):.2f} ms, max {max(times):.2f} ms, "
+        f"total {sum(times):.1f} ms, commands match: {report['commands_match']}"
+    )
+    if save_path:
+        with open(save_path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=1)
+    if len(arguments) > 1:
+        with open(arguments[1], encoding="utf-8") as file:
+            expected = json.load(file)
+        different = compare(frames, expected["frames"])
+        if different:
+            print(f"Frames different from {arguments[1]}: {different}")
+            return 1
+        print(f"All frames match {arguments[1]}")
+    return 0 if report["commands_match"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(run(sys.argv[1:]))
@@ -0,0 +1,82 @@
+"""
+Benchmark of selecting lab5 figures with the mouse.
+
+Builds scenes of 1k and 10k figures (cubes, pyramids and procedural spheres)
+in front of the camera, clicks random pixels and drags random rectangles with
+the Picker of the scene. Prints the time of the first click (it builds the
+hierarchy of the scene and the triangles of the figures), the median time of
+the next clicks and rectangles, and the number of hits, the same on every run.
+Run from the src folder: python -m benchmarks.picking_benchmark
+"""
+
+from statistics import median
+from time import perf_counter
+
+import numpy as np
+
+from labs.lab5.bll.CameraWrapper import Camera
+from labs.lab5.bll.FigureWrapper import FigureWrapper
+from labs.lab5.bll.Scene import Scene
+
+SIZES = [1000, 10000]
+WIDTH, HEIGHT = 800, 500
+CLICKS = 200
+RECTS = 20
+SEED = 5
+
+
+def create_scene(count, rng):
+    scene = Scene()
+    scene.set_camera(Camera.create((0, 0, 40), (0, 0, 0), (0, 1, 0)))
+    scene.picker.set_viewport(WIDTH, HEIGHT)
+    for index in range(count):
+        if index % 3 == 2:
+            figure = FigureWrapper.create_procedural("Icosphere", 2)
+        else:
+            figure = FigureWrapper.create(("Cube", "Pyramid")[index % 3])
+        figure.rotate(*rng.uniform(0, 360, 3))
+        figure.translate(*rng.uniform((-30, -20, -60), (30, 20, 10)))
+        figure.scale(*[rng.uniform(0.3, 1)] * 3)
+        scene.add_figure(figure)
+    return scene
+
+
+def timed(function, *args):
+    """
+    :return: Time of the call in milliseconds and the function result.
+    """
+    start = perf_counter()
+    result = function(*args)
+    return (perf_counter() - start) * 1000, result
+
+
+def run():
+    header = ["first ms", "click ms", "hits", "rect ms", "selected"]
+    print(f"{'figures':>8}" + "".join(f"{name:>10}" for name in header))
+    for count in SIZES:
+        rng = np.random.default_rng(SEED)
+        scene = create_scene(count, rng)
+        picker = scene.picker
+        first_time, _ = timed(picker.pick, WIDTH // 2, HEIGHT // 2)
+        clicks = rng.integers(0, (WIDTH, HEIGHT), (CLICKS, 2)).tolist()
+        click_times, hits = [], 0
+        for x, y in clicks:
+            elapsed, figure = timed(picker.pick, x, y)
+            click_times.append(elapsed)
+            hits += figure is not None
+        rect_times, selected = [], 0
+        corners = rng.integers(0, (WIDTH, HEIGHT), (RECTS, 2))
+        # rectangles up to a quarter of the window
+        sizes = rng.integers(1, (WIDTH // 4, HEIGHT // 4), (RECTS, 2))
+        for (x0, y0), (x1, y1) in zip(corners.tolist(), (corners + sizes).tolist()):
+            elapsed, figures = timed(picker.pick_rect, x0, y0, x1, y1)
+            rect_times.append(elapsed)
+            selected += len(figures)
+        print(
+            f"{count:>8}{first_time:10.2f}{median(click_times):10.3f}{hits:10d}"
+            f"{median(rect_times):10.2f}{selected:10d}"
+        )
+
+
+if __name__ == "__main__":
+    run()
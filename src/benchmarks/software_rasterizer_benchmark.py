@@ -0,0 +1,65 @@
+"""
+Benchmark of headless rendering with the NumPy software rasterizer.
+
+Renders the default lab5 scene in every draw mode at several framebuffer
+sizes, prints the time of rasterizing and of converting the framebuffer into
+ASCII art, and a hash of the framebuffer: the same hash on every run and
+machine shows that the rendering is deterministic.
+Run from the src folder: python -m benchmarks.software_rasterizer_benchmark
+"""
+
+import hashlib
+from time import perf_counter
+
+from labs.lab5.init import create_scene
+from labs.lab5.ui.Renderer import SoftwareAsciiRenderer
+
+ASCII_CHARS = ["@", "#", "S", "%", "?", "*", "+", ";", ":", ",", "."]
+SIZES = [(400, 250), (800, 500), (1600, 1000)]
+DRAW_MODES = ["points", "edges", "faces"]
+ASCII_HEIGHT = 40
+REPEATS = 5
+
+
+def measure(function, *args, repeats=REPEATS):
+    """
+    :return: Best time of the repeats in seconds and the function result.
+    """
+    best = None
+    result = None
+    for _ in range(repeats):
+        start = perf_counter()
+        result = function(*args)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run():
+    scene = create_scene()
+    header = ["raster ms", "ascii ms", "fragments", "hash"]
+    print(f"{'size':>10}{'mode':>8}" + "".join(f"{name:>12}" for name in header))
+    for width, height in SIZES:
+        renderer = SoftwareAsciiRenderer(width, height, ASCII_HEIGHT, ASCII_CHARS)
+        rasterizer = renderer.rasterizer
+
+        def rasterize():
+            rasterizer.clear()
+            scene.draw(rasterizer)
+
+        for mode in DRAW_MODES:
+            for figure in scene.data.figures:
+                figure.set_draw_mode(mode)
+            rasterizer.stats["fragments"] = 0
+            raster_time, _ = measure(rasterize)
+            fragments = rasterizer.stats["fragments"] // REPEATS
+            ascii_time, _ = measure(renderer.render_to_ascii)
+            digest = hashlib.blake2b(rasterizer.frame.tobytes(), digest_size=4)
+            print(
+                f"{width:>5}x{height:<4}{mode:>8}{raster_time * 1000:12.2f}"
+                f"{ascii_time * 1000:12.2f}{fragments:12d}{digest.hexdigest():>12}"
+            )
+
+
+if __name__ == "__main__":
+    run()
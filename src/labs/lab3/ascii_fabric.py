@@ -4,8 +4,10 @@ from labs.lab3.bll.ColoramaPainter import ColoramaPainter
 from labs.lab3.bll.PyfigletGenerator import PyfigletGenerator
 from labs.lab3.ui.AsciiMenu import AsciiMenu
 from labs.lab3.ui.AsciiSettings import AsciiSettingsUI
+from labs.lab4.bll.BitmapGenerator import BitmapGenerator
 from labs.lab4.bll.CustomGenerator import CustomGenerator
 from labs.lab4.bll.CustomPainter import CustomPainter
+from labs.lab4.bll.FontCompiler import FontCompiler
 from shared.classes.dict_json import DictJsonDataAccess
 from shared.classes.folder_data_access import FolderDataAccess
 from shared.interfaces.ui_interface import UIInterface
@@ -21,8 +23,10 @@ class AsciiFabric:
     Methods:
         __init__(generator, coloring): Initializes the AsciiFabric with a specific generator and coloring tool.
         show(): Displays the ASCII art generation menu.
+        load_fonts(generator_class): Compiles the built-in fonts into the fonts folder if needed and loads the packed fonts of the folder.
         pyfiglet(): Class method to instantiate AsciiFabric with PyfigletGenerator and ColoramaPainter.
         custom(): Class method to instantiate AsciiFabric with CustomGenerator and CustomPainter.
+        bitmap(): Class method to instantiate AsciiFabric with the NumPy BitmapGenerator and CustomPainter.
     """
 
     def __init__(self, generator=PyfigletGenerator(), coloring=ColoramaPainter()):
@@ -50,8 +54,25 @@ class AsciiFabric:
         coloring = ColoramaPainter()
         return cls(generator, coloring)
 
+    @staticmethod
+    def load_fonts(generator_class):
+        fonts_folder = DictJsonDataAccess(settings_path_lab3).get("__fonts_folder")
+        if not fonts_folder:
+            return
+        # the first run compiles the built-in fonts, next runs only map the files
+        FontCompiler.compile_builtin_fonts(fonts_folder)
+        generator_class.load_fonts_folder(fonts_folder)
+
     @classmethod
     def custom(cls):
+        cls.load_fonts(CustomGenerator)
         generator = CustomGenerator()
         coloring = CustomPainter()
         return cls(generator, coloring)
+
+    @classmethod
+    def bitmap(cls):
+        cls.load_fonts(BitmapGenerator)
+        generator = BitmapGenerator()
+        coloring = CustomPainter()
+        return cls(generator, coloring)
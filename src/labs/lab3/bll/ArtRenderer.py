@@ -0,0 +1,33 @@
+from shared.classes.ascii_generator import AsciiGenerator
+from shared.interfaces.paint_text_interface import PaintTextInterface
+
+ALIGNMENTS = ("left", "right", "center")
+
+
+def render_art(
+    generator: AsciiGenerator,
+    coloring: PaintTextInterface,
+    text,
+    font,
+    width,
+    alignment="left",
+    color=None,
+):
+    """
+    Renders the art like AsciiController.create_art but without any stored settings,
+    so it can be called from worker processes.
+
+    :param generator: Picklable generator used for the rendering.
+    :param coloring: Picklable painter, used only when color is given.
+    :param text: Text to render.
+    :param font: Font name of the generator.
+    :param width: Maximal width of the art.
+    :param alignment: One of 'left', 'right' or 'center'.
+    :param color: Color name of the painter or None for the plain art.
+    :return: Rendered art.
+    """
+    art = generator.generate(text, font=font, width=width)
+    art = generator.alignment_text(art, alignment, width)
+    if color:
+        art = coloring.paint(art, color)
+    return art
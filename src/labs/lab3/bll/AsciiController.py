@@ -1,6 +1,12 @@
+from labs.lab3.bll.FontGallery import FontGallery
+from labs.lab3.bll.IncrementalRenderer import IncrementalRenderer
+from labs.lab3.bll.Marquee import Marquee
+from labs.lab3.bll.TextLayout import TextLayout
 from shared.classes.ascii_generator import AsciiGenerator
 from shared.classes.key_data_access import KeyDataAccess
 from shared.interfaces.paint_text_interface import PaintTextInterface
+from shared.classes.terminal_screen import TerminalScreen
+from shared.services.ansi_escape import strip_ansi
 
 
 class AsciiController:
@@ -29,6 +35,9 @@ class AsciiController:
         self._coloring = coloring
         self._arts_access = arts_access
         self._settings = settings_access
+        self._gallery = FontGallery(generator)
+        self._renderer = IncrementalRenderer(generator, None, None)
+        self._layout = TextLayout(generator)
         self.art = None
 
     def get_fonts(self):
@@ -114,6 +123,27 @@ class AsciiController:
         cols = int(height_limit / font_height)
         return symbols_in_row * cols
 
+    def get_max_char_limit(self):
+        font = self.get_font()
+        glyph_width = self._layout.min_glyph_width(font)
+        symbols_in_row = self.get_width() // glyph_width
+        return symbols_in_row * max(1, self.get_max_lines())
+
+    def get_max_lines(self):
+        font_height = self.get_min_height()
+        is_line_breaks = self.get_is_line_breaks()
+        is_font_breaks_line = self.is_font_support_line_break()
+        if not is_line_breaks or not is_font_breaks_line:
+            return 1 if font_height <= self.get_height() else 0
+        return self.get_height() // font_height
+
+    def fit_text(self, text):
+        font = self.get_font()
+        return self._layout.fit(text, font, self.get_width(), self.get_max_lines())
+
+    def generate_lines(self, lines):
+        return self._layout.render(lines, self.get_font(), self.get_width())
+
     def get_max_possible_width(self):
         return self._settings.get("max_width")
 
@@ -207,17 +237,9 @@ class AsciiController:
             raise ValueError("Too wide")
         self._arts_access.set(name, art)
 
+    @staticmethod
     def remove_color(string):
-        result = []
-        in_ansi_sequence = False
-        for char in string:
-            if char == "\x1b":
-                in_ansi_sequence = True
-            elif in_ansi_sequence and char == "m":
-                in_ansi_sequence = False
-            elif not in_ansi_sequence:
-                result.append(char)
-        return "".join(result)
+        return strip_ansi(string)
 
     def is_art_allowed(self, art: str):
         lines = art.splitlines()
@@ -248,6 +270,34 @@ class AsciiController:
         art = self._generator.generate(text, **kwargs)
         return art
 
+    def preview(self, text):
+        self._renderer.set_layout(self.get_font(), self.get_width())
+        art = self._renderer.render(text)
+        return self.finish_art(art)
+
+    def create_marquee(self, text):
+        font = self.get_font()
+        # one art line for the whole text, the marquee scrolls it
+        art_width = len(text) * self.get_min_width() + 1
+        art = self._generator.generate(text, font=font, width=art_width)
+        if self.get_is_symbols_replace():
+            art = self.replace(art)
+        return Marquee(art, self.get_width())
+
+    def create_marquee_screen(self, marquee: Marquee):
+        writer = getattr(self._coloring, "writer", None)
+        return TerminalScreen(
+            marquee.height, marquee.viewport_width, writer, palette=[self.get_color()]
+        )
+
+    def get_marquee_fps(self):
+        return self._settings.get("marquee_fps") or 30
+
+    def render_all_fonts(self, text, width=None):
+        if width is None:
+            width = self.get_width()
+        return self._gallery.render_all_fonts(text, width)
+
     def replace(self, art):
         bright = self.get_bright_symbol()
         empty = self.get_empty_symbol()
@@ -271,8 +321,9 @@ class AsciiController:
         justified_text = self._generator.alignment_text(text, alignment, width)
         return justified_text
 
-    def create_art(self, text):
-        art = self.generate(text)
+    def create_art(self, text, art=None):
+        if art is None:
+            art = self.generate(text)
         is_allowed = self.is_art_allowed(art)
         if not is_allowed:
             raise ValueError("Art breaks the rules")
@@ -284,6 +335,13 @@ class AsciiController:
         painted_art = self.paint(justified_art)
         return painted_art
 
+    def finish_art(self, art):
+        justified_art = self.justify(art)
+        is_replace = self.get_is_symbols_replace()
+        if is_replace:
+            justified_art = self.replace(justified_art)
+        return self.paint(justified_art)
+
     def create_cut_art(self, text):
         is_line_breaks = self.get_is_line_breaks()
         if not is_line_breaks:
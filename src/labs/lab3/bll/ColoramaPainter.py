@@ -1,5 +1,6 @@
 from colorama import Fore, Style
 
+from shared.classes.ansi_writer import AnsiWriter
 from shared.interfaces.paint_text_interface import PaintTextInterface
 
 
@@ -12,11 +13,20 @@ class ColoramaPainter(PaintTextInterface):
     color_map : dict
         A mapping between color names (as keys) and their corresponding `colorama` color codes (as values).
 
+    writer : AnsiWriter
+        Shared ANSI writer that caches escape codes and emits them only on color change.
+
     Methods:
     --------
     paint(cls, text, color):
         Paints the given text with the specified color if it's supported.
 
+    paint_spans(cls, spans):
+        Paints a sequence of (text, color) spans.
+
+    paint_cells(cls, chars, colors):
+        Paints every character with its own color.
+
     get_colors(cls):
         Returns a list of all supported colors.
     """
@@ -35,12 +45,19 @@ class ColoramaPainter(PaintTextInterface):
         "default": Style.RESET_ALL,
     }
 
+    writer = AnsiWriter(color_map)
+
     @classmethod
     def paint(cls, text, color):
-        if color in cls.color_map:
-            return f"{cls.color_map[color]}{text}{Style.RESET_ALL}"
-        else:
-            raise ValueError(f"Color '{color}' is not supported.")
+        return cls.writer.paint(text, color)
+
+    @classmethod
+    def paint_spans(cls, spans):
+        return cls.writer.paint_spans(spans)
+
+    @classmethod
+    def paint_cells(cls, chars, colors):
+        return cls.writer.paint_cells(chars, colors)
 
     @classmethod
     def get_colors(cls):
@@ -0,0 +1,111 @@
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from math import ceil
+from os import cpu_count
+
+from shared.classes.ascii_generator import AsciiGenerator
+
+CHUNKS_PER_WORKER = 4
+# arts of about ten texts in every pyfiglet font
+CACHE_SIZE = 5000
+
+
+def render_fonts_chunk(generator, text, width, fonts):
+    """
+    Renders the text with every font of the chunk inside a worker process.
+
+    :param generator: Picklable generator used for the rendering.
+    :param text: Text to render.
+    :param width: Maximal width of the art.
+    :param fonts: Font names of the chunk.
+    :return: List of (font, art) pairs, art is None if the font failed.
+    """
+    results = []
+    for font in fonts:
+        try:
+            art = generator.generate(text, font=font, width=width)
+        except Exception:
+            art = None
+        results.append((font, art))
+    return results
+
+
+class FontGallery:
+    """
+    FontGallery renders one text with every available font of a generator.
+
+    Fonts are split into chunks which are rendered in a process pool, results
+    are yielded as soon as a chunk is completed and kept in a LRU cache keyed
+    by (text, width, font).
+
+    Methods:
+        __init__(generator, workers=None, chunk_size=None, cache_size=CACHE_SIZE):
+            Initializes the gallery for the generator.
+
+        render_all_fonts(text, width, fonts=None):
+            Yields (font, art) pairs for every font that can render the text.
+
+        clear_cache():
+            Removes all cached arts.
+    """
+
+    def __init__(
+        self,
+        generator: AsciiGenerator,
+        workers=None,
+        chunk_size=None,
+        cache_size=CACHE_SIZE,
+    ):
+        self._generator = generator
+        self._workers = workers if workers else cpu_count() or 1
+        self._chunk_size = chunk_size
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def render_all_fonts(self, text, width, fonts=None):
+        fonts = list(fonts) if fonts is not None else self._generator.get_fonts()
+        pending = []
+        for font in fonts:
+            key = (text, width, font)
+            if key not in self._cache:
+                pending.append(font)
+                continue
+            self._cache.move_to_end(key)
+            if self._cache[key] is not None:
+                yield font, self._cache[key]
+        if not pending:
+            return
+        if self._workers == 1:
+            results = render_fonts_chunk(self._generator, text, width, pending)
+            yield from self.__store(text, width, results)
+            return
+        chunk_size = self._chunk_size or ceil(
+            len(pending) / (self._workers * CHUNKS_PER_WORKER)
+        )
+        pool = ProcessPoolExecutor(max_workers=self._workers)
+        try:
+            futures = [
+                pool.submit(
+                    render_fonts_chunk,
+                    self._generator,
+                    text,
+                    width,
+                    pending[index : index + chunk_size],
+                )
+                for index in range(0, len(pending), chunk_size)
+            ]
+            for future in as_completed(futures):
+                yield from self.__store(text, width, future.result())
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def __store(self, text, width, results):
+        for font, art in results:
+            self._cache[(text, width, font)] = art
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+            if art is not None:
+                yield font, art
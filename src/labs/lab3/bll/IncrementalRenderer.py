@@ -0,0 +1,198 @@
+from os.path import commonprefix
+
+from pyfiglet import FigletFont
+
+from labs.lab3.bll.PyfigletGenerator import PyfigletGenerator
+from labs.lab4.bll.BitmapGenerator import BitmapGenerator
+from labs.lab4.bll.CustomGenerator import CustomGenerator
+from shared.classes.ascii_generator import AsciiGenerator
+
+# pyfiglet layout bits, a font without both of them places glyphs side by side
+FIGLET_KERN = 64
+FIGLET_SMUSH = 128
+FIGLET_RIGHT_TO_LEFT = 1
+
+
+class FigletGlyphs:
+    """
+    Per-character glyph cache of full-width figlet fonts.
+
+    Fonts are loaded once, glyph rows are cached with hardblanks already
+    replaced, so a full-width line is just the glyph rows joined side by side.
+
+    Methods:
+        is_full_width(cls, font):
+            Checks if the font has no kerning, smushing or right-to-left direction.
+
+        get(cls, font, char):
+            Returns the glyph rows of the char or None if the font has no such glyph.
+    """
+
+    fonts = {}
+    glyphs = {}
+
+    @classmethod
+    def get_font(cls, font):
+        figlet_font = cls.fonts.get(font)
+        if figlet_font is None:
+            figlet_font = FigletFont(font)
+            cls.fonts[font] = figlet_font
+        return figlet_font
+
+    @classmethod
+    def is_full_width(cls, font):
+        figlet_font = cls.get_font(font)
+        is_smushing = figlet_font.smushMode & (FIGLET_KERN | FIGLET_SMUSH)
+        return not is_smushing and figlet_font.printDirection != FIGLET_RIGHT_TO_LEFT
+
+    @classmethod
+    def get(cls, font, char):
+        key = (font, char)
+        if key not in cls.glyphs:
+            figlet_font = cls.get_font(font)
+            rows = figlet_font.chars.get(ord(char))
+            if rows is not None:
+                rows = [row.replace(figlet_font.hardBlank, " ") for row in rows]
+            cls.glyphs[key] = rows
+        return cls.glyphs[key]
+
+
+class IncrementalRenderer:
+    """
+    IncrementalRenderer re-renders only the changed tail of the text.
+
+    The art is kept as art lines (one line of glyphs each) with the glyph
+    columns they were joined from. On a new text the lines before the first
+    changed character are reused as they are, the changed line keeps its
+    unchanged glyph columns and only the remaining glyphs are looked up.
+    CustomGenerator fonts and full-width pyfiglet fonts (single art line) are
+    rendered incrementally, everything else falls back to a full render.
+
+    Methods:
+        __init__(generator, font, width):
+            Initializes the renderer for the generator, font and width.
+
+        set_layout(font, width):
+            Changes the font or width, cached lines are dropped on change.
+
+        render(text):
+            Returns the art of the text, the same as generator.generate.
+
+        reset():
+            Drops all cached lines.
+    """
+
+    def __init__(self, generator: AsciiGenerator, font, width):
+        self._generator = generator
+        self._font = font
+        self._width = width
+        self.stats = {"reused_columns": 0, "rendered_columns": 0, "full_renders": 0}
+        self.reset()
+
+    def set_layout(self, font, width):
+        if (font, width) != (self._font, self._width):
+            self._font = font
+            self._width = width
+            self.reset()
+
+    def reset(self):
+        self._text = ""
+        self._lines = []
+
+    def render(self, text):
+        if isinstance(self._generator, CustomGenerator) and not isinstance(
+            self._generator, BitmapGenerator
+        ):
+            return self.__render_custom(text)
+        if isinstance(self._generator, PyfigletGenerator):
+            rendered = self.__render_figlet(text)
+            if rendered is not None:
+                return rendered
+        self.stats["full_renders"] += 1
+        self.reset()
+        return self._generator.generate(text, font=self._font, width=self._width)
+
+    def __render_custom(self, text):
+        generator = self._generator
+        font_data = generator.get_font(self._font)
+        chars_in_line = self._width // generator.get_font_char_width(self._font)
+        if chars_in_line < 1:
+            raise ValueError("Width is too small for the font")
+        char_height = generator.get_font_char_height(self._font)
+        blank = [" " * generator.get_font_char_width(self._font)] * char_height
+
+        def glyph(char):
+            return font_data["symbols"].get(char, blank)
+
+        self.__update(text.lower(), chars_in_line, char_height, glyph)
+        replace_string = font_data.get("replace_string")
+        rows = []
+        offset = 0
+        for line in self._lines:
+            if replace_string:
+                if line["replaced"] is None or line["offset"] != offset:
+                    shift = offset % len(replace_string)
+                    shifted = replace_string[shift:] + replace_string[:shift]
+                    line["replaced"] = generator.string_replace(
+                        "\n".join(line["rows"]), shifted
+                    ).split("\n")
+                    line["offset"] = offset
+                rows.extend(line["replaced"])
+                offset += line["bright"]
+            else:
+                rows.extend(line["rows"])
+        return "\n".join(rows)
+
+    def __render_figlet(self, text):
+        if "\n" in text or not FigletGlyphs.is_full_width(self._font):
+            return None
+        glyphs = [FigletGlyphs.get(self._font, char) for char in text]
+        # pyfiglet starts a new line when a glyph reaches the width
+        line_width = 0
+        for char, rows in zip(text, glyphs):
+            if rows is None:
+                continue
+            if line_width + max(map(len, rows), default=0) >= self._width:
+                return None
+            line_width += len(rows[0])
+        char_height = FigletGlyphs.get_font(self._font).height
+        self.__update(text, None, char_height, lambda char: FigletGlyphs.get(self._font, char))
+        rows = self._lines[0]["rows"] if self._lines else []
+        if not rows or rows[0] == "":
+            return ""
+        return "\n".join(rows) + "\n"
+
+    def __update(self, text, chars_in_line, char_height, glyph):
+        prefix = len(commonprefix([self._text, text]))
+        step = chars_in_line or max(len(text), 1)
+        if chars_in_line is None:
+            first_changed = 0
+        else:
+            first_changed = min(prefix // step, len(self._lines))
+        lines = self._lines[:first_changed]
+        for start in range(first_changed * step, len(text), step):
+            chunk = text[start : start + step]
+            columns = []
+            if start // step < len(self._lines):
+                kept = max(0, min(prefix - start, len(chunk)))
+                columns = self._lines[start // step]["columns"][:kept]
+            self.stats["reused_columns"] += len(columns)
+            for char in chunk[len(columns) :]:
+                columns.append(glyph(char))
+                self.stats["rendered_columns"] += 1
+            lines.append(self.__make_line(columns, char_height))
+        self._lines = lines
+        self._text = text
+
+    @staticmethod
+    def __make_line(columns, char_height):
+        glyphs = [rows for rows in columns if rows is not None]
+        rows = ["".join(rows[row] for rows in glyphs) for row in range(char_height)]
+        bright = sum(len(row) - row.count(" ") for row in rows)
+        return {
+            "columns": columns,
+            "rows": rows,
+            "bright": bright,
+            "replaced": None,
+            "offset": 0,
+        }
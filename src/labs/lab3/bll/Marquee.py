@@ -0,0 +1,55 @@
+import numpy as np
+
+from shared.classes.terminal_screen import text_to_codes
+
+
+class Marquee:
+    """
+    Marquee scrolls a wide art through a viewport.
+
+    The art is rendered once, converted into an array of code points with a
+    gap after it and extended by one viewport of its own beginning, so every
+    frame, including the wrapped ones, is a slice (view) of the same buffer.
+
+    Methods:
+        __init__(art, viewport_width, gap=None):
+            Builds the buffer of the art.
+
+        frame(offset):
+            Returns the frame (rows x viewport width) that starts at the column offset.
+
+        frames(step=1, start=0):
+            Yields frames endlessly, every next frame is shifted by step columns.
+
+        frame_text(offset):
+            Returns the frame as text.
+    """
+
+    def __init__(self, art, viewport_width, gap=None):
+        if viewport_width < 1:
+            raise ValueError("Viewport is too narrow")
+        rows = art.splitlines() or [""]
+        art_width = max(len(row) for row in rows)
+        if gap is None:
+            gap = viewport_width // 3
+        # the cycle is never shorter than the viewport, narrow arts get a wider gap
+        cycle = max(art_width + gap, viewport_width, 1)
+        codes = text_to_codes(rows, cycle)
+        self.height = len(rows)
+        self.viewport_width = viewport_width
+        self.cycle = cycle
+        self._buffer = np.concatenate([codes, codes[:, :viewport_width]], axis=1)
+
+    def frame(self, offset):
+        offset %= self.cycle
+        return self._buffer[:, offset : offset + self.viewport_width]
+
+    def frames(self, step=1, start=0):
+        offset = start
+        while True:
+            yield self.frame(offset)
+            offset = (offset + step) % self.cycle
+
+    def frame_text(self, offset):
+        frame = np.ascontiguousarray(self.frame(offset))
+        return "\n".join(frame.view(f"<U{self.viewport_width}").ravel().tolist())
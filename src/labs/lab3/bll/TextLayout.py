@@ -0,0 +1,147 @@
+from bisect import bisect_right
+from itertools import accumulate
+
+from labs.lab3.bll.IncrementalRenderer import FigletGlyphs, FIGLET_RIGHT_TO_LEFT
+from labs.lab3.bll.PyfigletGenerator import PyfigletGenerator
+from labs.lab4.bll.CustomGenerator import CustomGenerator
+from shared.classes.ascii_generator import AsciiGenerator
+
+
+class TextLayout:
+    """
+    TextLayout fits text into the width and height limits using real glyph widths.
+
+    Glyph widths are measured once per font and cached, the split point of
+    every art line is found by binary search on the prefix sums of the glyph
+    widths and moved back to the last space to keep words whole, so the
+    largest fitting block is found in one pass without trial renders.
+    For kerning and smushing figlet fonts the blank margins of neighbouring
+    glyphs are subtracted, the sum stays an upper bound of the real width.
+
+    Methods:
+        __init__(generator):
+            Initializes the layout for the generator.
+
+        glyph_width(font, char):
+            Returns the width of the glyph in columns.
+
+        min_glyph_width(font):
+            Returns the width of the narrowest printable glyph of the font.
+
+        fit_line(text, font, width):
+            Returns the number of characters of the text that fit into one art line.
+
+        fit(text, font, width, max_lines):
+            Returns the text lines that fit into max_lines art lines.
+
+        render(lines, font, width):
+            Renders the fitted lines, every line is one art line.
+    """
+
+    def __init__(self, generator: AsciiGenerator):
+        self._generator = generator
+        self._widths = {}
+        self._margins = {}
+        self._kerns = {}
+
+    def glyph_width(self, font, char):
+        widths = self._widths.setdefault(font, {})
+        width = widths.get(char)
+        if width is None:
+            width = self.__measure(font, char)
+            widths[char] = width
+        return width
+
+    def min_glyph_width(self, font):
+        printable = [chr(code) for code in range(33, 127)]
+        widths = [self.glyph_width(font, char) for char in printable]
+        return max(1, min(width for width in widths if width > 0))
+
+    def fit_line(self, text, font, width):
+        # pyfiglet starts a new art line when the glyph reaches the width
+        limit = width - 1 if isinstance(self._generator, PyfigletGenerator) else width
+        prefix = list(accumulate(self.__advances(text, font), initial=0))
+        count = bisect_right(prefix, limit) - 1
+        if count >= len(text) or text[count] == " ":
+            return count
+        last_space = text.rfind(" ", 0, count)
+        return last_space if last_space > 0 else count
+
+    def fit(self, text, font, width, max_lines):
+        lines = []
+        rest = text.strip()
+        while rest and len(lines) < max_lines:
+            count = self.fit_line(rest, font, width)
+            if count == 0:
+                break
+            lines.append(rest[:count].rstrip())
+            rest = rest[count:].lstrip()
+        return lines
+
+    def render(self, lines, font, width):
+        char_width = self._generator.get_font_char_width(font)
+        arts = []
+        for line in lines:
+            line_width = width
+            if not isinstance(self._generator, PyfigletGenerator):
+                # CustomGenerator breaks lines by the widest glyph, the fitted
+                # line is kept in one art line by the wider limit
+                line_width = max(width, len(line) * char_width)
+            art = self._generator.generate(line, font=font, width=line_width)
+            arts.append(art.rstrip("\n"))
+        return "\n".join(arts)
+
+    def __advances(self, text, font):
+        widths = [self.glyph_width(font, char) for char in text]
+        if not self.__is_kerning(font):
+            return widths
+        advances = []
+        previous = None
+        for char, width in zip(text, widths):
+            if width == 0:
+                advances.append(0)
+                continue
+            kern = self.__kern(font, previous, char) if previous is not None else 0
+            advances.append(width - min(kern, width))
+            previous = char
+        return advances
+
+    def __is_kerning(self, font):
+        if not isinstance(self._generator, PyfigletGenerator):
+            return False
+        figlet_font = FigletGlyphs.get_font(font)
+        is_right_to_left = figlet_font.printDirection == FIGLET_RIGHT_TO_LEFT
+        return not is_right_to_left and not FigletGlyphs.is_full_width(font)
+
+    def __kern(self, font, left, right):
+        key = (font, left, right)
+        kern = self._kerns.get(key)
+        if kern is None:
+            trailing = self.__glyph_margins(font, left)[1]
+            leading = self.__glyph_margins(font, right)[0]
+            kern = min((t + l for t, l in zip(trailing, leading)), default=0)
+            self._kerns[key] = kern
+        return kern
+
+    def __glyph_margins(self, font, char):
+        key = (font, char)
+        margins = self._margins.get(key)
+        if margins is None:
+            # raw rows, hardblanks are not blank for kerning like in pyfiglet
+            rows = FigletGlyphs.get_font(font).chars[ord(char)]
+            leading = [len(row) - len(row.lstrip(" ")) for row in rows]
+            trailing = [len(row) - len(row.rstrip(" ")) for row in rows]
+            margins = (leading, trailing)
+            self._margins[key] = margins
+        return margins
+
+    def __measure(self, font, char):
+        if isinstance(self._generator, CustomGenerator):
+            symbols = self._generator.get_font(font)["symbols"]
+            if char.lower() not in symbols:
+                return self._generator.get_font_char_width(font)
+            return max(map(len, symbols[char.lower()]), default=0)
+        if isinstance(self._generator, PyfigletGenerator):
+            return FigletGlyphs.get_font(font).width.get(ord(char), 0)
+        art = self._generator.generate(char, font=font, width=1000)
+        return max(map(len, art.splitlines()), default=0)
@@ -0,0 +1,307 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from hashlib import blake2b
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from config.settings_paths import settings_path_lab3
+from labs.lab3.bll.ArtRenderer import ALIGNMENTS, render_art
+from labs.lab3.bll.ColoramaPainter import ColoramaPainter
+from labs.lab3.bll.PyfigletGenerator import PyfigletGenerator
+from shared.classes.ascii_generator import AsciiGenerator
+from shared.classes.dict_json import DictJsonDataAccess
+from shared.interfaces.paint_text_interface import PaintTextInterface
+
+MAX_HEADER_LINES = 100
+MAX_TEXT_LENGTH = 1000
+MAX_BODY_SIZE = 65536
+
+
+class AsciiHttpServer:
+    """
+    AsciiHttpServer serves ASCII arts over HTTP with asyncio streams.
+
+    GET /render?text=&font=&width=&align=&color= returns the art as plain text.
+    Responses are kept in a LRU cache keyed by the normalized parameters and
+    tagged with an ETag (If-None-Match gives 304), identical renders that are
+    already in progress are awaited instead of being started again and the
+    generator calls run in a worker pool.
+
+    Methods:
+        __init__(generator, coloring, host, port, cache_size, workers, executor, settings):
+            Initializes the server, a process pool is created if no executor is given.
+
+        from_settings(generator=None, coloring=None, executor=None):
+            Class method to create the server from the "http_service" lab3 settings.
+
+        start():
+            Starts listening, returns the asyncio server.
+
+        serve_forever():
+            Starts the server and serves until it is cancelled.
+
+        close():
+            Stops the server and the worker pool it owns.
+
+        render(text, font, width, align, color):
+            Returns (etag, body) of the art, using the cache and in-flight renders.
+
+        handle(reader, writer):
+            Handles one keep-alive connection.
+    """
+
+    def __init__(
+        self,
+        generator: AsciiGenerator = PyfigletGenerator(),
+        coloring: PaintTextInterface = ColoramaPainter(),
+        host="127.0.0.1",
+        port=8031,
+        cache_size=1024,
+        workers=None,
+        executor: Executor = None,
+        settings=None,
+    ):
+        self._generator = generator
+        self._coloring = coloring
+        self._settings = settings or DictJsonDataAccess(settings_path_lab3)
+        self.host = host
+        self.port = port
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self._in_flight = {}
+        self._owns_executor = executor is None
+        self._executor = executor or ProcessPoolExecutor(max_workers=workers)
+        self._fonts = None
+        self._server = None
+        self.stats = {"requests": 0, "hits": 0, "coalesced": 0, "renders": 0}
+
+    @classmethod
+    def from_settings(cls, generator=None, coloring=None, executor=None):
+        settings = DictJsonDataAccess(settings_path_lab3)
+        service = settings.get("http_service") or {}
+        return cls(
+            generator or PyfigletGenerator(),
+            coloring or ColoramaPainter(),
+            host=service.get("host", "127.0.0.1"),
+            port=service.get("port", 8031),
+            cache_size=service.get("cache_size", 1024),
+            workers=service.get("workers"),
+            executor=executor,
+            settings=settings,
+        )
+
+    async def start(self):
+        self._server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    async def serve_forever(self):
+        server = await self.start()
+        print(f"Ascii service on http://{self.host}:{self.port}/render")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def render(self, text, font, width, align, color):
+        key = (text, font, width, align, color)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.stats["hits"] += 1
+            return cached
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.stats["coalesced"] += 1
+            try:
+                return await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # the leading request was cancelled, not this one, the art is rendered again
+                if in_flight.cancelled() and not asyncio.current_task().cancelling():
+                    return await self.render(text, font, width, align, color)
+                raise
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            self.stats["renders"] += 1
+            art = await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                partial(
+                    render_art, self._generator, self._coloring, text, font, width, align, color
+                ),
+            )
+            body = art.encode("utf-8")
+            result = (f'"{blake2b(body, digest_size=16).hexdigest()}"', body)
+            self.__store(key, result)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            # mark the exception as retrieved, waiters (if any) get it from the future
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+            if not future.done():
+                # the leading request was cancelled, waiters must not wait forever
+                future.cancel()
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await self.__read_request(reader)
+                except ValueError:
+                    # a line is longer than the limit of the reader
+                    status, response_headers, body = self.__error(
+                        HTTPStatus.BAD_REQUEST, "Line is too long"
+                    )
+                    response_headers["Connection"] = "close"
+                    writer.write(self.__format_response(status, response_headers, body, "GET"))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+                self.stats["requests"] += 1
+                # the body is skipped, its bytes must not be read as the next request
+                keep_alive = self.__is_keep_alive(version, headers)
+                keep_alive = await self.__skip_body(reader, headers) and keep_alive
+                status, response_headers, body = await self.__respond(method, target, headers)
+                response_headers["Connection"] = "keep-alive" if keep_alive else "close"
+                writer.write(self.__format_response(status, response_headers, body, method))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+    async def __respond(self, method, target, headers):
+        if method not in ("GET", "HEAD"):
+            return self.__error(HTTPStatus.METHOD_NOT_ALLOWED, "Only GET is supported")
+        url = urlsplit(target)
+        if url.path != "/render":
+            return self.__error(HTTPStatus.NOT_FOUND, "Unknown path")
+        try:
+            params = self.__parse_params(parse_qs(url.query))
+        except ValueError as e:
+            return self.__error(HTTPStatus.BAD_REQUEST, str(e))
+        try:
+            etag, body = await self.render(*params)
+        except Exception as e:
+            return self.__error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Can't render: {e}")
+        response_headers = {
+            "ETag": etag,
+            "Cache-Control": "public, max-age=3600",
+            "Content-Type": "text/plain; charset=utf-8",
+        }
+        if_none_match = headers.get("if-none-match", "")
+        if etag in (tag.strip() for tag in if_none_match.split(",")) or if_none_match == "*":
+            return HTTPStatus.NOT_MODIFIED, response_headers, b""
+        return HTTPStatus.OK, response_headers, body
+
+    def __parse_params(self, query):
+        def value(name, default=None):
+            values = query.get(name)
+            return values[-1] if values else default
+
+        text = value("text")
+        if not text:
+            raise ValueError("Parameter 'text' is required")
+        if len(text) > MAX_TEXT_LENGTH:
+            raise ValueError("Text is too long")
+        font = value("font", self._settings.get("font"))
+        if font not in self.__get_fonts():
+            raise ValueError("Font not in fonts list")
+        try:
+            width = int(value("width", self._settings.get("width")))
+        except (TypeError, ValueError):
+            raise ValueError("Wrong type of width")
+        if not 1 <= width <= self._settings.get("max_width"):
+            raise ValueError("Width not in diapason")
+        align = value("align", self._settings.get("alignment"))
+        if align not in ALIGNMENTS:
+            raise ValueError("Wrong alignment")
+        color = value("color") or None
+        if color is not None and color not in self._coloring.get_colors():
+            raise ValueError("Color not in colors list")
+        return text, font, width, align, color
+
+    def __get_fonts(self):
+        if self._fonts is None:
+            self._fonts = set(self._generator.get_fonts())
+        return self._fonts
+
+    def __store(self, key, result):
+        self._cache[key] = result
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    async def __read_request(reader):
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return None
+        parts = request_line.decode("latin-1").split()
+        if len(parts) != 3:
+            return None
+        method, target, version = parts
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, header_value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = header_value.strip()
+        return method, target, version, headers
+
+    @staticmethod
+    async def __skip_body(reader, headers):
+        if "transfer-encoding" in headers:
+            return False
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            return False
+        if not 0 <= length <= MAX_BODY_SIZE:
+            return False
+        await reader.readexactly(length)
+        return True
+
+    @staticmethod
+    def __is_keep_alive(version, headers):
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    @staticmethod
+    def __error(status, message):
+        return status, {"Content-Type": "text/plain; charset=utf-8"}, message.encode("utf-8")
+
+    @staticmethod
+    def __format_response(status, headers, body, method):
+        headers["Content-Length"] = str(len(body))
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+        return head if method == "HEAD" else head + body
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(AsciiHttpServer.from_settings().serve_forever())
+    except KeyboardInterrupt:
+        pass
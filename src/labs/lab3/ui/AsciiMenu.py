@@ -1,3 +1,5 @@
+from time import perf_counter, sleep
+
 from labs.lab3.bll.AsciiController import AsciiController
 from shared.classes.input import StringInput
 from shared.classes.menu_builder import MenuBuilder
@@ -32,6 +34,12 @@ class AsciiMenu(UIInterface):
         make_art():
             Handles the creation of ASCII art based on user input.
 
+        live_preview():
+            Re-renders the preview after every edit of the text, only the changed tail is rendered.
+
+        show_marquee():
+            Scrolls the art of the text through the width of the art until Ctrl+C.
+
         save_art():
             Saves the generated ASCII art to a text file.
 
@@ -65,7 +73,9 @@ class AsciiMenu(UIInterface):
             .set_dynamic_title(self.get_art)
             .add_option("1", "1. Make art\n", self.make_art)
             .add_option("2", "2. Save art\n", self.save_art)
-            .add_option("3", "3. Settings", self.show_settings)
+            .add_option("3", "3. Settings\n", self.show_settings)
+            .add_option("4", "4. Live preview\n", self.live_preview)
+            .add_option("5", "5. Scrolling banner", self.show_marquee)
             .add_stop_options(["0", "Exit", "exit"], "0. Exit")
             .build()
         )
@@ -82,13 +92,18 @@ class AsciiMenu(UIInterface):
         if char_width == 0:
             print("Limits too low, can't create even 1 symbol, change settings")
             return
+        max_chars = max(char_width, self.__controller.get_max_char_limit())
         message = (
-            f"Make art up to {char_width} chars"
+            f"Make art, {char_width} chars always fit, up to {max_chars} with narrow letters"
             + "\nIf want more change width, height, font or line breaking in settings"
             + "\n Input text : "
         )
-        input = StringInput().input(message, [1, char_width], "Too long")
-        art = self.__controller.generate(input)
+        input = StringInput().input(message, [1, max_chars], "Too long")
+        lines = self.__controller.fit_text(input)
+        fitted = " ".join(lines)
+        if len(fitted) < len(" ".join(input.split())):
+            print(f"Only '{fitted}' fits, the rest is cut")
+        art = self.__controller.generate_lines(lines)
         if len(art) < 1:
             try:
                 int(input)
@@ -99,7 +114,48 @@ class AsciiMenu(UIInterface):
         if not art:
             print("Art can't created")
             return
-        art = self.__controller.create_art(input)
+        self.__controller.create_art(input, art)
+
+    def live_preview(self):
+        is_font_correct = self.__controller.is_font_correct()
+        if not is_font_correct:
+            print("Can't generate example, no such font\n CHANGE FONT TO AVAILABLE")
+            return
+        char_width = self.__controller.get_char_limit()
+        if char_width == 0:
+            print("Limits too low, can't create even 1 symbol, change settings")
+            return
+        max_chars = max(char_width, self.__controller.get_max_char_limit())
+        message = f"Edit text up to {max_chars} chars (empty to stop): "
+        while True:
+            # an empty line stops the preview, so the lower limit is 0
+            text = StringInput().input(message, [0, max_chars], "Too long")
+            if not text:
+                return
+            print(self.__controller.preview(text))
+
+    def show_marquee(self):
+        is_font_correct = self.__controller.is_font_correct()
+        if not is_font_correct:
+            print("Can't generate example, no such font\n CHANGE FONT TO AVAILABLE")
+            return
+        message = "Input text of the banner : "
+        limit = 200  # hardcode variable of banner lenght
+        text = StringInput().input(message, [1, limit], "Too long")
+        marquee = self.__controller.create_marquee(text)
+        screen = self.__controller.create_marquee_screen(marquee)
+        frame_time = 1 / self.__controller.get_marquee_fps()
+        screen.begin()
+        try:
+            next_frame = perf_counter()
+            for frame in marquee.frames():
+                screen.draw(frame, 0)
+                next_frame += frame_time
+                sleep(max(0.0, next_frame - perf_counter()))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            screen.end()
 
     def save_art(self):
         art = self.__controller.get_art()
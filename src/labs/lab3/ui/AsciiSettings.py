@@ -61,6 +61,9 @@ class AsciiSettingsUI:
     set_line_breaking(self)
         Allows the user to enable or disable line breaking (word wrapping) during ASCII art generation.
 
+    show_fonts_gallery(self)
+        Renders the user text with every available font.
+
     see_example(self)
         Provides an example of the current settings applied to a sample text.
     """
@@ -91,6 +94,7 @@ class AsciiSettingsUI:
             .add_option(
                 "7", "7. Change line breaking (word wrapping)\n", self.set_line_breaking
             )
+            .add_option("8", "8. Preview text in all fonts\n", self.show_fonts_gallery)
             .add_stop_options(["0", "Exit", "exit"], "0. Exit")
             .build()
         )
@@ -203,6 +207,12 @@ class AsciiSettingsUI:
         result = BoolInput.default(message)
         self.__controller.set_is_line_breaks(result)
 
+    def show_fonts_gallery(self):
+        message = "Text for preview: "
+        text = StringInput.input(message, [1, 30], "Too long")
+        for font, art in self.__controller.render_all_fonts(text):
+            print(f"{font}:\n{art}")
+
     def see_example(self):
         is_font_correct = self.__controller.is_font_correct()
         if not is_font_correct:
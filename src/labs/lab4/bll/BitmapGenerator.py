@@ -0,0 +1,163 @@
+from collections import Counter
+
+import numpy as np
+
+from labs.lab4.bll.CustomGenerator import CustomGenerator
+from labs.lab4.dal.PackedFont import PackedFont
+
+
+class GlyphAtlas:
+    """
+    Glyphs of one font as NumPy arrays.
+
+    Attributes:
+        bitmaps (np.ndarray): Boolean array (glyphs x height x width), glyph 0 is blank.
+        widths (np.ndarray): Width of every glyph, the blank glyph has the font width.
+        lookup (np.ndarray): Glyph index for every code point up to the largest one.
+        bright_symbol (str): Symbol the font uses for bright cells.
+    """
+
+    def __init__(self, bitmaps, widths, lookup, bright_symbol):
+        self.bitmaps = bitmaps
+        self.widths = widths
+        self.lookup = lookup
+        self.bright_symbol = bright_symbol
+
+    @classmethod
+    def from_font(cls, font):
+        height, width = font["height"], font["width"]
+        if isinstance(font, PackedFont):
+            codes, widths, bitmaps = font.atlas()
+            bright_symbol = font.bright_symbol
+        else:
+            symbols = font["symbols"]
+            chars = sorted(symbols, key=ord)
+            codes = np.array([ord(char) for char in chars], dtype=np.int64)
+            widths = np.array([max(map(len, symbols[char])) for char in chars])
+            bitmaps = np.zeros((len(chars), height, max(width, *widths, 0)), dtype=bool)
+            for index, char in enumerate(chars):
+                for row_index, row in enumerate(symbols[char]):
+                    bitmaps[index, row_index, : len(row)] = [
+                        symbol != " " for symbol in row
+                    ]
+            bright = Counter(
+                symbol for rows in symbols.values() for row in rows for symbol in row
+            )
+            bright.pop(" ", None)
+            bright_symbol = bright.most_common(1)[0][0] if bright else "@"
+        stride = max(width, bitmaps.shape[2] if len(bitmaps) else 0)
+        atlas = np.zeros((len(codes) + 1, height, stride), dtype=bool)
+        atlas[1:, :, : bitmaps.shape[2]] = bitmaps
+        glyph_widths = np.concatenate([[width], widths]).astype(np.int64)
+        lookup = np.zeros(int(codes.max()) + 1 if len(codes) else 1, dtype=np.int64)
+        lookup[codes.astype(np.int64)] = np.arange(1, len(codes) + 1)
+        return cls(atlas, glyph_widths, lookup, bright_symbol)
+
+    def indices(self, text):
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype="<u4").astype(np.int64)
+        inside = codes < len(self.lookup)
+        return np.where(inside, self.lookup[np.where(inside, codes, 0)], 0)
+
+    def compose(self, indices):
+        """
+        Composes glyphs side by side with fancy indexing, every glyph keeps its own width.
+
+        :param indices: Glyph indices of one line.
+        :return: Boolean bitmap of the line (height x sum of glyph widths).
+        """
+        widths = self.widths[indices]
+        starts = np.cumsum(widths) - widths
+        total = int(widths.sum())
+        column_glyphs = np.repeat(indices, widths)
+        column_x = np.arange(total) - np.repeat(starts, widths)
+        return self.bitmaps[column_glyphs, :, column_x].T
+
+
+class BitmapGenerator(CustomGenerator):
+    """
+    BitmapGenerator is an alternative engine for CustomGenerator fonts.
+
+    Glyphs are NumPy boolean arrays, a whole line is composed with one fancy
+    indexing operation, bright/empty symbols are mapped with a lookup array
+    and the bitmap is converted to text only once at the end.
+
+    Methods:
+        generate(cls, data, font='cap', width=80, scale=1, bright_symbol=None, empty_symbol=' '):
+            Generates ASCII art, glyphs are upsampled `scale` times in both directions.
+
+        get_atlas(cls, font_name):
+            Returns the cached GlyphAtlas of the font.
+
+        render_bitmap(cls, data, font='cap', width=80, scale=1):
+            Returns the list of line bitmaps of the art.
+
+        bitmap_to_text(bitmap, bright_symbol, empty_symbol):
+            Converts a boolean bitmap into rows of text.
+    """
+
+    atlases = {}
+
+    @classmethod
+    def get_atlas(cls, font_name):
+        font = cls.get_font(font_name)
+        atlas = cls.atlases.get(font_name)
+        if atlas is None or atlas[0] is not font:
+            atlas = (font, GlyphAtlas.from_font(font))
+            cls.atlases[font_name] = atlas
+        return atlas[1]
+
+    @classmethod
+    def render_bitmap(cls, data, font="cap", width=80, scale=1):
+        atlas = cls.get_atlas(font)
+        chars_in_line = width // (cls.get_font_char_width(font) * scale)
+        if chars_in_line < 1:
+            raise ValueError("Width is too small for the font")
+        indices = atlas.indices(data.lower())
+        lines = []
+        for start in range(0, len(indices), chars_in_line):
+            bitmap = atlas.compose(indices[start : start + chars_in_line])
+            if scale > 1:
+                bitmap = bitmap.repeat(scale, axis=0).repeat(scale, axis=1)
+            lines.append(bitmap)
+        return lines
+
+    @classmethod
+    def generate(
+        cls, data, font="cap", width=80, scale=1, bright_symbol=None, empty_symbol=" "
+    ):
+        lines = cls.render_bitmap(data, font, width, scale)
+        font_data = cls.get_font(font)
+        if bright_symbol is None:
+            bright_symbol = cls.get_atlas(font).bright_symbol
+        replace_string = font_data.get("replace_string")
+        rows = []
+        offset = 0
+        for bitmap in lines:
+            if replace_string:
+                codes = cls.__replace_codes(bitmap, replace_string, offset, empty_symbol)
+                offset += int(bitmap.sum())
+                rows.extend(cls.__codes_to_rows(codes))
+            else:
+                rows.extend(cls.bitmap_to_text(bitmap, bright_symbol, empty_symbol))
+        return "\n".join(rows)
+
+    @classmethod
+    def bitmap_to_text(cls, bitmap, bright_symbol, empty_symbol):
+        symbols = np.array([ord(empty_symbol), ord(bright_symbol)], dtype=np.uint32)
+        return cls.__codes_to_rows(symbols[bitmap.view(np.uint8)])
+
+    @staticmethod
+    def __replace_codes(bitmap, replace_string, offset, empty_symbol):
+        # bright cells take replace string symbols in row-major order, the
+        # position continues from the previous line like in string_replace
+        replace_codes = np.array([ord(char) for char in replace_string], dtype=np.uint32)
+        positions = (np.cumsum(bitmap.ravel()) - 1 + offset) % len(replace_codes)
+        codes = np.where(bitmap.ravel(), replace_codes[positions], ord(empty_symbol))
+        return codes.astype(np.uint32).reshape(bitmap.shape)
+
+    @staticmethod
+    def __codes_to_rows(codes):
+        height, width = codes.shape
+        if width == 0:
+            return [""] * height
+        return np.ascontiguousarray(codes).view(f"<U{width}").ravel().tolist()
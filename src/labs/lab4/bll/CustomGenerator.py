@@ -1,6 +1,22 @@
-from labs.lab4.bll.base_font import base_font
+from pathlib import Path
+
+from labs.lab4.dal.PackedFont import EXTENSION, PackedFont
 from shared.classes.ascii_generator import AsciiGenerator
 
+# dict fonts of the lab, base_font is imported when one of them is used first
+BUILTIN_FONTS = ("cap", "oleh_cap")
+
+
+def builtin_fonts():
+    """
+    :return: Dictionary of the names and the dict fonts of the lab.
+    """
+    from labs.lab4.bll.base_font import base_font
+
+    name_font = base_font.copy()
+    name_font["replace_string"] = "oleh"
+    return {"cap": base_font, "oleh_cap": name_font}
+
 
 class CustomGenerator(AsciiGenerator):
     """
@@ -9,8 +25,7 @@ class CustomGenerator(AsciiGenerator):
     class CustomGenerator(AsciiGenerator):
 
     Attributes:
-        name_font (dict): A copy of the base font with some modifications.
-        fonts (dict): A dictionary of fonts, including the base font and the modified name font.
+        fonts (dict): A dictionary of the loaded fonts, the built-in dict fonts are added on first use.
 
     Methods:
         generate(cls, data, font='cap_font', width=80):
@@ -33,11 +48,15 @@ class CustomGenerator(AsciiGenerator):
 
         get_font_char_width(cls, font_name):
             Retrieves the character width of the specified font.
+
+        add_font(cls, font_name, font):
+            Registers a dict font or a PackedFont under the given name.
+
+        load_fonts_folder(cls, folder):
+            Registers every packed font file of the folder, files are opened on first use.
     """
 
-    name_font = base_font.copy()
-    name_font["replace_string"] = "oleh"
-    fonts = {"cap": base_font, "oleh_cap": name_font}
+    fonts = {}
 
     @classmethod
     def generate(cls, data, font="cap_font", width=80):
@@ -89,10 +108,14 @@ class CustomGenerator(AsciiGenerator):
 
     @classmethod
     def get_fonts(cls):
-        return list(cls.fonts.keys())
+        return list(dict.fromkeys([*BUILTIN_FONTS, *cls.fonts]))
 
     @classmethod
     def get_font(cls, font_name):
+        if font_name not in cls.fonts and font_name in BUILTIN_FONTS:
+            # packed fonts of the same names loaded before are kept
+            for name, font in builtin_fonts().items():
+                cls.fonts.setdefault(name, font)
         if font_name not in cls.fonts:
             raise ValueError(f"Font '{font_name}' not found.")
         return cls.fonts[font_name]
@@ -106,3 +129,18 @@ class CustomGenerator(AsciiGenerator):
     def get_font_char_width(cls, font_name):
         font = cls.get_font(font_name)
         return font["width"]
+
+    @classmethod
+    def add_font(cls, font_name, font):
+        cls.fonts[font_name] = font
+
+    @classmethod
+    def load_fonts_folder(cls, folder):
+        folder = Path(folder)
+        if not folder.is_dir():
+            return []
+        names = []
+        for path in sorted(folder.glob("*" + EXTENSION)):
+            cls.add_font(path.stem, PackedFont(path))
+            names.append(path.stem)
+        return names
@@ -1,3 +1,4 @@
+from shared.classes.ansi_writer import AnsiWriter
 from shared.interfaces.paint_text_interface import PaintTextInterface
 
 
@@ -10,6 +11,9 @@ class CustomPainter(PaintTextInterface):
     color_map:
         A dictionary mapping color names to their respective ANSI escape codes.
 
+    writer:
+        Shared ANSI writer that caches escape codes and emits them only on color change.
+
     Methods:
         paint(cls, text, color):
             Paints the given text with the specified color using ANSI escape codes.
@@ -24,6 +28,12 @@ class CustomPainter(PaintTextInterface):
             Raises:
                 ValueError: If the specified color is not supported.
 
+        paint_spans(cls, spans):
+            Paints a sequence of (text, color) spans, emitting escape codes only on color change.
+
+        paint_cells(cls, chars, colors):
+            Paints every character with its own color, emitting escape codes only on color change.
+
         get_colors(cls):
             Retrieves the list of supported colors.
 
@@ -45,14 +55,19 @@ class CustomPainter(PaintTextInterface):
         "default": "\x1b[0m",
     }
 
+    writer = AnsiWriter(color_map)
+
     @classmethod
     def paint(cls, text, color):
-        if color in cls.color_map:
-            start_color = cls.color_map[color]
-            end_color = cls.color_map["default"]
-            return f"{start_color}{text}{end_color}"
-        else:
-            raise ValueError(f"Color '{color}' is not supported.")
+        return cls.writer.paint(text, color)
+
+    @classmethod
+    def paint_spans(cls, spans):
+        return cls.writer.paint_spans(spans)
+
+    @classmethod
+    def paint_cells(cls, chars, colors):
+        return cls.writer.paint_cells(chars, colors)
 
     @classmethod
     def get_colors(cls):
@@ -0,0 +1,167 @@
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from config.settings_paths import settings_path_lab3
+from labs.lab4.bll.CustomGenerator import BUILTIN_FONTS, builtin_fonts
+from labs.lab4.dal.PackedFont import EXTENSION, PackedFont
+from shared.classes.dict_json import DictJsonDataAccess
+
+FLF_SIGNATURE = "flf2a"
+# characters that every FIGlet font defines after the printable ASCII range
+FLF_REQUIRED_CODES = list(range(32, 127)) + [196, 214, 220, 228, 246, 252, 223]
+
+
+class FontCompiler:
+    """
+    FontCompiler converts fonts into the packed binary font format.
+
+    Methods:
+        glyph_bitmap(rows):
+            Converts glyph rows into a boolean bitmap, spaces are empty cells.
+
+        compile_dict_font(font, path):
+            Compiles a dict font (like base_font) into a packed font file.
+
+        compile_builtin_fonts(save_folder):
+            Compiles the built-in dict fonts that the folder does not have yet.
+
+        parse_flf(text):
+            Parses a FIGlet font and returns its height and glyph rows.
+
+        compile_flf_font(flf_path, path=None, name=None):
+            Compiles a FIGlet .flf file into a packed font file.
+
+        compile_flf_folder(folder, save_folder):
+            Compiles all .flf files of the folder.
+    """
+
+    @staticmethod
+    def glyph_bitmap(rows):
+        width = max((len(row) for row in rows), default=0)
+        padded = [row.ljust(width) for row in rows]
+        return np.array([[char != " " for char in row] for row in padded], dtype=bool)
+
+    @classmethod
+    def compile_dict_font(cls, font, path):
+        symbols = font["symbols"]
+        glyphs = {char: cls.glyph_bitmap(rows) for char, rows in symbols.items()}
+        bright = Counter(
+            char for rows in symbols.values() for row in rows for char in row if char != " "
+        )
+        bright_symbol = bright.most_common(1)[0][0] if bright else "@"
+        PackedFont.write(
+            path,
+            font.get("name", Path(path).stem),
+            font["height"],
+            glyphs,
+            replace_string=font.get("replace_string", ""),
+            is_breaks_lines=font.get("is_breaks_lines", False),
+            bright_symbol=bright_symbol,
+        )
+
+    @classmethod
+    def compile_builtin_fonts(cls, save_folder):
+        save_folder = Path(save_folder)
+        missing = [
+            name for name in BUILTIN_FONTS if not (save_folder / (name + EXTENSION)).exists()
+        ]
+        if not missing:
+            return []
+        save_folder.mkdir(parents=True, exist_ok=True)
+        fonts = builtin_fonts()
+        compiled = []
+        for name in missing:
+            path = save_folder / (name + EXTENSION)
+            cls.compile_dict_font(fonts[name], path)
+            compiled.append(path)
+        return compiled
+
+    @staticmethod
+    def parse_flf(text):
+        lines = text.splitlines()
+        header = lines[0].split()
+        if not header or not header[0].startswith(FLF_SIGNATURE):
+            raise ValueError("Not a FIGlet font")
+        hard_blank = header[0][len(FLF_SIGNATURE)]
+        height = int(header[1])
+        comment_lines = int(header[5])
+        index = 1 + comment_lines
+
+        def read_glyph():
+            nonlocal index
+            rows = lines[index : index + height]
+            if len(rows) < height:
+                return None
+            index += height
+            end_mark = rows[-1].rstrip()[-1:] if rows[-1].rstrip() else ""
+            glyph = []
+            for row in rows:
+                row = row.rstrip()
+                for _ in range(2):
+                    if end_mark and row.endswith(end_mark):
+                        row = row[:-1]
+                glyph.append(row.replace(hard_blank, " "))
+            return glyph
+
+        glyphs = {}
+        for code in FLF_REQUIRED_CODES:
+            glyph = read_glyph()
+            if glyph is None:
+                return height, glyphs
+            glyphs[chr(code)] = glyph
+        while index < len(lines):
+            tag = lines[index].split()
+            index += 1
+            if not tag:
+                continue
+            glyph = read_glyph()
+            if glyph is None:
+                break
+            try:
+                code = tag[0]
+                is_octal = code.startswith("0") and code[1:].isdigit()
+                code = int(code, 8) if is_octal else int(code, 0)
+            except ValueError:
+                continue
+            if code >= 0:
+                glyphs[chr(code)] = glyph
+        return height, glyphs
+
+    @classmethod
+    def compile_flf_font(cls, flf_path, path=None, name=None):
+        flf_path = Path(flf_path)
+        path = Path(path) if path else flf_path.with_suffix(EXTENSION)
+        text = flf_path.read_text(encoding="utf-8", errors="replace")
+        height, rows = cls.parse_flf(text)
+        glyphs = {char: cls.glyph_bitmap(glyph) for char, glyph in rows.items()}
+        PackedFont.write(
+            path, name or flf_path.stem, height, glyphs, is_breaks_lines=True, bright_symbol="#"
+        )
+        return path
+
+    @classmethod
+    def compile_flf_folder(cls, folder, save_folder):
+        save_folder = Path(save_folder)
+        save_folder.mkdir(parents=True, exist_ok=True)
+        compiled = []
+        for flf_path in sorted(Path(folder).glob("*.flf")):
+            try:
+                compiled.append(
+                    cls.compile_flf_font(flf_path, save_folder / (flf_path.stem + EXTENSION))
+                )
+            except (ValueError, IndexError) as e:
+                print(f"Can't compile {flf_path.name}: {e}")
+        return compiled
+
+
+if __name__ == "__main__":
+    # python -m labs.lab4.bll.FontCompiler [folder of .flf fonts]
+    # compiles the built-in fonts and the FIGlet fonts into the lab3 fonts folder
+    fonts_folder = DictJsonDataAccess(settings_path_lab3).get("__fonts_folder")
+    paths = FontCompiler.compile_builtin_fonts(fonts_folder)
+    for flf_folder in sys.argv[1:]:
+        paths += FontCompiler.compile_flf_folder(flf_folder, fonts_folder)
+    print(f"{len(paths)} font(s) compiled into {fonts_folder}")
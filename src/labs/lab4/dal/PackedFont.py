@@ -0,0 +1,220 @@
+import mmap
+from collections.abc import Mapping
+from struct import Struct
+
+import numpy as np
+
+MAGIC = b"AFNT"
+VERSION = 1
+FLAG_BREAKS_LINES = 1
+HEADER = Struct("<4sHHHHHH")
+META_SEPARATOR = "\x00"
+EXTENSION = ".afnt"
+
+
+def _aligned(offset, alignment=4):
+    return (offset + alignment - 1) // alignment * alignment
+
+
+class PackedFont(Mapping):
+    """
+    Font stored in the compact binary format and opened with a memory map.
+
+    The file layout (little-endian):
+        header: magic "AFNT", version, height, width (glyph stride), flags,
+            glyph count and size of the meta block;
+        meta: UTF-8 name, replace string and bright symbol separated by NUL;
+        codes: sorted uint32 code points of the glyphs;
+        widths: uint16 width of every glyph;
+        bitmaps: one bit per cell, every glyph row packed into whole bytes.
+
+    The object behaves like the dict fonts of CustomGenerator (keys "height",
+    "width", "name", "is_breaks_lines", "symbols" and optional
+    "replace_string"), the file is opened only on the first access and glyphs
+    are decoded on demand.
+
+    Methods:
+        __init__(path):
+            Remembers the path of the font file without opening it.
+
+        write(path, name, height, glyphs, ...):
+            Class method to write glyph bitmaps into a font file.
+
+        glyph_codes():
+            Returns the sorted code points of the glyphs.
+
+        glyph_index(char):
+            Returns the index of the glyph or None if the font has no such glyph.
+
+        glyph_bitmap(char):
+            Returns the boolean bitmap of the glyph.
+
+        atlas():
+            Returns code points, widths and bitmaps of all glyphs as arrays.
+
+        close():
+            Closes the memory map, a map used by arrays of atlas() is closed when they are collected.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._mmap = None
+        self._values = None
+        self._codes = None
+        self._widths = None
+        self._bitmaps = None
+
+    @classmethod
+    def write(
+        cls,
+        path,
+        name,
+        height,
+        glyphs,
+        replace_string="",
+        is_breaks_lines=False,
+        bright_symbol="@",
+    ):
+        """
+        :param path: Path of the font file to write.
+        :param name: Name of the font.
+        :param height: Height of every glyph in rows.
+        :param glyphs: Dictionary of characters and boolean arrays (height x glyph width).
+        :param replace_string: Replace string of the font, empty if not used.
+        :param is_breaks_lines: Whether the font breaks lines.
+        :param bright_symbol: Symbol used for the set bits when the glyph is decoded.
+        :return: None
+        """
+        chars = sorted(glyphs, key=ord)
+        width = max((np.shape(glyphs[char])[1] for char in chars), default=0)
+        codes = np.array([ord(char) for char in chars], dtype="<u4")
+        widths = np.array([np.shape(glyphs[char])[1] for char in chars], dtype="<u2")
+        bitmaps = np.zeros((len(chars), height, width), dtype=bool)
+        for index, char in enumerate(chars):
+            bitmap = np.asarray(glyphs[char], dtype=bool)
+            if bitmap.shape[0] != height:
+                raise ValueError(f"Glyph '{char}' height differs from font height")
+            bitmaps[index, :, : bitmap.shape[1]] = bitmap
+        meta = META_SEPARATOR.join([name, replace_string, bright_symbol]).encode("utf-8")
+        flags = FLAG_BREAKS_LINES if is_breaks_lines else 0
+        header = HEADER.pack(MAGIC, VERSION, height, width, flags, len(chars), len(meta))
+        with open(path, "wb") as file:
+            file.write(header + meta)
+            file.write(b"\x00" * (_aligned(file.tell()) - file.tell()))
+            file.write(codes.tobytes())
+            file.write(widths.tobytes())
+            file.write(np.packbits(bitmaps, axis=-1).tobytes())
+
+    def __load(self):
+        if self._values is not None:
+            return
+        with open(self.path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, height, width, flags, count, meta_size = HEADER.unpack_from(
+            self._mmap
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"'{self.path}' is not a packed font")
+        offset = HEADER.size
+        meta = bytes(self._mmap[offset : offset + meta_size]).decode("utf-8")
+        name, replace_string, bright_symbol = meta.split(META_SEPARATOR)
+        offset = _aligned(offset + meta_size)
+        self._codes = np.frombuffer(self._mmap, "<u4", count, offset)
+        offset += self._codes.nbytes
+        self._widths = np.frombuffer(self._mmap, "<u2", count, offset)
+        offset += self._widths.nbytes
+        row_bytes = (width + 7) // 8
+        self._bitmaps = np.frombuffer(
+            self._mmap, np.uint8, count * height * row_bytes, offset
+        ).reshape(count, height, row_bytes)
+        self.bright_symbol = bright_symbol
+        self._values = {
+            "height": height,
+            "width": width,
+            "name": name,
+            "is_breaks_lines": bool(flags & FLAG_BREAKS_LINES),
+            "symbols": PackedGlyphs(self),
+        }
+        if replace_string:
+            self._values["replace_string"] = replace_string
+
+    def __getitem__(self, key):
+        self.__load()
+        return self._values[key]
+
+    def __iter__(self):
+        self.__load()
+        return iter(self._values)
+
+    def __len__(self):
+        self.__load()
+        return len(self._values)
+
+    def glyph_codes(self):
+        self.__load()
+        return self._codes
+
+    def glyph_index(self, char):
+        self.__load()
+        code = ord(char)
+        index = int(np.searchsorted(self._codes, code))
+        if index < len(self._codes) and self._codes[index] == code:
+            return index
+        return None
+
+    def glyph_bitmap(self, char):
+        index = self.glyph_index(char)
+        if index is None:
+            raise KeyError(char)
+        width = int(self._widths[index])
+        return np.unpackbits(self._bitmaps[index], axis=-1, count=width).astype(bool)
+
+    def atlas(self):
+        self.__load()
+        width = self._values["width"]
+        bitmaps = np.unpackbits(self._bitmaps, axis=-1, count=width).astype(bool)
+        return self._codes, self._widths, bitmaps
+
+    def close(self):
+        if self._mmap is None:
+            return
+        self._codes = self._widths = self._bitmaps = None
+        self._values = None
+        font_map, self._mmap = self._mmap, None
+        try:
+            font_map.close()
+        except BufferError:
+            # arrays of atlas() still use the map, it is closed with the last of them
+            pass
+
+
+class PackedGlyphs(Mapping):
+    """
+    Read-only mapping of characters to glyph rows of a PackedFont.
+
+    Rows are decoded from the bitmaps on the first access and cached.
+    """
+
+    def __init__(self, font: PackedFont):
+        self._font = font
+        self._decoded = {}
+
+    def __getitem__(self, char):
+        rows = self._decoded.get(char)
+        if rows is None:
+            bitmap = self._font.glyph_bitmap(char)
+            symbols = np.array([" ", self._font.bright_symbol])[bitmap.astype(np.uint8)]
+            rows = ["".join(row) for row in symbols]
+            self._decoded[char] = rows
+        return rows
+
+    def __contains__(self, char):
+        if not isinstance(char, str) or len(char) != 1:
+            return False
+        return self._font.glyph_index(char) is not None
+
+    def __iter__(self):
+        return (chr(code) for code in self._font.glyph_codes())
+
+    def __len__(self):
+        return len(self._font.glyph_codes())
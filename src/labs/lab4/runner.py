@@ -1,4 +1,5 @@
 from labs.lab3.ascii_fabric import AsciiFabric
+from shared.classes.menu_builder import MenuBuilder
 from shared.interfaces.runner_interface import RunnerInterface
 
 
@@ -9,9 +10,23 @@ class Runner(RunnerInterface):
     Methods
     -------
     run():
-        A static method that creates and shows a custom ASCII art using the AsciiFabric library.
+        A static method that lets the user choose the engine of the custom fonts and shows the ASCII art menu
+        created by the AsciiFabric library: the string engine (CustomGenerator) or the NumPy bitmap engine
+        (BitmapGenerator).
     """
 
     @staticmethod
     def run():
-        AsciiFabric.custom().show()
+        (
+            MenuBuilder()
+            .set_title("Custom fonts engine")
+            .set_warning("Wrong input!")
+            .set_input_text("Choose: ")
+            .add_option("1", "1. Custom generator\n", lambda: AsciiFabric.custom().show())
+            .add_option(
+                "2", "2. Bitmap generator (NumPy)\n", lambda: AsciiFabric.bitmap().show()
+            )
+            .add_stop_options(["0", "Exit", "exit"], "0. Exit")
+            .build()
+            .show()
+        )
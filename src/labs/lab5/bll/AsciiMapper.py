@@ -0,0 +1,137 @@
+import numpy as np
+
+from labs.lab5.bll.ColorQuantizer import ColorQuantizer
+from shared.classes.ansi_writer import AnsiWriter
+from shared.classes.terminal_screen import pack_rgb
+
+# characters are about three times higher than wide in a terminal
+HEIGHT_TO_WIDTH_RATIO = 3
+# ITU-R 601-2 luma weights 299/587/114 in 16.16 fixed point, the same as PIL "L"
+LUMA_WEIGHTS = (19595, 38470, 7471)
+
+
+def nearest_indices(size, source_size):
+    """
+    Source indices of nearest neighbour resampling, the same as PIL Image.NEAREST.
+
+    :param size: Size of the result along the axis.
+    :param source_size: Size of the source along the axis.
+    :return: Array of source indices.
+    """
+    scale = source_size / size
+    # PIL accumulates the sample position pixel by pixel starting at half a pixel
+    steps = np.full(size, scale)
+    steps[0] = scale * 0.5
+    return np.minimum(np.cumsum(steps).astype(np.int64), source_size - 1)
+
+
+class AsciiMapper:
+    """
+    AsciiMapper converts RGB pixels into colored ASCII art without OpenGL.
+
+    The brightness of every pixel is mapped to a character with a lookup
+    table of 256 code points, colors are reduced by the ColorQuantizer of the
+    color mode and written by AnsiWriter run by run.
+
+    Methods:
+        __init__(ascii_chars, writer=None, quantizer=None):
+            Initializes the mapper with the characters from the brightest to the darkest.
+
+        set_quantizer(quantizer):
+            Sets the quantizer of the color mode, truecolor by default.
+
+        scaled_size(width, height, ascii_height=None):
+            Returns the size (columns, rows) of the art for an image of the given size.
+
+        resize(pixels, columns, rows):
+            Resizes the pixels with nearest neighbour sampling.
+
+        luminance(pixels):
+            Returns the brightness of every RGB pixel.
+
+        to_codes(pixels):
+            Returns the code points of the characters of every pixel.
+
+        to_cells(pixels, is_colored=True):
+            Returns the code points and the color ids of every pixel, ids are None without colors.
+
+        cell_escapes():
+            Returns the escape codes of the color ids, None when the ids are packed 0xRRGGBB colors.
+
+        cells_to_ascii(codes, color_ids=None):
+            Returns the art of code points colored with color ids.
+
+        to_ascii(pixels, is_colored=True):
+            Returns the art of the pixels, colored with the pixel colors.
+
+        image_to_ascii(pixels, ascii_height=None, is_colored=True):
+            Resizes an image to the art size and converts it.
+    """
+
+    def __init__(self, ascii_chars, writer=None, quantizer=None):
+        self.ascii_chars = list(ascii_chars)
+        self.writer = writer if writer else AnsiWriter()
+        self.quantizer = None
+        self.set_quantizer(quantizer)
+        gray = np.arange(256)
+        char_indices = (gray / 255 * (len(self.ascii_chars) - 1)).astype(np.int64)
+        codes = np.array([ord(char) for char in self.ascii_chars], dtype=np.uint32)
+        self.lut = codes[char_indices]
+
+    def set_quantizer(self, quantizer):
+        self.quantizer = quantizer if quantizer else ColorQuantizer(writer=self.writer)
+
+    @staticmethod
+    def scaled_size(width, height, ascii_height=None):
+        # tiny and very narrow images still get one cell
+        rows = max(1, ascii_height if ascii_height else int(height * 0.2))
+        if height and width:
+            columns = int(rows * (width / height) * HEIGHT_TO_WIDTH_RATIO)
+        else:
+            columns = int(rows * HEIGHT_TO_WIDTH_RATIO)
+        return max(1, columns), rows
+
+    @staticmethod
+    def resize(pixels, columns, rows):
+        height, width = pixels.shape[:2]
+        ys = nearest_indices(rows, height)
+        xs = nearest_indices(columns, width)
+        return pixels[ys[:, None], xs]
+
+    @staticmethod
+    def luminance(pixels):
+        pixels = pixels.astype(np.uint32)
+        r, g, b = LUMA_WEIGHTS
+        gray = pixels[..., 0] * r + pixels[..., 1] * g + pixels[..., 2] * b
+        return ((gray + 0x8000) >> 16).astype(np.uint8)
+
+    def to_codes(self, pixels):
+        return self.lut[self.luminance(pixels)]
+
+    def to_cells(self, pixels, is_colored=True):
+        codes = np.ascontiguousarray(self.to_codes(pixels))
+        if not is_colored or not self.quantizer.is_colored():
+            return codes, None
+        if self.quantizer.is_indexed():
+            return codes, self.quantizer.quantize(pixels)
+        return codes, pack_rgb(pixels[..., :3])
+
+    def cell_escapes(self):
+        return self.quantizer.escapes if self.quantizer.is_indexed() else None
+
+    def cells_to_ascii(self, codes, color_ids=None):
+        if color_ids is None:
+            if codes.shape[1] == 0:
+                return "\n".join([""] * codes.shape[0])
+            return "\n".join(codes.view(f"<U{codes.shape[1]}").ravel().tolist())
+        if self.quantizer.is_indexed():
+            return self.writer.paint_codes(codes, color_ids, self.quantizer.escapes)
+        return self.writer.paint_packed(codes, color_ids)
+
+    def to_ascii(self, pixels, is_colored=True):
+        return self.cells_to_ascii(*self.to_cells(pixels, is_colored))
+
+    def image_to_ascii(self, pixels, ascii_height=None, is_colored=True):
+        height, width = pixels.shape[:2]
+        columns, rows = self.scaled_size(width, height, ascii_height)
+        return self.to_ascii(self.resize(pixels, columns, rows), is_colored)
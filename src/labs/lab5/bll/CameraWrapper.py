@@ -3,6 +3,7 @@ import math
 import numpy as np
 from OpenGL.GLU import gluLookAt
 
+from labs.lab5.bll.SoftwareRasterizer import look_at, perspective
 from labs.lab5.dal.Camera import CameraData
 
 
@@ -58,6 +59,13 @@ class Camera:
             self.data.up_vector[2],
         )
 
+    def view_matrix(self):
+        return look_at(self.data.position, self.data.target, self.data.up_vector)
+
+    def projection_matrix(self, aspect=None):
+        fovy, camera_aspect, z_near, z_far = self.get_perspective()
+        return perspective(fovy, aspect or camera_aspect, z_near, z_far)
+
     def rotate(self, dx, dy, dz=0):
         self.data.yaw -= dy
         self.data.pitch += dx
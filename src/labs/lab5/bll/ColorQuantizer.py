@@ -0,0 +1,154 @@
+import numpy as np
+
+from shared.classes.ansi_writer import AnsiWriter
+
+COLOR_MODES = ["truecolor", "256", "16", "mono", "palette"]
+# the lookup table keeps the 5 high bits of every channel (32 x 32 x 32 cells)
+LUT_BITS = 5
+# the 16 base ANSI colors (VGA values) with their foreground codes 30-37 and 90-97
+ANSI_16_COLORS = [
+    (0, 0, 0),
+    (170, 0, 0),
+    (0, 170, 0),
+    (170, 85, 0),
+    (0, 0, 170),
+    (170, 0, 170),
+    (0, 170, 170),
+    (170, 170, 170),
+    (85, 85, 85),
+    (255, 85, 85),
+    (85, 255, 85),
+    (255, 255, 85),
+    (85, 85, 255),
+    (255, 85, 255),
+    (85, 255, 255),
+    (255, 255, 255),
+]
+ANSI_16_CODES = list(range(30, 38)) + list(range(90, 98))
+XTERM_CUBE_LEVELS = [0, 95, 135, 175, 215, 255]
+
+
+def xterm_256_colors():
+    """
+    Colors 16-255 of the xterm palette, the colors 0-15 depend on the terminal theme.
+
+    :return: List of (index, (r, g, b)) pairs.
+    """
+    colors = []
+    for r in XTERM_CUBE_LEVELS:
+        for g in XTERM_CUBE_LEVELS:
+            for b in XTERM_CUBE_LEVELS:
+                colors.append((16 + len(colors), (r, g, b)))
+    for index in range(24):
+        level = 8 + index * 10
+        colors.append((232 + index, (level, level, level)))
+    return colors
+
+
+def build_lut(palette):
+    """
+    Finds the nearest palette color for the center of every lookup table cell.
+
+    :param palette: Array of (r, g, b) colors.
+    :return: Array of palette indices, one per cell (32768 cells).
+    """
+    palette = np.asarray(palette, dtype=np.float32)
+    size = 1 << LUT_BITS
+    step = 256 // size
+    levels = np.arange(size, dtype=np.float32) * step + step / 2
+    r, g, b = np.meshgrid(levels, levels, levels, indexing="ij")
+    centers = np.stack([r.ravel(), g.ravel(), b.ravel()], axis=1)
+    # |c - p|^2 = |c|^2 - 2 c.p + |p|^2, |c|^2 is the same for every p of a cell
+    distances = (palette**2).sum(axis=1) - 2 * centers @ palette.T
+    return np.argmin(distances, axis=1).astype(np.int32)
+
+
+class ColorQuantizer:
+    """
+    ColorQuantizer reduces the colors of a frame to the colors of an output mode.
+
+    Every mode except truecolor and mono has a palette and a lookup table with
+    the nearest palette color of every 15-bit color, so a whole frame is
+    quantized with one indexing. Lookup tables are built once per palette.
+
+    Modes:
+        truecolor: 24-bit colors, the frame is not quantized.
+        256: the xterm 256 color palette (colors 16-255).
+        16: the 16 base ANSI colors.
+        mono: no colors.
+        palette: the colors of the given palette as 24-bit colors.
+
+    Methods:
+        __init__(mode="truecolor", palette=None, writer=None):
+            Initializes the quantizer, palette is required for the palette mode.
+
+        is_colored():
+            Returns whether the mode writes colors.
+
+        is_indexed():
+            Returns whether the colors are quantized to a palette.
+
+        quantize(pixels):
+            Returns the palette index of every pixel.
+
+        colors(pixels):
+            Returns the (r, g, b) palette color of every pixel.
+    """
+
+    _luts = {}
+
+    def __init__(self, mode="truecolor", palette=None, writer=None):
+        if mode not in COLOR_MODES:
+            raise ValueError(f"Color mode '{mode}' is not supported.")
+        self.mode = mode
+        self.writer = writer if writer else AnsiWriter()
+        self.palette = None
+        self.escapes = None
+        self.lut = None
+        if mode == "256":
+            indices, colors = zip(*xterm_256_colors())
+            self.palette = np.array(colors, dtype=np.uint8)
+            self.escapes = [f"\x1b[38;5;{index}m" for index in indices]
+        elif mode == "16":
+            self.palette = np.array(ANSI_16_COLORS, dtype=np.uint8)
+            self.escapes = [f"\x1b[{code}m" for code in ANSI_16_CODES]
+        elif mode == "palette":
+            if not palette:
+                raise ValueError("Color palette is empty.")
+            self.palette = np.array(
+                [self.__to_rgb(color) for color in palette], dtype=np.uint8
+            )
+            self.escapes = [self.writer.escape(color) for color in self.palette.tolist()]
+        if self.palette is not None:
+            key = self.palette.tobytes()
+            if key not in self._luts:
+                self._luts[key] = build_lut(self.palette)
+            self.lut = self._luts[key]
+
+    def is_colored(self):
+        return self.mode != "mono"
+
+    def is_indexed(self):
+        return self.lut is not None
+
+    def quantize(self, pixels):
+        if self.lut is None:
+            raise ValueError(f"Color mode '{self.mode}' has no palette.")
+        pixels = np.asarray(pixels)
+        shift = 8 - LUT_BITS
+        r = pixels[..., 0].astype(np.int32) >> shift
+        g = pixels[..., 1].astype(np.int32) >> shift
+        b = pixels[..., 2].astype(np.int32) >> shift
+        return self.lut[(r << (2 * LUT_BITS)) | (g << LUT_BITS) | b]
+
+    def colors(self, pixels):
+        if self.lut is None:
+            return np.asarray(pixels)[..., :3]
+        return self.palette[self.quantize(pixels)]
+
+    @staticmethod
+    def __to_rgb(color):
+        if isinstance(color, dict):
+            return color.get("r", 0), color.get("g", 0), color.get("b", 0)
+        r, g, b = color
+        return r, g, b
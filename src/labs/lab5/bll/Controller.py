@@ -1,13 +1,42 @@
+import logging
+
 from OpenGL.GL import *
 from OpenGL.GLU import *
 from OpenGL.GLUT import *
 
+from labs.lab5.bll.ColorQuantizer import COLOR_MODES
+from labs.lab5.bll.FigureWrapper import FigureWrapper
+from labs.lab5.bll.FramePacer import FramePacer
+from labs.lab5.bll.FrameProfiler import FrameProfiler
+from labs.lab5.bll.ImageConverter import ImageConverter
+from labs.lab5.bll.InputRecorder import InputRecorder
+from labs.lab5.bll.SoftwareRasterizer import RENDER_BACKENDS
+from labs.lab5.dal.InputRecording import save_recording
+from labs.lab5.dal.MeshImporter import load_mesh
 from labs.lab5.ui.Keyboard import KeyboardHandler
 from labs.lab5.ui.Mouse import MouseHandler
-from labs.lab5.ui.Renderer import AsciiRenderer
+from labs.lab5.ui.Renderer import AsciiRenderer, SoftwareAsciiRenderer
 from shared.classes.dict_json import DictJsonDataAccess
 from shared.classes.file_data_access import FileDataAccess
 from shared.classes.ordered_set import OrderedSet
+from shared.classes.terminal_screen import (
+    CLEAR_SCREEN,
+    DEFAULT_COLOR,
+    HIDE_CURSOR,
+    SHOW_CURSOR,
+    TerminalScreen,
+)
+from shared.services.relative_to_absolute_path import absolute
+
+logger = logging.getLogger(__name__)
+
+# scene files are a JSON manifest with a .npy geometry file of the same name
+SCENE_FILE_EXTENSION = ".json"
+# a recording is saved next to the scene file of the scene it started with
+RECORDING_EXTENSION = ".input.json"
+START_SCENE_SUFFIX = ".start"
+# pixels the mouse moves with the left button down before a click becomes a box selection
+BOX_SELECT_DISTANCE = 4
 
 
 class Controller:
@@ -25,16 +54,26 @@ class Controller:
         self.scene = scene
         self.settings = DictJsonDataAccess(settings_path)
         self.renderer = None
+        self.render_backend = None
+        render_loop = self.settings.get("render_loop") or {}
+        self.pacer = FramePacer(render_loop.get("target_fps", 30))
+        self.profiler = FrameProfiler()
         self.set_up_renderer()
         self.pressed_keys = OrderedSet()
+        self.press_position = None
         self.scenes_folder = self.settings.get("scenes_folder")
         self.__scenes_access = FileDataAccess()
         self.file_name = None
+        self.recording_name = None
         self.keyboard_handler = keyboard_handler
         self.mouse_handler = mouse_handler
         self.keyboard_handler.set_controller(self)
         self.mouse_handler.set_controller(self)
+        self.recorder = None
+        self.set_recorder(InputRecorder())
         self.last_screen = None
+        self.last_cells = None
+        self.screen = None
         self.show_callback = None
         self.action_values = {
             "draw_points": {"action": self.set_draw_mode, "args": ("points",)},
@@ -125,39 +164,66 @@ class Controller:
     def handle_keyboard(self, key, modifiers):
         self.pressed_keys.add(key)
         self.handle_actions(modifiers)
-        glutPostRedisplay()
+        self.request_redisplay()
 
     def handle_mouse(self, button, state, x, y):
         if button == GLUT_LEFT_BUTTON and state == GLUT_DOWN:
             self.scene.handle_click(x, y, button)
+            self.press_position = (x, y)
+        elif button == GLUT_LEFT_BUTTON and state == GLUT_UP:
+            # dragging with the left button selects the figures inside the rectangle
+            if self.press_position is not None:
+                x0, y0 = self.press_position
+                if max(abs(x - x0), abs(y - y0)) >= BOX_SELECT_DISTANCE:
+                    self.scene.select_rect(x0, y0, x, y)
+            self.press_position = None
         elif button == GLUT_RIGHT_BUTTON and state == GLUT_DOWN:
             self.scene.data.is_rotating = True
             self.scene.data.last_mouse_x = x
             self.scene.data.last_mouse_y = y
         elif button == GLUT_RIGHT_BUTTON and state == GLUT_UP:
             self.scene.data.is_rotating = False
-        glutPostRedisplay()
+        self.request_redisplay()
 
     def handle_wheel(self, wheel, direction, x, y):
         if direction > 0:
             self.execute_command("zoom_up")
         else:
             self.execute_command("zoom_down")
-        glutPostRedisplay()
+        self.request_redisplay()
 
     def handle_motion(self, x, y):
         self.scene.handle_motion(x, y)
+        self.request_redisplay()
+
+    def request_redisplay(self):
+        # requests between two frames are drawn as one frame, the rest waits for the timer
+        if self.pacer.request() and not self.is_headless():
+            glutPostRedisplay()
+
+    def on_timer(self, value=0):
+        if self.pacer.should_render():
+            glutPostRedisplay()
+        if not self.pacer.budget:
+            # unpaced requests are drawn at once, nothing waits for the timer
+            return
+        glutTimerFunc(max(1, int(self.pacer.delay() * 1000)), self.on_timer, value)
 
     def execute_command(self, action_key):
         command = self.action_values.get(action_key)
         if not command:
             return
+        self.recorder.record("command", action_key)
         action = command.get("action")
         args = command.get("args")
         action(*args)
-        glutPostRedisplay()
+        self.request_redisplay()
 
     def reset_perspective(self):
+        if self.is_headless():
+            # the software renderer takes the projection from the camera on every draw
+            self.request_redisplay()
+            return
         glMatrixMode(GL_PROJECTION)
         glLoadIdentity()
         fov = self.scene.data.camera.data.fovy if self.scene.data.camera.data else 45.0
@@ -170,7 +236,7 @@ class Controller:
         )
         gluPerspective(fov, aspect, z_near, z_far)
         glMatrixMode(GL_MODELVIEW)
-        glutPostRedisplay()
+        self.request_redisplay()
 
     def set_height(self, number):
         ascii_window = self.settings.get("ascii_window")
@@ -178,40 +244,133 @@ class Controller:
         self.settings.set("ascii_window", ascii_window)
         self.renderer.set_ascii_height(number)
 
+    def get_color_modes(self):
+        return list(COLOR_MODES)
+
+    def set_color_mode(self, color_mode):
+        self.renderer.set_color_mode(color_mode)
+        ascii_window = self.settings.get("ascii_window")
+        ascii_window["color_mode"] = color_mode
+        self.settings.set("ascii_window", ascii_window)
+
+    def get_render_backends(self):
+        return list(RENDER_BACKENDS)
+
+    def set_render_backend(self, render_backend):
+        if render_backend not in RENDER_BACKENDS:
+            raise ValueError(f"Render backend '{render_backend}' is not supported.")
+        self.settings.set("render_backend", render_backend)
+        self.set_up_renderer()
+
+    def is_headless(self):
+        return self.render_backend == "software"
+
     def display(self):
+        self.recorder.record("frame")
+        self.pacer.frame_started()
+        self.profiler.begin_frame()
+        self.render_frame()
+        with self.profiler.stage("write"):
+            self.print_screen()
+        self.profiler.end_frame()
+        self.pacer.frame_finished()
+        log_every = (self.settings.get("render_loop") or {}).get("log_every")
+        if log_every and self.profiler.count % log_every == 0:
+            logger.info(self.get_frame_report())
+
+    def render_frame(self):
+        self.scene.data.lod_rows = self.renderer.ascii_height
         scene_draw_func = self.scene.draw
-        self.last_screen = self.renderer.display(scene_draw_func)
-        self.print_screen()
+        self.last_cells = self.renderer.display_cells(scene_draw_func)
+        self.last_screen = None
+        return self.last_cells
+
+    def get_frame_report(self):
+        stats = self.pacer.stats
+        scene_stats = getattr(self.scene, "stats", None) or {}
+        extra = {
+            "dropped": stats["dropped"],
+            "coalesced": stats["coalesced"],
+            "visible": f"{scene_stats.get('visible', 0)}/{scene_stats.get('figures', 0)}",
+        }
+        return self.profiler.summary(extra)
+
+    def get_logger_path(self):
+        path = self.settings.get("logger_path")
+        if not path:
+            raise KeyError("There no logger path provided!")
+        return absolute(path)
+
+    def is_overlay_shown(self):
+        return bool((self.settings.get("render_loop") or {}).get("show_overlay"))
 
     def get_scene(self, remove_color=True):
+        if self.last_cells is None:
+            return None
+        codes, color_ids = self.last_cells
         if remove_color:
-            stripped_scene = []
-            for line in self.last_screen.split("\n"):
-                stripped_line = ""
-                i = 0
-                while i < len(line):
-                    if (
-                        line[i : i + 2] == "\033["
-                    ):  # Detect the start of the ANSI escape sequence
-                        i = (
-                            line.find("m", i) + 1
-                        )  # Skip to the end of the ANSI escape sequence
-                    else:
-                        stripped_line += line[i]
-                        i += 1
-                stripped_scene.append(stripped_line)
-            return "\n".join(stripped_scene)
+            return self.renderer.cells_to_ascii(codes, None)
+        if self.last_screen is None:
+            self.last_screen = self.renderer.cells_to_ascii(codes, color_ids)
         return self.last_screen
 
     def print_screen(self):
         print_settings = self.settings.get("print_settings")
         title = print_settings.get("title")
-        scene = self.get_scene(False)
         after_screen = print_settings.get("after_screen")
-        text = "\n".join([title, scene, after_screen])
-        print(text)
+        if not print_settings.get("in_place", True):
+            scene = self.get_scene(False)
+            lines = [title, scene, after_screen]
+            if self.is_overlay_shown():
+                lines.append(self.get_frame_report())
+            print("\n".join(lines))
+            return
+        codes, color_ids = self.last_cells
+        output = ""
+        escapes = self.renderer.cell_escapes()
+        screen = self.screen
+        if (
+            screen is None
+            or (screen.height, screen.width) != codes.shape
+            or screen.escapes is not escapes
+        ):
+            # the title and the footer are written once, next frames only update
+            # the cells that changed between the title and the footer
+            top = title.count("\n") + 2
+            screen = TerminalScreen(*codes.shape, escapes=escapes, origin=(top, 1))
+            self.screen = screen
+            output = (
+                f"{HIDE_CURSOR}{CLEAR_SCREEN}\x1b[1;1H{title}"
+                f"\x1b[{top + screen.height};1H{after_screen}"
+            )
+        colors = DEFAULT_COLOR if color_ids is None else color_ids
+        output += screen.diff(codes, colors)
+        if self.is_overlay_shown():
+            # the report of the previous frames is written on the line under the footer
+            output += f"\x1b[{self.__footer_end()};1H\x1b[2K{self.get_frame_report()}"
+        output += self.__below_screen()
+        screen.stats["bytes"] += len(output)
+        screen.stream.write(output)
+        screen.stream.flush()
+
+    def end_screen(self):
+        if self.screen is None:
+            return
+        self.screen.stream.write(self.__below_screen() + SHOW_CURSOR)
+        self.screen.stream.flush()
+        self.screen = None
+
+    def __footer_end(self):
+        top, _ = self.screen.origin
+        after_screen = self.settings.get("print_settings").get("after_screen")
+        return top + self.screen.height + after_screen.count("\n") + 1
+
+    def __below_screen(self):
+        overlay_height = 1 if self.is_overlay_shown() else 0
+        return f"\x1b[{self.__footer_end() + overlay_height};1H"
 
     def reshape(self, width, height):
+        self.recorder.record("reshape", width, height)
         fov = self.scene.data.camera.data.fovy if self.scene.data.camera.data else 45.0
         aspect = width / height if width and height else 1.5
         z_near = (
@@ -221,10 +380,12 @@ class Controller:
             self.scene.data.camera.data.z_far if self.scene.data.camera.data else 50.0
         )
         self.renderer.reshape(width, height, fov, aspect, z_near, z_far)
+        self.scene.picker.set_viewport(self.renderer.width, self.renderer.height)
 
     def set_draw_mode(self, draw_mode):
         if self.scene.data.selected_figure:
-            self.scene.data.selected_figure.set_draw_mode(draw_mode)
+            for figure in self.scene.data.selected_figures:
+                figure.set_draw_mode(draw_mode)
         else:
             for figure in self.scene.data.figures:
                 figure.set_draw_mode(draw_mode)
@@ -232,6 +393,14 @@ class Controller:
     def set_file_name(self, file_name):
         self.file_name = file_name
 
+    def set_recording_name(self, recording_name):
+        self.recording_name = recording_name
+
+    def set_recorder(self, recorder):
+        self.recorder = recorder
+        self.keyboard_handler.set_recorder(recorder)
+        self.mouse_handler.set_recorder(recorder)
+
     def save_scene(self):
         scenes_folder = self.settings.get("scenes_folder")
         file_name = self.file_name
@@ -243,24 +412,84 @@ class Controller:
         self.__scenes_access.set(scene)
 
     def make_scene(self):
+        if self.recording_name:
+            self.start_recording()
+        if self.is_headless():
+            self.render_headless()
+            return
         self.glut_init()
         self.add_handlers()
         glutMainLoop()
 
+    def render_headless(self):
+        self.display()
+        self.end_screen()
+        if self.file_name:
+            self.save_scene()
+        self.stop_recording()
+
     def stop_scene(self):
         glutLeaveMainLoop()
+        self.end_screen()
         if self.file_name:
             self.save_scene()
+        self.stop_recording()
+
+    def start_recording(self):
+        # the replay starts from a scene file of the scene as it is now
+        scene_name = self.recording_name + START_SCENE_SUFFIX
+        self.save_scene_file(scene_name)
+        window_settings = self.settings.get("window_settings")
+        window = (window_settings.get("width"), window_settings.get("height"))
+        settings = {"ascii_height": self.renderer.ascii_height}
+        self.recorder.start(window, scene_name + SCENE_FILE_EXTENSION, settings)
+
+    def stop_recording(self):
+        if not self.recorder.is_recording:
+            return None
+        self.recorder.stop()
+        path = self.settings.get("scenes_folder") + self.recording_name + RECORDING_EXTENSION
+        save_recording(path, self.recorder.recording())
+        return path
+
+    def convert_images(self, paths, save_folder=None):
+        ascii_window = self.settings.get("ascii_window")
+        converter = ImageConverter(
+            ascii_window.get("ascii_chars"), ascii_window.get("ascii_height")
+        )
+        return list(converter.convert_batch(paths, save_folder))
+
+    def import_mesh(self, path):
+        # the figure keeps the loaded arrays, big meshes are not copied
+        figure = FigureWrapper(load_mesh(path))
+        figure.fit()
+        self.scene.add_figure(figure)
+        return figure
+
+    def save_scene_file(self, name):
+        path = self.__scene_file_path(name)
+        self.scene.save(path)
+        return path
+
+    def open_scene_file(self, name):
+        path = self.__scene_file_path(name)
+        self.scene.load(path)
+        return path
+
+    def __scene_file_path(self, name):
+        return self.settings.get("scenes_folder") + name + SCENE_FILE_EXTENSION
 
     def translate_figure_or_camera(self, x, y, z):
         if self.scene.data.selected_figure:
-            self.scene.data.selected_figure.translate(x, y, z)
+            for figure in self.scene.data.selected_figures:
+                figure.translate(x, y, z)
         else:
             self.scene.data.camera.translate(x, y, z)
 
     def rotate_figure_or_camera(self, dx, dy, dz):
         if self.scene.data.selected_figure:
-            self.scene.data.selected_figure.rotate(dx, dy, dz)
+            for figure in self.scene.data.selected_figures:
+                figure.rotate(dx, dy, dz)
         else:
             self.scene.data.camera.rotate(dx, dy, dz)
 
@@ -276,9 +505,12 @@ class Controller:
         self.reset_perspective()
 
     def exit(self):
+        # a headless scene has no window to close, a replayed exit does nothing
+        if self.is_headless():
+            return
         self.stop_scene()
 
-    def set_up_renderer(self):
+    def set_up_renderer(self, render_backend=None):
         window_settings = self.settings.get("window_settings")
         height = window_settings.get("height")
         width = window_settings.get("width")
@@ -286,9 +518,16 @@ class Controller:
         ascii_chars = ascii_window.get("ascii_chars")
         color_palette = ascii_window.get("color_palette")
         ascii_height = ascii_window.get("ascii_height")
-        self.renderer = AsciiRenderer(
-            width, height, ascii_height, ascii_chars, color_palette
+        color_mode = ascii_window.get("color_mode", "truecolor")
+        self.render_backend = (
+            render_backend or self.settings.get("render_backend") or "opengl"
+        )
+        renderer_class = SoftwareAsciiRenderer if self.is_headless() else AsciiRenderer
+        self.renderer = renderer_class(
+            width, height, ascii_height, ascii_chars, color_palette, color_mode
         )
+        self.renderer.set_profiler(self.profiler)
+        self.scene.picker.set_viewport(width, height)
 
     def glut_init(self):
         window_settings = self.settings.get("window_settings")
@@ -320,3 +559,5 @@ class Controller:
         glutMouseFunc(self.mouse_handler.mouse)
         glutMotionFunc(self.mouse_handler.motion)
         glutMouseWheelFunc(self.mouse_handler.wheel)
+        if self.pacer.budget:
+            glutTimerFunc(max(1, int(self.pacer.budget * 1000)), self.on_timer, 0)
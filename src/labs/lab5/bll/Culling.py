@@ -0,0 +1,191 @@
+import numpy as np
+
+# scenes with fewer figures test every bounding box, bigger ones use a hierarchy
+BVH_MIN_FIGURES = 64
+# figures in a leaf of the hierarchy
+BVH_LEAF_SIZE = 4
+
+
+def frustum_planes(view_projection):
+    """
+    Extracts the planes of the view frustum from a view-projection matrix.
+
+    :param view_projection: Matrix (4 x 4) from the world to clip coordinates.
+    :return: Planes (6 x 4) as (a, b, c, d), a point is inside when a x + b y + c z + d >= 0.
+    """
+    matrix = np.asarray(view_projection, dtype=np.float64)
+    rows = [matrix[3] + matrix[0], matrix[3] - matrix[0]]  # left, right
+    rows += [matrix[3] + matrix[1], matrix[3] - matrix[1]]  # bottom, top
+    rows += [matrix[3] + matrix[2], matrix[3] - matrix[2]]  # near, far
+    planes = np.array(rows)
+    norms = np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+    return planes / np.where(norms > 0, norms, 1)
+
+
+def boxes_in_frustum(planes, minimums, maximums):
+    """
+    A box is outside when its corner farthest along the normal of a plane is behind the plane.
+
+    :param planes: Planes of the frustum (6 x 4).
+    :param minimums: Minimum corners of the boxes (N x 3).
+    :param maximums: Maximum corners of the boxes (N x 3).
+    :return: Mask of the boxes that may be inside the frustum.
+    """
+    minimums, maximums = np.asarray(minimums), np.asarray(maximums)
+    positive = planes[:, :3] >= 0
+    # the farthest corner of every box for every plane (N x 6 x 3)
+    corners = np.where(positive, maximums[:, None, :], minimums[:, None, :])
+    distances = np.einsum("npk,pk->np", corners, planes[:, :3]) + planes[:, 3]
+    return np.all(distances >= 0, axis=1)
+
+
+def ray_boxes(origin, direction, minimums, maximums):
+    """
+    Slab test of a ray against axis-aligned boxes.
+
+    :param origin: Origin of the ray.
+    :param direction: Direction of the ray, it does not have to be normalized.
+    :param minimums: Minimum corners of the boxes (N x 3).
+    :param maximums: Maximum corners of the boxes (N x 3).
+    :return: Distances along the ray to the boxes (N), 0 for boxes around the origin and inf for missed boxes.
+    """
+    origin = np.asarray(origin, dtype=np.float64)
+    direction = np.asarray(direction, dtype=np.float64)
+    # a tiny direction instead of 0 keeps a parallel ray inside or outside of its slab
+    direction = np.where(np.abs(direction) < 1e-300, 1e-300, direction)
+    first = (np.asarray(minimums) - origin) / direction
+    second = (np.asarray(maximums) - origin) / direction
+    enter = np.minimum(first, second).max(axis=1)
+    leave = np.maximum(first, second).min(axis=1)
+    enter = np.maximum(enter, 0)
+    return np.where(enter <= leave, enter, np.inf)
+
+
+class BoundingVolumeHierarchy:
+    """
+    BoundingVolumeHierarchy is a binary tree of axis-aligned boxes over the figures of a scene.
+
+    Figures are split at the median of the longest axis of their centers until a
+    node has BVH_LEAF_SIZE figures. A query skips the figures of every node whose
+    box is outside the frustum. When the figures move the boxes are refitted,
+    the tree is built again only when the figures change.
+
+    Methods:
+        __init__(minimums, maximums, leaf_size=BVH_LEAF_SIZE):
+            Builds the hierarchy over the boxes of the figures.
+
+        refit(minimums, maximums):
+            Updates the boxes of the nodes for moved figures.
+
+        query(planes):
+            Returns the indices of the figures whose boxes may be inside the frustum.
+
+        query_ray(origin, direction):
+            Returns the indices of the figures whose boxes the ray hits and the distances to the boxes, the nearest first.
+    """
+
+    def __init__(self, minimums, maximums, leaf_size=BVH_LEAF_SIZE):
+        minimums = np.asarray(minimums, dtype=np.float64).reshape(-1, 3)
+        maximums = np.asarray(maximums, dtype=np.float64).reshape(-1, 3)
+        self.leaf_size = max(int(leaf_size), 1)
+        self.order = np.arange(len(minimums))
+        # node arrays: the children of a node (-1 for leaves) and its range of self.order
+        self.children = []
+        self.ranges = []
+        self.depths = []
+        centers = (minimums + maximums) / 2
+        if len(minimums):
+            self.__build(centers, 0, len(minimums), 0)
+        self.children = np.array(self.children, dtype=np.int64).reshape(-1, 2)
+        self.ranges = np.array(self.ranges, dtype=np.int64).reshape(-1, 2)
+        depths = np.array(self.depths, dtype=np.int64)
+        inner = self.children[:, 0] >= 0
+        # the inner nodes of every depth, from the root
+        self.levels = [
+            np.flatnonzero(inner & (depths == depth))
+            for depth in range(int(depths.max()) + 1 if len(depths) else 0)
+        ]
+        self.minimums = np.zeros((len(self.ranges), 3))
+        self.maximums = np.zeros((len(self.ranges), 3))
+        self.refit(minimums, maximums)
+
+    def refit(self, minimums, maximums):
+        minimums = np.asarray(minimums, dtype=np.float64).reshape(-1, 3)
+        maximums = np.asarray(maximums, dtype=np.float64).reshape(-1, 3)
+        self.figure_minimums = minimums
+        self.figure_maximums = maximums
+        leaves = np.flatnonzero(self.children[:, 0] < 0)
+        if len(leaves):
+            # the figures of a leaf are a contiguous range of self.order
+            starts = self.ranges[leaves, 0]
+            self.minimums[leaves] = np.minimum.reduceat(minimums[self.order], starts)
+            self.maximums[leaves] = np.maximum.reduceat(maximums[self.order], starts)
+        # parents are fitted after their children, one depth at a time
+        for nodes in reversed(self.levels):
+            left, right = self.children[nodes, 0], self.children[nodes, 1]
+            self.minimums[nodes] = np.minimum(self.minimums[left], self.minimums[right])
+            self.maximums[nodes] = np.maximum(self.maximums[left], self.maximums[right])
+
+    def query(self, planes):
+        if not len(self.ranges):
+            return np.zeros(0, dtype=np.int64)
+        leaves = []
+        nodes = np.zeros(1, dtype=np.int64)
+        # the nodes of one depth are tested together
+        while len(nodes):
+            nodes = nodes[boxes_in_frustum(planes, self.minimums[nodes], self.maximums[nodes])]
+            is_leaf = self.children[nodes, 0] < 0
+            leaves.append(nodes[is_leaf])
+            nodes = self.children[nodes[~is_leaf]].ravel()
+        leaves = np.concatenate(leaves)
+        if not len(leaves):
+            return np.zeros(0, dtype=np.int64)
+        figures = np.concatenate(
+            [self.order[start:end] for start, end in self.ranges[leaves]]
+        )
+        # the figures of the visible leaves are tested one by one
+        mask = boxes_in_frustum(
+            planes, self.figure_minimums[figures], self.figure_maximums[figures]
+        )
+        return np.sort(figures[mask])
+
+    def query_ray(self, origin, direction):
+        if not len(self.ranges):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        leaves = []
+        nodes = np.zeros(1, dtype=np.int64)
+        while len(nodes):
+            hits = ray_boxes(origin, direction, self.minimums[nodes], self.maximums[nodes])
+            nodes = nodes[np.isfinite(hits)]
+            is_leaf = self.children[nodes, 0] < 0
+            leaves.append(nodes[is_leaf])
+            nodes = self.children[nodes[~is_leaf]].ravel()
+        leaves = np.concatenate(leaves)
+        if not len(leaves):
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        figures = np.concatenate(
+            [self.order[start:end] for start, end in self.ranges[leaves]]
+        )
+        distances = ray_boxes(
+            origin, direction, self.figure_minimums[figures], self.figure_maximums[figures]
+        )
+        hit = np.isfinite(distances)
+        order = np.argsort(distances[hit], kind="stable")
+        return figures[hit][order], distances[hit][order]
+
+    def __build(self, centers, start, end, depth):
+        node = len(self.ranges)
+        self.ranges.append((start, end))
+        self.children.append((-1, -1))
+        self.depths.append(depth)
+        if end - start <= self.leaf_size:
+            return node
+        figures = self.order[start:end]
+        spread = centers[figures].max(axis=0) - centers[figures].min(axis=0)
+        axis = int(np.argmax(spread))
+        self.order[start:end] = figures[np.argsort(centers[figures, axis], kind="stable")]
+        middle = (start + end) // 2
+        left = self.__build(centers, start, middle, depth + 1)
+        right = self.__build(centers, middle, end, depth + 1)
+        self.children[node] = (left, right)
+        return node
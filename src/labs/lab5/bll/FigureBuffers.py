@@ -0,0 +1,184 @@
+from ctypes import c_void_p
+
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.error import Error as GLError
+
+# OpenGL primitive of every array set
+PRIMITIVES = {
+    "points": GL_POINTS,
+    "edges": GL_LINES,
+    "faces": GL_TRIANGLES,
+    "borders": GL_LINES,
+}
+
+
+def fan_triangles(face_offsets):
+    """
+    Splits every face into a fan of triangles around its first corner.
+
+    :param face_offsets: Offsets of the faces in the corner array (F + 1).
+    :return: Corner indices of the triangles (T x 3), faces with less than 3 corners are skipped.
+    """
+    face_offsets = np.asarray(face_offsets, dtype=np.int64)
+    counts = np.maximum(np.diff(face_offsets) - 2, 0)
+    total = int(counts.sum())
+    starts = np.repeat(face_offsets[:-1], counts)
+    # the number of the triangle inside its face, from 1
+    steps = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    return np.stack([starts, starts + steps, starts + steps + 1], axis=1)
+
+
+def vbo_available():
+    """
+    :return: Whether the OpenGL implementation has buffer objects.
+    """
+    return bool(glGenBuffers)
+
+
+class FigureBuffers:
+    """
+    FigureBuffers keeps the vertex arrays of a figure and draws them with a few OpenGL calls.
+
+    The arrays are contiguous NumPy arrays drawn with glDrawArrays or
+    glDrawElements. When the figure is drawn with its own color the vertex
+    positions are shared by all primitives, otherwise the corners of the edges
+    and faces get their own copies so every element keeps its color. The arrays
+    are built again only after the figure data changes (FigureData.version,
+    the figure color or the face alpha), transforms of the figure change only
+    its model matrix and do not touch the buffers. When buffer objects are
+    available the arrays are uploaded to them once per change.
+
+    Methods:
+        __init__(data, use_vbo=None):
+            Initializes the buffers of the figure data, use_vbo=None uses buffer objects when available.
+
+        arrays(kind, alpha=1.0):
+            Returns the arrays of points, edges, faces or face borders.
+
+        draw(kind, alpha=1.0, color=None):
+            Draws the arrays, color replaces the colors of the elements.
+
+        release():
+            Deletes the buffer objects.
+    """
+
+    def __init__(self, data, use_vbo=None):
+        self.data = data
+        self.use_vbo = use_vbo
+        self._arrays = {}
+        self._buffers = {}
+        self.stats = {"builds": 0, "uploads": 0}
+
+    def arrays(self, kind, alpha=1.0):
+        if kind not in PRIMITIVES:
+            raise ValueError(f"Unknown array kind '{kind}'")
+        data = self.data
+        key = (data.version, data.figure_color, tuple(data.color), alpha)
+        cached = self._arrays.get(kind)
+        if cached is None or cached["key"] != key:
+            cached = self.__build(kind, alpha)
+            cached["key"] = key
+            cached["build"] = self.stats["builds"]
+            self.stats["builds"] += 1
+            self._arrays[kind] = cached
+        return cached
+
+    def draw(self, kind, alpha=1.0, color=None):
+        arrays = self.arrays(kind, alpha)
+        count = len(arrays["indices"] if arrays["indices"] is not None else arrays["positions"])
+        if not count:
+            return
+        use_vbo = self.__use_vbo()
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glVertexPointer(3, GL_FLOAT, 0, self.__source(kind, "positions", arrays, use_vbo))
+        colors = arrays["colors"] if color is None else None
+        if colors is None:
+            glColor4fv((*(color if color is not None else arrays["color"])[:3], alpha))
+        else:
+            glEnableClientState(GL_COLOR_ARRAY)
+            glColorPointer(
+                colors.shape[1], GL_FLOAT, 0, self.__source(kind, "colors", arrays, use_vbo)
+            )
+        if arrays["indices"] is None:
+            glDrawArrays(PRIMITIVES[kind], 0, count)
+        else:
+            indices = self.__source(kind, "indices", arrays, use_vbo)
+            glDrawElements(PRIMITIVES[kind], count, GL_UNSIGNED_INT, indices)
+        if colors is not None:
+            glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+        if use_vbo:
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def release(self):
+        buffers = [buffer for buffer, _ in self._buffers.values()]
+        if buffers:
+            glDeleteBuffers(len(buffers), buffers)
+        self._buffers = {}
+
+    def __build(self, kind, alpha):
+        data = self.data
+        shared = data.figure_color or kind == "borders"
+        arrays = {
+            "positions": data.positions,
+            "colors": None,
+            "indices": None,
+            "color": tuple(data.color),
+        }
+        if kind == "points":
+            if not shared:
+                arrays["colors"] = np.ascontiguousarray(data.vertex_colors, dtype=np.float32)
+        elif kind == "borders":
+            arrays["indices"] = data.face_borders().astype(np.uint32).ravel()
+        elif kind == "edges":
+            if shared:
+                arrays["indices"] = data.edge_indices.astype(np.uint32).ravel()
+            else:
+                arrays["positions"] = data.positions[data.edge_indices].reshape(-1, 3)
+                arrays["colors"] = np.repeat(
+                    data.edge_colors.astype(np.float32), 2, axis=0
+                )
+        elif kind == "faces":
+            triangles = fan_triangles(data.face_offsets)
+            if shared:
+                arrays["indices"] = data.face_indices[triangles].astype(np.uint32).ravel()
+            else:
+                # every corner gets the color of its face
+                arrays["positions"] = data.positions[data.face_indices]
+                colors = np.empty((len(data.face_indices), 4), dtype=np.float32)
+                colors[:, :3] = np.repeat(
+                    data.face_colors, np.diff(data.face_offsets), axis=0
+                )
+                colors[:, 3] = alpha
+                arrays["colors"] = colors
+                arrays["indices"] = triangles.astype(np.uint32).ravel()
+        arrays["positions"] = np.ascontiguousarray(arrays["positions"], dtype=np.float32)
+        return arrays
+
+    def __use_vbo(self):
+        if self.use_vbo is None:
+            self.use_vbo = vbo_available()
+        return self.use_vbo
+
+    def __source(self, kind, name, arrays, use_vbo):
+        array = arrays[name]
+        if not use_vbo:
+            return array
+        target = GL_ELEMENT_ARRAY_BUFFER if name == "indices" else GL_ARRAY_BUFFER
+        buffer, build = self._buffers.get((kind, name), (None, None))
+        try:
+            if buffer is None:
+                buffer = glGenBuffers(1)
+            glBindBuffer(target, buffer)
+            if build != arrays["build"]:
+                glBufferData(target, array.nbytes, array, GL_STATIC_DRAW)
+                self.stats["uploads"] += 1
+        except GLError:
+            # buffer objects failed, the arrays are drawn from client memory from now on
+            self.use_vbo = False
+            glBindBuffer(target, 0)
+            return array
+        self._buffers[(kind, name)] = (buffer, arrays["build"])
+        return c_void_p(0)
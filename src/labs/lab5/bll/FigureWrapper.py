@@ -4,7 +4,12 @@ import numpy as np
 from OpenGL.GL import *
 from OpenGL.GLU import *
 
+from labs.lab5.bll.Culling import ray_boxes
+from labs.lab5.bll.FigureBuffers import FigureBuffers
+from labs.lab5.bll.LevelOfDetail import LevelOfDetail
+from labs.lab5.bll.Picking import RayMesh
 from labs.lab5.dal.Figure import colors, figures
+from labs.lab5.dal.MeshGenerator import generate
 
 
 class FigureWrapper:
@@ -25,6 +30,18 @@ class FigureWrapper:
     set_example(name)
         Sets the figure data to a predefined example.
 
+    create_procedural(cls, name, resolution=None, **parameters)
+        Class method to create an instance with a generated figure, with levels of detail if resolution is None.
+
+    set_level_of_detail(lod)
+        Sets the levels of detail of the figure and shows the coarsest level.
+
+    update_level_of_detail(rows)
+        Shows the level of detail for the number of ASCII rows the figure covers.
+
+    bounding_radius()
+        Returns the radius of the figure in the world around its center.
+
     set_color(color)
         Sets the color of the figure and its vertices.
 
@@ -37,6 +54,11 @@ class FigureWrapper:
     translate(x, y, z)
         Translates the figure by specified amounts along the x, y, and z axes.
 
+    Rotation, scaling and translation only multiply the 4x4 model matrix of the figure,
+    OpenGL applies it when the figure is drawn, the software rasterizer uses the cached
+    world positions of the figure and picking moves the ray to object space. OpenGL draws the figure from vertex arrays
+    (FigureBuffers), they are built again only after the figure data changes.
+
     set_draw_mode(mode)
         Sets the drawing mode of the figure (points, edges, or faces).
 
@@ -61,21 +83,30 @@ class FigureWrapper:
     draw_faces_custom(alpha, highlight_color, highlight_line_width)
         Draws the faces of the figure with custom transparency and highlight options.
 
+    rasterize(rasterizer, point_size=5, line_width=2, alpha=0.5, highlight_color=(1, 1, 1), highlight_line_width=2)
+        Draws the figure with a software rasterizer, the same way as draw_custom draws it with OpenGL.
+
     scale(scale_x, scale_y, scale_z)
         Scales the figure by specified factors along the x, y, and z axes.
 
+    fit(size=2.0)
+        Scales and moves the figure so it fits a cube of the given size around the origin.
+
     draw()
         Dispatches the draw call to the appropriate drawing method based on the current draw mode.
 
-    project_vertices_to_screen(modelview, projection, viewport)
-        Projects the 3D vertices of the figure to 2D screen coordinates.
+    intersect_ray(origin, direction)
+        Returns the distance along a ray in the world to the nearest face of the figure, inf if the ray misses it.
 
-    contains_point(x, y, modelview, projection, viewport)
-        Checks if a screen point is within the bounds of the projected figure.
+    release_buffers()
+        Deletes the OpenGL buffers of the figure, they are built again when the figure is drawn.
     """
 
     def __init__(self, data=None):
         self.data = data
+        self.lod = None
+        self._buffers = None
+        self._ray_mesh = None
 
     def set_data(self, data):
         if data:
@@ -90,7 +121,49 @@ class FigureWrapper:
     def set_example(self, name):
         if name not in figures.keys():
             raise ValueError("Wrong example name")
-        self.data = figures[name]
+        # every figure gets its own arrays, so figures of one example move separately
+        self.data = figures[name].copy()
+        self.lod = None
+
+    @classmethod
+    def create_procedural(cls, name, resolution=None, **parameters):
+        instance = cls()
+        if resolution is None:
+            instance.set_level_of_detail(LevelOfDetail(name, **parameters))
+        else:
+            instance.data = generate(name, resolution, **parameters)
+        return instance
+
+    def set_level_of_detail(self, lod):
+        self.lod = lod
+        self.__show_level(lod.level(0))
+
+    def update_level_of_detail(self, rows):
+        if self.lod is None:
+            return
+        self.__show_level(self.lod.level(self.lod.select(rows)))
+
+    def bounding_radius(self):
+        scale = float(np.linalg.norm(self.data.model[:3, :3], axis=0).max())
+        if self.lod is not None:
+            return self.lod.radius() * scale
+        return self.data.bounding_sphere()[1]
+
+    def __show_level(self, level):
+        current = self.data
+        if level is current:
+            return
+        if current is not None:
+            # the level takes the place, the look and the state of the shown level
+            level.model = current.model
+            level.color = current.color
+            level.vertex_colors[:] = current.color
+            level.draw_mode = current.draw_mode
+            level.selected = current.selected
+            level.figure_color = current.figure_color
+            level.angle = list(current.angle)
+            level.invalidate()
+        self.data = level
 
     def set_color(self, color):
         if color in colors.keys():
@@ -98,8 +171,8 @@ class FigureWrapper:
         if len(color) != 3:
             raise ValueError("Color must be a tuple of 3 elements (R, G, B).")
         self.data.color = color
-        for vertex in self.data.vertices:
-            vertex.color = color
+        self.data.vertex_colors[:] = color
+        self.data.invalidate()
 
     def apply_color_transformation(self, transformation):
         if not callable(transformation):
@@ -112,12 +185,10 @@ class FigureWrapper:
                 "Transformed color must be a tuple of 3 elements (R, G, B)."
             )
         self.data.color = new_color
-        for vertex in self.data.vertices:
-            vertex.color = new_color
+        self.data.vertex_colors[:] = new_color
+        self.data.invalidate()
 
     def rotate(self, dx, dy, dz):
-        center = np.mean([v.position for v in self.data.vertices], axis=0)
-        self.translate(-center[0], -center[1], -center[2])
         angle_rad_x = math.radians(dx)
         angle_rad_y = math.radians(dy)
         angle_rad_z = math.radians(dz)
@@ -150,17 +221,15 @@ class FigureWrapper:
             np.dot(rotation_matrix_z, rotation_matrix_y), rotation_matrix_x
         )
 
-        for vertex in self.data.vertices:
-            vertex.position = np.dot(vertex.position, rotation_matrix.T)
-        self.translate(center[0], center[1], center[2])
+        self.__transform_around_center(rotation_matrix)
         self.data.angle = [
             angle + delta for angle, delta in zip(self.data.angle, [dx, dy, dz])
         ]
 
     def translate(self, x, y, z):
-        translation_matrix = np.array([x, y, z], dtype=np.float32)
-        for vertex in self.data.vertices:
-            vertex.position += translation_matrix
+        transform = np.identity(4)
+        transform[:3, 3] = (x, y, z)
+        self.data.model = transform @ self.data.model
 
     def set_draw_mode(self, mode):
         if mode in ["points", "edges", "faces"]:
@@ -168,44 +237,18 @@ class FigureWrapper:
 
     def draw_points(self):
         glPointSize(5 if self.data.selected else 1)
-        glBegin(GL_POINTS)
-        for vertex in self.data.vertices:
-            glColor3fv(self.data.color if self.data.figure_color else vertex.color)
-            glVertex3fv(vertex.position)
-        glEnd()
+        self.__draw_points()
 
     def draw_edges(self):
         glLineWidth(2 if self.data.selected else 1)
-        glBegin(GL_LINES)
-        for edge in self.data.edges:
-            glColor3fv(self.data.color if self.data.figure_color else edge.color)
-            for vertex in edge.vertices:
-                glVertex3fv(vertex.position)
-        glEnd()
+        self.__draw_edges()
 
     def draw_faces(self):
-        glBegin(GL_QUADS)
-        for face in self.data.faces:
-            face_color = list(
-                self.data.color if self.data.figure_color else face.color
-            ) + [0.2]
-            glColor4fv(face_color)
-            for vertex in face.vertices:
-                glVertex3fv(vertex.position)
-        glEnd()
+        self.__draw_faces(0.2)
 
         if self.data.selected:
             border_color = (1, 1, 1) if sum(self.data.color) <= 1.5 else (0, 0, 0)
-            glColor3fv(border_color)
-            glLineWidth(2)
-            glBegin(GL_LINES)
-            for face in self.data.faces:
-                for i in range(len(face.vertices)):
-                    start_vertex = face.vertices[i].position
-                    end_vertex = face.vertices[(i + 1) % len(face.vertices)].position
-                    glVertex3fv(start_vertex)
-                    glVertex3fv(end_vertex)
-            glEnd()
+            self.__draw_face_borders(border_color, 2)
 
     def draw_custom(
         self,
@@ -216,6 +259,7 @@ class FigureWrapper:
         highlight_line_width=2,
     ):
         glPushMatrix()
+        self.__apply_model()
         if self.data.draw_mode == "points":
             self.draw_points_custom(point_size)
         elif self.data.draw_mode == "edges":
@@ -226,61 +270,68 @@ class FigureWrapper:
 
     def draw_points_custom(self, point_size):
         glPointSize(point_size if self.data.selected else 1)
-        glBegin(GL_POINTS)
-        for vertex in self.data.vertices:
-            glColor3fv(self.data.color if self.data.figure_color else vertex.color)
-            glVertex3fv(vertex.position)
-        glEnd()
+        self.__draw_points()
 
     def draw_edges_custom(self, line_width, highlight_line_width):
         glLineWidth(highlight_line_width if self.data.selected else line_width)
-        glBegin(GL_LINES)
-        for edge in self.data.edges:
-            glColor3fv(self.data.color if self.data.figure_color else edge.color)
-            for vertex in edge.vertices:
-                glVertex3fv(vertex.position)
-        glEnd()
+        self.__draw_edges()
 
     def draw_faces_custom(self, alpha, highlight_color, highlight_line_width):
-        glBegin(GL_QUADS)
-        for face in self.data.faces:
-            if self.data.figure_color:
-                face_color = (*self.data.color, alpha)
-            else:
-                face.color = (*face.color, alpha)
-            # face_color = list((self.data.color if self.data.figure_color else face.color, alpha))
-            glColor4fv(face_color)
-            for vertex in face.vertices:
-                glVertex3fv(vertex.position)
-        glEnd()
+        self.__draw_faces(alpha)
 
         if self.data.selected:
-            glColor3fv(highlight_color)
-            glLineWidth(highlight_line_width)
-            glBegin(GL_LINES)
-            for face in self.data.faces:
-                for i in range(len(face.vertices)):
-                    start_vertex = face.vertices[i].position
-                    end_vertex = face.vertices[(i + 1) % len(face.vertices)].position
-                    glVertex3fv(start_vertex)
-                    glVertex3fv(end_vertex)
-            glEnd()
+            self.__draw_face_borders(highlight_color, highlight_line_width)
 
-    def scale(self, scale_x, scale_y, scale_z):
-        center = np.mean([v.position for v in self.data.vertices], axis=0)
-        self.translate(-center[0], -center[1], -center[2])
+    def rasterize(
+        self,
+        rasterizer,
+        point_size=5,
+        line_width=2,
+        alpha=0.5,
+        highlight_color=(1, 1, 1),
+        highlight_line_width=2,
+    ):
+        # blending is disabled in the OpenGL backend, so alpha does not change the result
+        positions = self.data.world_positions
+        if self.data.draw_mode == "points":
+            size = point_size if self.data.selected else 1
+            rasterizer.draw_points(positions, self.__vertex_colors(), size)
+        elif self.data.draw_mode == "edges":
+            segments = positions[self.data.edge_indices]
+            width = highlight_line_width if self.data.selected else line_width
+            rasterizer.draw_lines(
+                segments[:, 0], segments[:, 1], self.__edge_colors(), width
+            )
+        elif self.data.draw_mode == "faces":
+            polygons = np.split(
+                positions[self.data.face_indices], self.data.face_offsets[1:-1]
+            )
+            rasterizer.draw_polygons(polygons, self.__face_colors())
+            if self.data.selected:
+                borders = positions[self.data.face_borders()]
+                rasterizer.draw_lines(
+                    borders[:, 0], borders[:, 1], highlight_color, highlight_line_width
+                )
 
+    def scale(self, scale_x, scale_y, scale_z):
         scale_matrix = np.array(
             [[scale_x, 0, 0], [0, scale_y, 0], [0, 0, scale_z]], dtype=np.float32
         )
-
-        for vertex in self.data.vertices:
-            vertex.position = np.dot(vertex.position, scale_matrix.T)
-
-        self.translate(center[0], center[1], center[2])
+        self.__transform_around_center(scale_matrix)
+
+    def fit(self, size=2.0):
+        positions = self.data.world_positions
+        if not len(positions):
+            return
+        extent = float((positions.max(axis=0) - positions.min(axis=0)).max())
+        if extent > 0:
+            factor = size / extent
+            self.scale(factor, factor, factor)
+        self.translate(*-self.data.center())
 
     def draw(self):
         glPushMatrix()
+        self.__apply_model()
         if self.data.draw_mode == "points":
             self.draw_points()
         elif self.data.draw_mode == "edges":
@@ -289,35 +340,72 @@ class FigureWrapper:
             self.draw_faces()
         glPopMatrix()
 
-    def project_vertices_to_screen(self, modelview, projection, viewport):
-        screen_coords = []
-        for vertex in self.data.vertices:
-            try:
-                position = vertex.position.tolist()
-                projected = gluProject(
-                    position[0],
-                    position[1],
-                    position[2],
-                    modelview,
-                    projection,
-                    viewport,
-                )
-                screen_coords.append(projected[:2])
-            except ValueError as e:
-                print(f"Projection failed for vertex: {vertex} with error {e}")
-        return screen_coords
-
-    def contains_point(self, x, y, modelview, projection, viewport):
-        screen_coords = self.project_vertices_to_screen(modelview, projection, viewport)
-        if not screen_coords:
-            return False
-        min_x = min(coord[0] for coord in screen_coords)
-        max_x = max(coord[0] for coord in screen_coords)
-        min_y = min(coord[1] for coord in screen_coords)
-        max_y = max(coord[1] for coord in screen_coords)
-        contains = min_x <= x <= max_x and min_y <= y <= max_y
-        # if contains:
-        #     self.data.selected =True
-        # else:
-        #     self.data.selected = False
-        return contains
+    def intersect_ray(self, origin, direction):
+        # the ray is moved to object space, the triangles stay where they are
+        inverse = np.linalg.inv(self.data.model)
+        local_origin = inverse[:3, :3] @ np.asarray(origin) + inverse[:3, 3]
+        local_direction = inverse[:3, :3] @ np.asarray(direction)
+        mesh = self.__ray_mesh()
+        if not len(mesh):
+            # figures without faces are picked by their bounding box
+            minimum, maximum = self.data.bounds()
+            return float(ray_boxes(origin, direction, [minimum], [maximum])[0])
+        return mesh.intersect(local_origin, local_direction)
+
+    def __transform_around_center(self, matrix):
+        # only the model matrix changes, the vertices are moved when they are used
+        center = self.data.center()
+        transform = np.identity(4)
+        transform[:3, :3] = matrix
+        transform[:3, 3] = center - transform[:3, :3] @ center
+        self.data.model = transform @ self.data.model
+
+    def __apply_model(self):
+        # OpenGL expects the matrix in column-major order
+        glMultMatrixd(np.ascontiguousarray(self.data.model.T))
+
+    def __element_colors(self, element_colors):
+        if self.data.figure_color:
+            return np.broadcast_to(
+                np.asarray(self.data.color, dtype=np.float32)[:3], element_colors.shape
+            )
+        return element_colors
+
+    def __vertex_colors(self):
+        return self.__element_colors(self.data.vertex_colors)
+
+    def __edge_colors(self):
+        return self.__element_colors(self.data.edge_colors)
+
+    def __face_colors(self):
+        return self.__element_colors(self.data.face_colors)
+
+    def release_buffers(self):
+        if self._buffers is not None:
+            self._buffers.release()
+            self._buffers = None
+
+    def __buffers(self):
+        if self._buffers is None or self._buffers.data is not self.data:
+            if self._buffers is not None:
+                self._buffers.release()
+            self._buffers = FigureBuffers(self.data)
+        return self._buffers
+
+    def __ray_mesh(self):
+        if self._ray_mesh is None or not self._ray_mesh.is_current(self.data):
+            self._ray_mesh = RayMesh(self.data)
+        return self._ray_mesh
+
+    def __draw_points(self):
+        self.__buffers().draw("points")
+
+    def __draw_edges(self):
+        self.__buffers().draw("edges")
+
+    def __draw_faces(self, alpha):
+        self.__buffers().draw("faces", alpha)
+
+    def __draw_face_borders(self, color, line_width):
+        glLineWidth(line_width)
+        self.__buffers().draw("borders", color=color)
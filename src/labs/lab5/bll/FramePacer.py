@@ -0,0 +1,78 @@
+from math import ceil
+from time import perf_counter
+
+
+class FramePacer:
+    """
+    FramePacer limits how often a scene is redrawn.
+
+    Input handlers request a redisplay instead of drawing at once, requests
+    that come before the next frame are coalesced into one frame. A frame may
+    start one frame budget (1 / target fps) after the previous one started,
+    a frame that takes longer than the budget drops the frames it overlaps.
+    A target of 0 fps disables pacing, every request may be drawn at once.
+
+    Methods:
+        __init__(target_fps=30, clock=perf_counter):
+            Initializes the pacer with the target frame rate.
+
+        set_target_fps(target_fps):
+            Changes the target frame rate.
+
+        request():
+            Requests a redisplay, returns whether the frame may be drawn now.
+
+        should_render():
+            Returns whether a redisplay is requested and the frame budget has passed.
+
+        delay():
+            Returns the seconds to wait before checking the requests again.
+
+        frame_started() / frame_finished():
+            Marks the start / the end of a drawn frame.
+    """
+
+    def __init__(self, target_fps=30, clock=perf_counter):
+        self.clock = clock
+        self.target_fps = 0
+        self.budget = 0.0
+        self.set_target_fps(target_fps)
+        self.pending = False
+        self.next_frame = 0.0
+        self.frame_start = None
+        self.stats = {"requests": 0, "coalesced": 0, "frames": 0, "dropped": 0}
+
+    def set_target_fps(self, target_fps):
+        if target_fps is not None and target_fps < 0:
+            raise ValueError("Target fps must not be negative")
+        self.target_fps = target_fps or 0
+        self.budget = 1 / target_fps if target_fps else 0.0
+
+    def request(self):
+        self.stats["requests"] += 1
+        if self.pending:
+            self.stats["coalesced"] += 1
+        self.pending = True
+        return self.should_render()
+
+    def should_render(self):
+        return self.pending and self.clock() >= self.next_frame
+
+    def delay(self):
+        if not self.pending:
+            return self.budget
+        return max(0.0, self.next_frame - self.clock())
+
+    def frame_started(self):
+        self.frame_start = self.clock()
+        self.pending = False
+        self.next_frame = self.frame_start + self.budget
+        self.stats["frames"] += 1
+
+    def frame_finished(self):
+        if self.frame_start is None or not self.budget:
+            return 0
+        duration = self.clock() - self.frame_start
+        dropped = max(0, ceil(duration / self.budget) - 1)
+        self.stats["dropped"] += dropped
+        return dropped
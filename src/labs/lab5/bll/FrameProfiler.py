@@ -0,0 +1,95 @@
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+
+# stages of a lab5 frame in the order they run
+FRAME_STAGES = ["draw", "read", "resize", "ascii", "swap", "write"]
+
+
+class FrameProfiler:
+    """
+    FrameProfiler measures the time of every stage of the rendered frames.
+
+    The timings of the last frames (a sliding window) are kept, so averages
+    and the frame rate follow the current load of the scene.
+
+    Methods:
+        __init__(window=60, clock=perf_counter):
+            Initializes the profiler with the number of frames to average.
+
+        begin_frame() / end_frame():
+            Starts a frame / finishes it and returns its timings in seconds.
+
+        stage(name):
+            Context manager that adds its run time to the stage of the current frame.
+
+        averages():
+            Returns the average time of every stage and of the whole frame.
+
+        fps():
+            Returns the frame rate of the window.
+
+        summary(extra=None):
+            Returns a one-line report of the averages in milliseconds.
+    """
+
+    def __init__(self, window=60, clock=perf_counter):
+        self.clock = clock
+        self.frames = deque(maxlen=window)
+        self.frame_starts = deque(maxlen=window)
+        self.count = 0
+        self._current = None
+        self._frame_start = None
+
+    def begin_frame(self):
+        self._frame_start = self.clock()
+        self._current = {}
+        self.frame_starts.append(self._frame_start)
+
+    def end_frame(self):
+        if self._current is None:
+            return {}
+        timings = self._current
+        timings["frame"] = self.clock() - self._frame_start
+        self.frames.append(timings)
+        self.count += 1
+        self._current = None
+        return timings
+
+    @contextmanager
+    def stage(self, name):
+        start = self.clock()
+        try:
+            yield
+        finally:
+            if self._current is not None:
+                elapsed = self.clock() - start
+                self._current[name] = self._current.get(name, 0.0) + elapsed
+
+    def averages(self):
+        totals = {}
+        for timings in self.frames:
+            for name, elapsed in timings.items():
+                totals[name] = totals.get(name, 0.0) + elapsed
+        return {name: total / len(self.frames) for name, total in totals.items()}
+
+    def fps(self):
+        if len(self.frame_starts) < 2:
+            return 0.0
+        elapsed = self.frame_starts[-1] - self.frame_starts[0]
+        return (len(self.frame_starts) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def summary(self, extra=None):
+        averages = self.averages()
+        stages = [name for name in FRAME_STAGES if name in averages]
+        stages += [
+            name for name in averages if name not in FRAME_STAGES and name != "frame"
+        ]
+        parts = [
+            f"fps {self.fps():.1f}",
+            f"frame {averages.get('frame', 0.0) * 1000:.1f} ms",
+            " ".join(f"{name} {averages[name] * 1000:.1f}" for name in stages),
+        ]
+        if extra:
+            parts.append(" ".join(f"{name} {value}" for name, value in extra.items()))
+        return " | ".join(part for part in parts if part)
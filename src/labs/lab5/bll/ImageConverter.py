@@ -0,0 +1,145 @@
+import re
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageSequence
+
+from labs.lab5.bll.AsciiMapper import AsciiMapper
+
+IMAGE_EXTENSIONS = {
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".bmp",
+    ".gif",
+    ".tif",
+    ".tiff",
+    ".webp",
+    ".ppm",
+}
+
+
+def natural_key(path):
+    """
+    :param path: Path of the file.
+    :return: Sort key that puts frame_2 before frame_10.
+    """
+    parts = re.split(r"(\d+)", Path(path).name)
+    return [int(part) if part.isdigit() else part.lower() for part in parts]
+
+
+def load_frames(path):
+    """
+    Loads all frames of an image file, a still image has one frame.
+
+    :param path: Path of the image file.
+    :return: List of RGB arrays (height x width x 3).
+    """
+    with Image.open(path) as image:
+        return [
+            np.asarray(frame.convert("RGB")) for frame in ImageSequence.Iterator(image)
+        ]
+
+
+def convert_file(path, ascii_chars, ascii_height=None, is_colored=True):
+    """
+    Converts every frame of an image file inside a worker process.
+
+    :param path: Path of the image file.
+    :param ascii_chars: Characters from the brightest to the darkest.
+    :param ascii_height: Height of the art in rows.
+    :param is_colored: Whether the art is colored with the pixel colors.
+    :return: (path, list of arts, error) triple, the error is None when the file is converted.
+    """
+    mapper = AsciiMapper(ascii_chars)
+    try:
+        arts = [
+            mapper.image_to_ascii(frame, ascii_height, is_colored)
+            for frame in load_frames(path)
+        ]
+    except (OSError, ValueError) as e:
+        # one broken file must not end the whole batch
+        return path, [], str(e)
+    return path, arts, None
+
+
+class ImageConverter:
+    """
+    ImageConverter converts image files, folders and frame sequences into ASCII art.
+
+    A folder is read as a sequence of frames in natural order (frame_2 before
+    frame_10), animated images are split into their frames. Batches of files
+    are converted in a process pool.
+
+    Methods:
+        __init__(ascii_chars, ascii_height=None, is_colored=True, workers=None):
+            Initializes the converter with the mapping settings.
+
+        find_images(path):
+            Returns the image files of the path, a file or a folder.
+
+        convert(path):
+            Yields (path, frame index, art) for every frame of the path.
+
+        convert_batch(paths, save_folder=None):
+            Converts the files in a process pool, yields (path, arts, error) when a file is done.
+    """
+
+    def __init__(self, ascii_chars, ascii_height=None, is_colored=True, workers=None):
+        self.ascii_chars = list(ascii_chars)
+        self.ascii_height = ascii_height
+        self.is_colored = is_colored
+        self.workers = workers
+        self.mapper = AsciiMapper(self.ascii_chars)
+
+    @staticmethod
+    def find_images(path):
+        path = Path(path)
+        if path.is_file():
+            return [path]
+        if not path.is_dir():
+            raise ValueError(f"'{path}' is not a file or a folder")
+        images = [
+            file
+            for file in path.iterdir()
+            if file.is_file() and file.suffix.lower() in IMAGE_EXTENSIONS
+        ]
+        return sorted(images, key=natural_key)
+
+    def convert(self, path):
+        for image_path in self.find_images(path):
+            for index, frame in enumerate(load_frames(image_path)):
+                art = self.mapper.image_to_ascii(frame, self.ascii_height, self.is_colored)
+                yield image_path, index, art
+
+    def convert_batch(self, paths, save_folder=None):
+        files = []
+        for path in paths:
+            files.extend(self.find_images(path))
+        if save_folder:
+            Path(save_folder).mkdir(parents=True, exist_ok=True)
+        workers = self.workers or cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(
+                convert_file,
+                files,
+                [self.ascii_chars] * len(files),
+                [self.ascii_height] * len(files),
+                [self.is_colored] * len(files),
+                chunksize=max(1, len(files) // (4 * workers)),
+            )
+            for path, arts, error in results:
+                if save_folder and not error:
+                    self.__save(Path(save_folder), path, arts)
+                yield path, arts, error
+
+    @staticmethod
+    def __save(save_folder, path, arts):
+        if len(arts) == 1:
+            (save_folder / f"{path.stem}.txt").write_text(arts[0], encoding="utf-8")
+            return
+        for index, art in enumerate(arts):
+            frame_path = save_folder / f"{path.stem}_{index:04d}.txt"
+            frame_path.write_text(art, encoding="utf-8")
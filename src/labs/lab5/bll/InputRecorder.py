@@ -0,0 +1,64 @@
+from time import perf_counter
+
+
+class InputRecorder:
+    """
+    InputRecorder logs the input of an interactive session with timestamps.
+
+    The keyboard and mouse handlers record the events they pass to the
+    controller, the controller records executed commands, reshapes and drawn
+    frames. Events are recorded only between start() and stop(), a recorder
+    that is not started costs one check per event.
+
+    Methods:
+        __init__(clock=perf_counter):
+            Initializes a stopped recorder.
+
+        start(window, scene=None, settings=None):
+            Forgets the old events and starts recording, window is the (width, height) of the window,
+            scene is the scene file the session starts with and settings are the render settings.
+
+        stop():
+            Stops recording.
+
+        record(kind, *args):
+            Adds an event with the seconds since start, the kind of the event and its arguments.
+
+        recording():
+            Returns the dictionary of the recording, for save_recording.
+    """
+
+    def __init__(self, clock=perf_counter):
+        self.clock = clock
+        self.is_recording = False
+        self.started = 0.0
+        self.window = None
+        self.scene = None
+        self.settings = {}
+        self.events = []
+
+    def start(self, window, scene=None, settings=None):
+        self.window = list(window)
+        self.scene = scene
+        self.settings = dict(settings or {})
+        self.events = []
+        self.started = self.clock()
+        self.is_recording = True
+
+    def stop(self):
+        self.is_recording = False
+
+    def record(self, kind, *args):
+        if not self.is_recording:
+            return
+        self.events.append(
+            {"time": round(self.clock() - self.started, 6), "kind": kind, "args": list(args)}
+        )
+
+    def recording(self):
+        return {
+            "window": self.window,
+            "scene": self.scene,
+            "settings": self.settings,
+            "events": list(self.events),
+        }
@@ -0,0 +1,104 @@
+import hashlib
+import os
+from time import perf_counter
+
+import numpy as np
+
+from labs.lab5.bll.InputRecorder import InputRecorder
+from shared.classes.ordered_set import OrderedSet
+
+# events of the handlers and the controller methods that replay them
+EVENT_HANDLERS = {
+    "keyboard": "handle_keyboard",
+    "keyboard_up": "handle_keyboard_up",
+    "mouse": "handle_mouse",
+    "wheel": "handle_wheel",
+    "motion": "handle_motion",
+    "reshape": "reshape",
+}
+
+
+def frame_hash(frame, cells=None):
+    """
+    :param frame: RGB framebuffer of the rasterizer.
+    :param cells: Code points and color ids of the characters of the frame, color ids may be None.
+    :return: Hex digest of the pixels and the characters of the frame.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    arrays = [frame] if cells is None else [frame, *cells]
+    for array in arrays:
+        if array is None:
+            continue
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.view(np.uint8).ravel())
+    return digest.hexdigest()
+
+
+class InputReplayer:
+    """
+    InputReplayer drives a controller through a recorded session without a window.
+
+    The controller is switched to the software rasterizer, the scene is replaced
+    with the scene file the session started with and the recorded events are
+    passed to the controller one after another as fast as possible. Every frame
+    of the session is drawn again, timed and hashed, so two replays of one
+    recording draw the same frames, and a change of the renderer that changes
+    a frame changes its hash. The commands the controller executes during the
+    replay are compared with the recorded commands.
+
+    Methods:
+        __init__(controller, clock=perf_counter):
+            Initializes the replayer of a controller.
+
+        replay(recording, folder=""):
+            Replays a recording, the scene file of the recording is relative to the folder.
+            Returns the frames (index, recorded time, milliseconds and hash of every frame)
+            and whether the replayed commands match the recorded ones.
+    """
+
+    def __init__(self, controller, clock=perf_counter):
+        self.controller = controller
+        self.clock = clock
+
+    def replay(self, recording, folder=""):
+        controller = self.controller
+        controller.set_up_renderer("software")
+        settings = recording.get("settings") or {}
+        if settings.get("ascii_height"):
+            controller.renderer.set_ascii_height(settings["ascii_height"])
+        if recording.get("scene"):
+            controller.scene.load(os.path.join(folder, recording["scene"]))
+        controller.pressed_keys = OrderedSet()
+        controller.press_position = None
+        controller.reshape(*recording["window"])
+        recorder = InputRecorder(self.clock)
+        old_recorder = controller.recorder
+        controller.set_recorder(recorder)
+        recorder.start(recording["window"])
+        frames = []
+        try:
+            for event in recording["events"]:
+                kind, args = event["kind"], event["args"]
+                if kind == "frame":
+                    frames.append(self.__render(len(frames), event["time"]))
+                elif kind in EVENT_HANDLERS:
+                    getattr(controller, EVENT_HANDLERS[kind])(*args)
+        finally:
+            recorder.stop()
+            controller.set_recorder(old_recorder)
+        recorded = [event["args"] for event in recording["events"] if event["kind"] == "command"]
+        replayed = [event["args"] for event in recorder.events if event["kind"] == "command"]
+        return {"frames": frames, "commands_match": recorded == replayed}
+
+    def __render(self, index, time):
+        controller = self.controller
+        start = self.clock()
+        cells = controller.render_frame()
+        elapsed = self.clock() - start
+        return {
+            "index": index,
+            "time": time,
+            "ms": elapsed * 1000,
+            "hash": frame_hash(controller.renderer.read_frame(), cells),
+        }
@@ -0,0 +1,84 @@
+import math
+
+import numpy as np
+
+from labs.lab5.dal.MeshGenerator import LOD_RESOLUTIONS, detail, generate
+
+# segments across a figure for every ASCII row it covers, finer segments fall
+# into the same characters
+SEGMENTS_PER_ROW = 2
+
+
+def projected_rows(center, radius, eye, fovy, rows):
+    """
+    Estimates how many rows of the ASCII grid a bounding sphere covers.
+
+    :param center: Center of the sphere in the world.
+    :param radius: Radius of the sphere.
+    :param eye: Position of the camera.
+    :param fovy: Vertical field of view of the camera in degrees.
+    :param rows: Number of rows of the ASCII grid.
+    :return: Diameter of the sphere on the screen in rows.
+    """
+    distance = float(np.linalg.norm(np.asarray(center) - np.asarray(eye)))
+    if distance <= radius:
+        return math.inf
+    return rows * radius / (distance * math.tan(math.radians(fovy) / 2))
+
+
+class LevelOfDetail:
+    """
+    LevelOfDetail keeps the levels of a generated figure, from the coarsest to
+    the finest, and chooses the level for the size of the figure on the screen.
+
+    Levels are generated when they are chosen for the first time.
+
+    Methods:
+        __init__(name, resolutions=None, **parameters):
+            Initializes the levels of a generator, the resolutions of LOD_RESOLUTIONS by default.
+
+        level(index):
+            Returns the FigureData of a level.
+
+        select(rows):
+            Returns the index of the coarsest level with enough segments for the rows a figure covers.
+
+        radius():
+            Returns the radius of the figure around its center in object space.
+    """
+
+    def __init__(self, name, resolutions=None, **parameters):
+        self.name = name
+        self.resolutions = list(resolutions or LOD_RESOLUTIONS[name])
+        if not self.resolutions:
+            raise ValueError("Level of detail needs at least one resolution")
+        self.parameters = parameters
+        self.details = [detail(name, resolution) for resolution in self.resolutions]
+        self.levels = [None] * len(self.resolutions)
+        self._radius = None
+
+    def level(self, index):
+        if self.levels[index] is None:
+            self.levels[index] = generate(
+                self.name, self.resolutions[index], **self.parameters
+            )
+        return self.levels[index]
+
+    def select(self, rows):
+        needed = rows * SEGMENTS_PER_ROW
+        for index, segments in enumerate(self.details):
+            if segments >= needed:
+                return index
+        return len(self.details) - 1
+
+    def radius(self):
+        if self._radius is None:
+            data = self.level(0)
+            positions = data.positions.astype(np.float64)
+            center = positions.mean(axis=0) if len(positions) else np.zeros(3)
+            self._radius = (
+                float(np.linalg.norm(positions - center, axis=1).max())
+                if len(positions)
+                else 0.0
+            )
+        return self._radius
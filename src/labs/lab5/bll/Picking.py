@@ -0,0 +1,231 @@
+import numpy as np
+
+from labs.lab5.bll.Culling import BoundingVolumeHierarchy, frustum_planes
+from labs.lab5.bll.FigureBuffers import fan_triangles
+from labs.lab5.bll.SoftwareRasterizer import look_at, perspective
+from labs.lab5.dal.Camera import CameraData
+
+# meshes with fewer triangles test every triangle, bigger ones use a hierarchy
+TRIANGLE_BVH_MIN = 1024
+# triangles in a leaf of the hierarchy of a mesh
+TRIANGLE_LEAF_SIZE = 32
+# determinants below it belong to rays parallel to a triangle
+EPSILON = 1e-12
+
+
+def screen_ray(x, y, width, height, view_projection):
+    """
+    Unprojects a pixel of the window to a ray in the world.
+
+    :param x: Column of the pixel from the left side of the window.
+    :param y: Row of the pixel from the top of the window, like GLUT reports it.
+    :param width: Width of the viewport in pixels.
+    :param height: Height of the viewport in pixels.
+    :param view_projection: Matrix (4 x 4) from the world to clip coordinates.
+    :return: Origin of the ray on the near plane and its normalized direction.
+    """
+    ndc_x = 2 * (x + 0.5) / width - 1
+    ndc_y = 1 - 2 * (y + 0.5) / height
+    inverse = np.linalg.inv(np.asarray(view_projection, dtype=np.float64))
+    near = inverse @ (ndc_x, ndc_y, -1, 1)
+    far = inverse @ (ndc_x, ndc_y, 1, 1)
+    near, far = near[:3] / near[3], far[:3] / far[3]
+    direction = far - near
+    return near, direction / np.linalg.norm(direction)
+
+
+def ray_triangles(origin, direction, corners, first_edges, second_edges):
+    """
+    Möller–Trumbore intersection of a ray with triangles, both sides of a triangle are hit.
+
+    :param origin: Origin of the ray.
+    :param direction: Direction of the ray.
+    :param corners: First corners of the triangles (T x 3).
+    :param first_edges: Edges from the first to the second corners (T x 3).
+    :param second_edges: Edges from the first to the third corners (T x 3).
+    :return: Distances along the ray to the triangles (T), inf for missed triangles.
+    """
+    origin = np.asarray(origin, dtype=np.float64)
+    direction = np.asarray(direction, dtype=np.float64)
+    normals = np.cross(direction, second_edges)
+    determinants = np.einsum("tk,tk->t", first_edges, normals)
+    parallel = np.abs(determinants) < EPSILON
+    inverse = 1 / np.where(parallel, 1, determinants)
+    offsets = origin - corners
+    u = np.einsum("tk,tk->t", offsets, normals) * inverse
+    crossed = np.cross(offsets, first_edges)
+    v = (crossed @ direction) * inverse
+    distances = np.einsum("tk,tk->t", second_edges, crossed) * inverse
+    hit = ~parallel & (u >= 0) & (v >= 0) & (u + v <= 1) & (distances >= 0)
+    return np.where(hit, distances, np.inf)
+
+
+class RayMesh:
+    """
+    RayMesh keeps the triangles of the faces of a figure in object space for ray picking.
+
+    A ray in the world is moved to object space with the inverse model matrix of
+    the figure, so the triangles are not transformed for every pick and the
+    distance along the ray stays the same. Meshes with many triangles test only
+    the triangles of the leaves of a bounding volume hierarchy that the ray hits.
+
+    Methods:
+        __init__(data):
+            Builds the triangles of the faces of FigureData.
+
+        is_current(data):
+            Returns whether the triangles belong to the current version of the data.
+
+        intersect(origin, direction):
+            Returns the distance to the nearest triangle the ray in object space hits, inf if it misses.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self.version = data.version
+        positions = np.asarray(data.positions, dtype=np.float64)
+        triangles = data.face_indices[fan_triangles(data.face_offsets)]
+        corners = positions[triangles]
+        self.corners = corners[:, 0]
+        self.first_edges = corners[:, 1] - corners[:, 0]
+        self.second_edges = corners[:, 2] - corners[:, 0]
+        self.hierarchy = None
+        if len(triangles) >= TRIANGLE_BVH_MIN:
+            self.hierarchy = BoundingVolumeHierarchy(
+                corners.min(axis=1), corners.max(axis=1), TRIANGLE_LEAF_SIZE
+            )
+
+    def __len__(self):
+        return len(self.corners)
+
+    def is_current(self, data):
+        return self.data is data and self.version == data.version
+
+    def intersect(self, origin, direction):
+        if self.hierarchy is None:
+            distances = ray_triangles(
+                origin, direction, self.corners, self.first_edges, self.second_edges
+            )
+        else:
+            candidates, _ = self.hierarchy.query_ray(origin, direction)
+            distances = ray_triangles(
+                origin,
+                direction,
+                self.corners[candidates],
+                self.first_edges[candidates],
+                self.second_edges[candidates],
+            )
+        return float(distances.min()) if len(distances) else np.inf
+
+
+def rect_matrix(left, top, right, bottom, width, height):
+    """
+    Builds a matrix that stretches a rectangle of the window to the whole clip space,
+    like gluPickMatrix, the view frustum of its product with a view-projection matrix
+    is the part of the view inside the rectangle.
+
+    :param left: Column of the left pixels of the rectangle.
+    :param top: Row of the top pixels of the rectangle, from the top of the window.
+    :param right: Column of the right pixels of the rectangle.
+    :param bottom: Row of the bottom pixels of the rectangle.
+    :param width: Width of the viewport in pixels.
+    :param height: Height of the viewport in pixels.
+    :return: Matrix (4 x 4) from clip coordinates to clip coordinates of the rectangle.
+    """
+    ndc_left, ndc_right = 2 * left / width - 1, 2 * (right + 1) / width - 1
+    ndc_top, ndc_bottom = 1 - 2 * top / height, 1 - 2 * (bottom + 1) / height
+    matrix = np.identity(4)
+    matrix[0, 0] = 2 / (ndc_right - ndc_left)
+    matrix[0, 3] = -(ndc_right + ndc_left) / (ndc_right - ndc_left)
+    matrix[1, 1] = 2 / (ndc_top - ndc_bottom)
+    matrix[1, 3] = -(ndc_top + ndc_bottom) / (ndc_top - ndc_bottom)
+    return matrix
+
+
+class Picker:
+    """
+    Picker finds the figures of a scene under a pixel or inside a rectangle of the window.
+
+    The view and projection matrices are computed from the CameraData of the scene,
+    not read back from OpenGL, and are kept until the camera or the viewport
+    changes, so every click of a frame uses the same matrices.
+
+    Methods:
+        __init__(scene, width=1, height=1):
+            Initializes the picker of a scene with the size of its viewport.
+
+        set_viewport(width, height):
+            Sets the size of the viewport in pixels.
+
+        view_projection():
+            Returns the matrix (4 x 4) from the world to clip coordinates of the camera.
+
+        pick(x, y):
+            Returns the nearest figure under a pixel, None if there is no figure.
+
+        pick_rect(x0, y0, x1, y1):
+            Returns the figures with vertices inside a rectangle of pixels or under its center.
+    """
+
+    def __init__(self, scene, width=1, height=1):
+        self.scene = scene
+        self.set_viewport(width, height)
+        self._key = None
+        self._view_projection = None
+
+    def set_viewport(self, width, height):
+        self.width = max(int(width), 1)
+        self.height = max(int(height), 1)
+
+    def view_projection(self):
+        camera = self.scene.data.camera
+        # the scene keeps a Camera wrapper or its CameraData
+        camera = getattr(camera, "data", camera) or CameraData()
+        key = (
+            tuple(np.asarray(camera.position, dtype=np.float64).tolist()),
+            tuple(np.asarray(camera.target, dtype=np.float64).tolist()),
+            tuple(np.asarray(camera.up_vector, dtype=np.float64).tolist()),
+            camera.fovy,
+            camera.z_near,
+            camera.z_far,
+            self.width,
+            self.height,
+        )
+        if key != self._key:
+            view = look_at(camera.position, camera.target, camera.up_vector)
+            projection = perspective(
+                camera.fovy, self.width / self.height, camera.z_near, camera.z_far
+            )
+            self._view_projection = projection @ view
+            self._key = key
+        return self._view_projection
+
+    def pick(self, x, y):
+        origin, direction = screen_ray(
+            x, y, self.width, self.height, self.view_projection()
+        )
+        figure, _ = self.scene.pick(origin, direction)
+        return figure
+
+    def pick_rect(self, x0, y0, x1, y1):
+        left, right = sorted((int(x0), int(x1)))
+        top, bottom = sorted((int(y0), int(y1)))
+        view_projection = self.view_projection()
+        rect_projection = (
+            rect_matrix(left, top, right, bottom, self.width, self.height)
+            @ view_projection
+        )
+        figures = self.scene.figures_in_frustum(frustum_planes(rect_projection))
+        inside = []
+        for figure in figures:
+            positions = figure.data.world_positions.astype(np.float64)
+            clip = positions @ rect_projection[:3, :3].T + rect_projection[:3, 3]
+            w = positions @ rect_projection[3, :3] + rect_projection[3, 3]
+            if np.any(np.all(np.abs(clip) <= w[:, None], axis=1)):
+                inside.append(figure)
+        # a face bigger than the rectangle has no vertices inside it
+        center = self.pick((left + right) / 2, (top + bottom) / 2)
+        if center is not None and center not in inside:
+            inside.append(center)
+        order = {id(figure): index for index, figure in enumerate(self.scene.data.figures)}
+        return sorted(inside, key=lambda figure: order[id(figure)])
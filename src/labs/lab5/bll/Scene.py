@@ -1,24 +1,83 @@
+import numpy as np
 from OpenGL.GL import *
 from OpenGL.GLU import *
 from OpenGL.GLUT import *
 
+from labs.lab5.bll.Culling import (
+    BVH_MIN_FIGURES,
+    BoundingVolumeHierarchy,
+    boxes_in_frustum,
+    frustum_planes,
+    ray_boxes,
+)
+from labs.lab5.bll.CameraWrapper import Camera
+from labs.lab5.bll.FigureWrapper import FigureWrapper
+from labs.lab5.bll.LevelOfDetail import LevelOfDetail, projected_rows
+from labs.lab5.bll.Picking import Picker
 from labs.lab5.dal.Scene import SceneData
+from labs.lab5.dal.SceneFile import (
+    ArrayPacker,
+    camera_data,
+    camera_entry,
+    figure_data,
+    figure_entry,
+    load_scene_file,
+    save_scene_file,
+    scene_array,
+)
+
+# settings of SceneData saved in scene files
+SCENE_SETTINGS = [
+    "point_size",
+    "line_width",
+    "alpha",
+    "highlight_color",
+    "highlight_line_width",
+    "culling",
+]
 
 
 class Scene:
     """
     Class representing a scene containing figures and a camera.
 
+    Figures outside the view frustum of the camera are not drawn. Scenes with
+    many figures find the visible ones with a bounding volume hierarchy. Clicks
+    and rectangles of the window are picked by the Picker of the scene: the
+    hierarchy or the bounding boxes give the candidate figures, a ray or the
+    vertices of the candidates choose the selected ones. The bounding boxes
+    of the figures are gathered once per frame, so clicks between two frames
+    pick the figures where the last frame showed them.
+
     Attributes:
         data (SceneData): The scene's data, including figures, camera, and selection information.
+        stats (dict): Number of figures and visible figures of the last drawn frame.
+        picker (Picker): Finds the figures under a pixel or inside a rectangle of the window.
+
+    Methods:
+        invalidate():
+            Forgets the bounding boxes of the figures, for figures moved outside of draw.
+
+        save(path):
+            Saves the camera, the settings and the figures to a scene file (JSON manifest and .npy geometry).
+
+        load(path):
+            Replaces the camera, the settings and the figures with the ones of a scene file.
     """
 
     def __init__(self, data=None):
         self.data = data if data else SceneData()
+        self.stats = {"figures": 0, "visible": 0}
+        self._bvh = None
+        self._bvh_figures = None
+        self._bvh_bounds = None
+        self._bounds = None
+        self.picker = Picker(self)
 
     def set_data(self, data):
         if data:
             self.data = data
+            self.invalidate()
 
     @classmethod
     def create(cls, data=None):
@@ -26,62 +85,134 @@ class Scene:
 
     def add_figure(self, figure):
         self.data.figures.append(figure)
+        self.invalidate()
 
     def set_camera(self, camera):
         self.data.camera = camera
 
     def deselect_figure(self):
+        for figure in self.data.selected_figures:
+            figure.data.selected = False
         if self.data.selected_figure is not None:
             self.data.selected_figure.data.selected = False
             self.data.selected_figure = None
+        self.data.selected_figures = []
 
     def select_figure(self, figure):
         figure.data.selected = True
         self.data.selected_figure = figure
-
-    def selection(self, x, y):
-        window_width = glutGet(GLUT_WINDOW_WIDTH)
-        window_height = glutGet(GLUT_WINDOW_HEIGHT)
-        viewport = glGetIntegerv(GL_VIEWPORT)
-        modelview = glGetDoublev(GL_MODELVIEW_MATRIX)
-        projection = glGetDoublev(GL_PROJECTION_MATRIX)
-        self.deselect_figure()
-        for figure in self.data.figures:
-            if figure.contains_point(
-                x, window_height - y - 1, modelview, projection, viewport
-            ):
-                self.select_figure(figure)
-                break
+        self.data.selected_figures = [figure]
 
     def handle_click(self, x, y, button):
         if button == GLUT_LEFT_BUTTON:
-            window_width = glutGet(GLUT_WINDOW_WIDTH)
-            window_height = glutGet(GLUT_WINDOW_HEIGHT)
-            viewport = glGetIntegerv(GL_VIEWPORT)
-            modelview = glGetDoublev(GL_MODELVIEW_MATRIX)
-            projection = glGetDoublev(GL_PROJECTION_MATRIX)
             self.deselect_figure()
-            for figure in self.data.figures:
-                if figure.contains_point(
-                    x, window_height - y - 1, modelview, projection, viewport
-                ):
-                    self.select_figure(figure)
-                    break
-
-    def handle_mouse(self, x, y, button):
-        if button == GLUT_LEFT_BUTTON:
-            window_width = glutGet(GLUT_WINDOW_WIDTH)
-            window_height = glutGet(GLUT_WINDOW_HEIGHT)
-            viewport = glGetIntegerv(GL_VIEWPORT)
-            modelview = glGetDoublev(GL_MODELVIEW_MATRIX)
-            projection = glGetDoublev(GL_PROJECTION_MATRIX)
-            self.deselect_figure()
-            for figure in self.data.figures:
-                if figure.contains_point(
-                    x, window_height - y - 1, modelview, projection, viewport
-                ):
-                    self.select_figure(figure)
-                    break
+            figure = self.picker.pick(x, y)
+            if figure is not None:
+                self.select_figure(figure)
+
+    def select_rect(self, x0, y0, x1, y1):
+        self.deselect_figure()
+        figures = self.picker.pick_rect(x0, y0, x1, y1)
+        for figure in figures:
+            figure.data.selected = True
+        self.data.selected_figures = figures
+        self.data.selected_figure = figures[0] if figures else None
+
+    def pick(self, origin, direction):
+        figures = self.data.figures
+        if not figures:
+            return None, np.inf
+        minimums, maximums = self.__bounds()
+        if len(figures) < BVH_MIN_FIGURES:
+            distances = ray_boxes(origin, direction, minimums, maximums)
+            candidates = np.flatnonzero(np.isfinite(distances))
+            order = np.argsort(distances[candidates], kind="stable")
+            candidates, distances = candidates[order], distances[candidates][order]
+        else:
+            candidates, distances = self.__hierarchy(minimums, maximums).query_ray(
+                origin, direction
+            )
+        nearest, nearest_distance = None, np.inf
+        for index, box_distance in zip(candidates.tolist(), distances.tolist()):
+            # the boxes are sorted, figures behind the nearest hit are not tested
+            if box_distance > nearest_distance:
+                break
+            distance = figures[index].intersect_ray(origin, direction)
+            if distance < nearest_distance:
+                nearest, nearest_distance = figures[index], distance
+        return nearest, nearest_distance
+
+    def save(self, path):
+        packer = ArrayPacker()
+        camera = getattr(self.data.camera, "data", self.data.camera)
+        figures = []
+        for figure in self.data.figures:
+            entry = figure_entry(figure.data, packer)
+            lod = self.__lod_entry(figure, packer)
+            if lod is not None:
+                entry["lod"] = lod
+            figures.append(entry)
+        manifest = {
+            "camera": camera_entry(camera) if camera is not None else None,
+            "settings": {name: getattr(self.data, name) for name in SCENE_SETTINGS},
+            "figures": figures,
+        }
+        save_scene_file(path, manifest, packer.arrays)
+
+    def load(self, path):
+        manifest, arrays = load_scene_file(path)
+        data = SceneData()
+        for name, value in manifest.get("settings", {}).items():
+            if name in SCENE_SETTINGS:
+                setattr(data, name, tuple(value) if isinstance(value, list) else value)
+        if manifest.get("camera") is not None:
+            data.camera = Camera(camera_data(manifest["camera"]))
+        used = set()
+        for entry in manifest["figures"]:
+            figure = FigureWrapper(figure_data(entry, arrays, used))
+            if "lod" in entry:
+                self.__restore_lod(figure, entry["lod"], arrays)
+            data.figures.append(figure)
+        # the replaced figures are not drawn again, their OpenGL buffers are deleted
+        for figure in self.data.figures:
+            figure.release_buffers()
+        self.set_data(data)
+        self._bvh = None
+        self._bvh_figures = None
+
+    @staticmethod
+    def __lod_entry(figure, packer):
+        lod = figure.lod
+        levels = [] if lod is None else lod.levels
+        level = next(
+            (index for index, data in enumerate(levels) if data is figure.data), None
+        )
+        if level is None:
+            return None
+        parameters = {
+            name: {"array": packer.add(value)} if isinstance(value, np.ndarray) else value
+            for name, value in lod.parameters.items()
+        }
+        return {
+            "name": lod.name,
+            "resolutions": lod.resolutions,
+            "parameters": parameters,
+            "level": level,
+        }
+
+    @staticmethod
+    def __restore_lod(figure, entry, arrays):
+        parameters = {
+            name: scene_array(arrays, value["array"]) if isinstance(value, dict) else value
+            for name, value in entry["parameters"].items()
+        }
+        lod = LevelOfDetail(entry["name"], entry["resolutions"], **parameters)
+        level = entry["level"]
+        if type(level) is not int or not 0 <= level < len(lod.levels):
+            raise ValueError(f"Level of detail {level} is not in the scene file")
+        # the saved level is shown, the other levels are generated when they are chosen
+        lod.levels[level] = figure.data
+        figure.lod = lod
 
     def handle_motion(self, x, y):
         if self.data.is_rotating and self.data.camera:
@@ -93,9 +224,25 @@ class Scene:
 
             self.data.last_mouse_x = x
             self.data.last_mouse_y = y
-        glutPostRedisplay()
 
-    def draw(self):
+    def update_levels_of_detail(self):
+        rows = self.data.lod_rows
+        camera = self.data.camera
+        if not rows or not getattr(camera, "data", None):
+            return
+        eye = camera.data.position
+        fovy = camera.data.fovy
+        for figure in self.data.figures:
+            if figure.lod is None:
+                continue
+            figure_rows = projected_rows(
+                figure.data.center(), figure.bounding_radius(), eye, fovy, rows
+            )
+            figure.update_level_of_detail(figure_rows)
+
+    def draw(self, rasterizer=None):
+        self.invalidate()
+        self.update_levels_of_detail()
         point_size = self.data.point_size if self.data.point_size is not None else 5
         line_width = self.data.line_width if self.data.line_width is not None else 2
         alpha = self.data.alpha if self.data.alpha is not None else 0.5
@@ -109,9 +256,93 @@ class Scene:
             if self.data.highlight_line_width is not None
             else 2
         )
+        if rasterizer:
+            self.rasterize(
+                rasterizer,
+                point_size,
+                line_width,
+                alpha,
+                highlight_color,
+                highlight_line_width,
+            )
+            return
         if self.data.camera:
             self.data.camera.apply_transformations()
-        for figure in self.data.figures:
+        # OpenGL returns the matrices in column-major order
+        modelview = np.asarray(glGetDoublev(GL_MODELVIEW_MATRIX)).reshape(4, 4).T
+        projection = np.asarray(glGetDoublev(GL_PROJECTION_MATRIX)).reshape(4, 4).T
+        for figure in self.visible_figures(projection @ modelview):
             figure.draw_custom(
                 point_size, line_width, alpha, highlight_color, highlight_line_width
             )
+
+    def rasterize(
+        self,
+        rasterizer,
+        point_size,
+        line_width,
+        alpha,
+        highlight_color,
+        highlight_line_width,
+    ):
+        camera = self.data.camera
+        if camera and getattr(camera, "data", None):
+            rasterizer.set_view(camera.view_matrix())
+            aspect = rasterizer.width / rasterizer.height
+            rasterizer.set_projection(camera.projection_matrix(aspect))
+        for figure in self.visible_figures(rasterizer.projection @ rasterizer.view):
+            figure.rasterize(
+                rasterizer,
+                point_size,
+                line_width,
+                alpha,
+                highlight_color,
+                highlight_line_width,
+            )
+
+    def visible_figures(self, view_projection):
+        figures = self.data.figures
+        self.stats["figures"] = len(figures)
+        if not self.data.culling or not figures:
+            self.stats["visible"] = len(figures)
+            return list(figures)
+        visible = self.figures_in_frustum(frustum_planes(view_projection))
+        self.stats["visible"] = len(visible)
+        return visible
+
+    def figures_in_frustum(self, planes):
+        figures = self.data.figures
+        if not figures:
+            return []
+        minimums, maximums = self.__bounds()
+        if len(figures) < BVH_MIN_FIGURES:
+            indices = np.flatnonzero(boxes_in_frustum(planes, minimums, maximums))
+        else:
+            indices = self.__hierarchy(minimums, maximums).query(planes)
+        return [figures[index] for index in indices]
+
+    def invalidate(self):
+        self._bounds = None
+
+    def __bounds(self):
+        if self._bounds is None:
+            bounds = [figure.data.bounds() for figure in self.data.figures]
+            minimums = np.array([minimum for minimum, _ in bounds]).reshape(-1, 3)
+            maximums = np.array([maximum for _, maximum in bounds]).reshape(-1, 3)
+            self._bounds = (minimums, maximums)
+        return self._bounds
+
+    def __hierarchy(self, minimums, maximums):
+        if self._bvh is not None and self._bvh_bounds is self._bounds:
+            return self._bvh
+        figures = [id(figure) for figure in self.data.figures]
+        if self._bvh is None or self._bvh_figures != figures:
+            self._bvh = BoundingVolumeHierarchy(minimums, maximums)
+            self._bvh_figures = figures
+        elif not (
+            np.array_equal(self._bvh.figure_minimums, minimums)
+            and np.array_equal(self._bvh.figure_maximums, maximums)
+        ):
+            self._bvh.refit(minimums, maximums)
+        self._bvh_bounds = self._bounds
+        return self._bvh
@@ -0,0 +1,300 @@
+import numpy as np
+
+RENDER_BACKENDS = ["opengl", "software"]
+# tolerance of the barycentric weights of pixel centers on triangle edges
+EDGE_EPSILON = 1e-9
+
+
+def look_at(eye, target, up):
+    """
+    View matrix of a camera, the same as gluLookAt.
+
+    :param eye: Position of the camera.
+    :param target: Point the camera looks at.
+    :param up: Up direction of the camera.
+    :return: 4x4 view matrix.
+    """
+    eye = np.asarray(eye, dtype=np.float64)
+    forward = np.asarray(target, dtype=np.float64) - eye
+    forward /= np.linalg.norm(forward)
+    side = np.cross(forward, np.asarray(up, dtype=np.float64))
+    side /= np.linalg.norm(side)
+    view = np.identity(4)
+    view[0, :3] = side
+    view[1, :3] = np.cross(side, forward)
+    view[2, :3] = -forward
+    view[:3, 3] = -view[:3, :3] @ eye
+    return view
+
+
+def perspective(fovy, aspect, z_near, z_far):
+    """
+    Projection matrix of a perspective camera, the same as gluPerspective.
+
+    :param fovy: Vertical field of view in degrees.
+    :param aspect: Width to height ratio of the viewport.
+    :param z_near: Distance to the near clipping plane.
+    :param z_far: Distance to the far clipping plane.
+    :return: 4x4 projection matrix.
+    """
+    focal = 1 / np.tan(np.radians(fovy) / 2)
+    projection = np.zeros((4, 4))
+    projection[0, 0] = focal / aspect
+    projection[1, 1] = focal
+    projection[2, 2] = (z_far + z_near) / (z_near - z_far)
+    projection[2, 3] = 2 * z_far * z_near / (z_near - z_far)
+    projection[3, 2] = -1
+    return projection
+
+
+class SoftwareRasterizer:
+    """
+    SoftwareRasterizer draws points, lines and polygons into a NumPy framebuffer.
+
+    It follows the fixed pipeline of the OpenGL backend: vertices are moved by
+    the view and projection matrices, clipped by the near plane, mapped to the
+    viewport and written with a depth test (GL_LESS). The color buffer is
+    bottom-up like the result of glReadPixels, so AsciiRenderer converts both
+    the same way. Colors are (r, g, b) floats from 0 to 1 like glColor3fv.
+
+    All fragments of one draw call are produced with array operations, the
+    nearest fragment of every pixel is found by sorting them by depth.
+
+    Methods:
+        __init__(width, height, clear_color=(0, 0, 0)):
+            Initializes the buffers of the given size.
+
+        resize(width, height):
+            Changes the size of the buffers.
+
+        clear():
+            Fills the color buffer with the clear color and the depth buffer with 1.
+
+        set_view(view) / set_projection(projection):
+            Sets the 4x4 view / projection matrix.
+
+        project(positions):
+            Returns the window coordinates (x, y, depth) of the positions.
+
+        draw_points(positions, colors, size=1):
+            Draws square points of the given size in pixels.
+
+        draw_lines(starts, ends, colors, width=1):
+            Draws line segments of the given width in pixels.
+
+        draw_polygons(polygons, colors):
+            Fills convex polygons, every polygon is a sequence of positions.
+    """
+
+    def __init__(self, width, height, clear_color=(0, 0, 0)):
+        self.clear_color = clear_color
+        self.view = np.identity(4)
+        self.projection = np.identity(4)
+        self.stats = {"points": 0, "lines": 0, "triangles": 0, "fragments": 0}
+        self.width = None
+        self.height = None
+        self.frame = None
+        self.depth = None
+        self.resize(width, height)
+
+    def resize(self, width, height):
+        if width < 1 or height < 1:
+            raise ValueError("Framebuffer size must be positive")
+        self.width = width
+        self.height = height
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self.depth = np.ones((height, width), dtype=np.float64)
+        self.clear()
+
+    def clear(self):
+        self.frame[:] = self.__to_bytes(self.clear_color, 1)[0]
+        self.depth.fill(1.0)
+
+    def set_view(self, view):
+        self.view = np.asarray(view, dtype=np.float64)
+
+    def set_projection(self, projection):
+        self.projection = np.asarray(projection, dtype=np.float64)
+
+    def project(self, positions):
+        return self.__to_window(self.__to_clip(positions))
+
+    def draw_points(self, positions, colors, size=1):
+        clip = self.__to_clip(positions)
+        colors = self.__to_bytes(colors, len(clip))
+        visible = (clip[:, 3] > 0) & (np.abs(clip[:, 2]) <= clip[:, 3])
+        window = self.__to_window(clip[visible])
+        colors = colors[visible]
+        self.stats["points"] += len(window)
+        size = max(1, int(round(size)))
+        # an aliased point covers the pixel centers of a size x size square
+        offsets = np.arange(size)
+        left = np.floor(window[:, 0] - size / 2 + 0.5).astype(np.int64)
+        bottom = np.floor(window[:, 1] - size / 2 + 0.5).astype(np.int64)
+        xs = (left[:, None, None] + offsets[None, None, :]).repeat(size, axis=1)
+        ys = (bottom[:, None, None] + offsets[None, :, None]).repeat(size, axis=2)
+        cells = size * size
+        self.__write(
+            xs.ravel(),
+            ys.ravel(),
+            np.repeat(window[:, 2], cells),
+            np.repeat(colors, cells, axis=0),
+        )
+
+    def draw_lines(self, starts, ends, colors, width=1):
+        start_clip = self.__to_clip(starts)
+        end_clip = self.__to_clip(ends)
+        colors = self.__to_bytes(colors, len(start_clip))
+        # distances to the near plane (z = -w) in clip space
+        start_near = start_clip[:, 2] + start_clip[:, 3]
+        end_near = end_clip[:, 2] + end_clip[:, 3]
+        visible = (start_near >= 0) | (end_near >= 0)
+        start_clip, end_clip = start_clip[visible], end_clip[visible]
+        start_near, end_near = start_near[visible], end_near[visible]
+        colors = colors[visible]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = start_near / (start_near - end_near)
+            crossing = start_clip + t[:, None] * (end_clip - start_clip)
+        start_clip = np.where((start_near < 0)[:, None], crossing, start_clip)
+        end_clip = np.where((end_near < 0)[:, None], crossing, end_clip)
+        start_window = self.__to_window(start_clip)
+        end_window = self.__to_window(end_clip)
+        self.stats["lines"] += len(start_window)
+        if not len(start_window):
+            return
+        delta = end_window - start_window
+        x_major = np.abs(delta[:, 0]) >= np.abs(delta[:, 1])
+        samples = np.ceil(np.abs(delta[:, :2]).max(axis=1)).astype(np.int64) + 1
+        line_ids = np.repeat(np.arange(len(samples)), samples)
+        first = np.cumsum(samples) - samples
+        steps = np.arange(len(line_ids)) - first[line_ids]
+        t = steps / np.maximum(samples - 1, 1)[line_ids]
+        points = start_window[line_ids] + t[:, None] * delta[line_ids]
+        xs = np.floor(points[:, 0]).astype(np.int64)
+        ys = np.floor(points[:, 1]).astype(np.int64)
+        width = max(1, int(round(width)))
+        if width > 1:
+            # a wide aliased line is widened across its major axis
+            offsets = np.tile(np.arange(width) - (width - 1) // 2, len(xs))
+            across_y = np.repeat(x_major[line_ids], width)
+            xs = np.repeat(xs, width) + np.where(across_y, 0, offsets)
+            ys = np.repeat(ys, width) + np.where(across_y, offsets, 0)
+            line_ids = np.repeat(line_ids, width)
+            depths = np.repeat(points[:, 2], width)
+        else:
+            depths = points[:, 2]
+        self.__write(xs, ys, depths, colors[line_ids])
+
+    def draw_polygons(self, polygons, colors):
+        colors = self.__to_bytes(colors, len(polygons))
+        triangles = []
+        triangle_colors = []
+        for polygon, color in zip(polygons, colors):
+            clip = self.__clip_near(self.__to_clip(polygon))
+            # convex polygons are split into a fan of triangles
+            for index in range(1, len(clip) - 1):
+                triangles.append(clip[[0, index, index + 1]])
+                triangle_colors.append(color)
+        self.stats["triangles"] += len(triangles)
+        if not triangles:
+            return
+        window = self.__to_window(np.concatenate(triangles)).reshape(-1, 3, 3)
+        fragments = [self.__fill_triangle(vertices) for vertices in window]
+        counts = np.array([len(xs) for xs, _, _ in fragments])
+        if not counts.sum():
+            return
+        xs = np.concatenate([xs for xs, _, _ in fragments])
+        ys = np.concatenate([ys for _, ys, _ in fragments])
+        depths = np.concatenate([depths for _, _, depths in fragments])
+        colors = np.repeat(np.array(triangle_colors), counts, axis=0)
+        self.__write(xs, ys, depths, colors)
+
+    def __fill_triangle(self, vertices):
+        left = max(int(np.floor(vertices[:, 0].min())), 0)
+        right = min(int(np.ceil(vertices[:, 0].max())), self.width - 1)
+        bottom = max(int(np.floor(vertices[:, 1].min())), 0)
+        top = min(int(np.ceil(vertices[:, 1].max())), self.height - 1)
+        empty = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        if left > right or bottom > top:
+            return empty
+        (x0, y0, z0), (x1, y1, z1), (x2, y2, z2) = vertices
+        area = (x1 - x0) * (y2 - y0) - (y1 - y0) * (x2 - x0)
+        if area == 0:
+            return empty
+        ys, xs = np.mgrid[bottom : top + 1, left : right + 1]
+        centers_x = xs + 0.5
+        centers_y = ys + 0.5
+        # barycentric weights of the pixel centers
+        w0 = ((x1 - centers_x) * (y2 - centers_y) - (y1 - centers_y) * (x2 - centers_x)) / area
+        w1 = ((x2 - centers_x) * (y0 - centers_y) - (y2 - centers_y) * (x0 - centers_x)) / area
+        w2 = 1 - w0 - w1
+        # pixel centers on a shared edge are kept by both triangles, so no gaps
+        # appear between the triangles of a polygon because of rounding
+        inside = (w0 >= -EDGE_EPSILON) & (w1 >= -EDGE_EPSILON) & (w2 >= -EDGE_EPSILON)
+        depths = w0[inside] * z0 + w1[inside] * z1 + w2[inside] * z2
+        return xs[inside], ys[inside], depths
+
+    def __write(self, xs, ys, depths, colors):
+        inside = (
+            (xs >= 0)
+            & (xs < self.width)
+            & (ys >= 0)
+            & (ys < self.height)
+            & (depths >= 0)
+            & (depths <= 1)
+        )
+        cells = ys[inside] * self.width + xs[inside]
+        depths = depths[inside]
+        colors = colors[inside]
+        self.stats["fragments"] += len(cells)
+        if not len(cells):
+            return
+        # the nearest fragment of every pixel, the first drawn one of equal depths
+        order = np.lexsort((depths, cells))
+        cells, depths, colors = cells[order], depths[order], colors[order]
+        first = np.ones(len(cells), dtype=bool)
+        first[1:] = cells[1:] != cells[:-1]
+        cells, depths, colors = cells[first], depths[first], colors[first]
+        depth_buffer = self.depth.reshape(-1)
+        passed = depths < depth_buffer[cells]
+        depth_buffer[cells[passed]] = depths[passed]
+        self.frame.reshape(-1, 3)[cells[passed]] = colors[passed]
+
+    def __to_clip(self, positions):
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        homogeneous = np.ones((len(positions), 4))
+        homogeneous[:, :3] = positions
+        return homogeneous @ (self.projection @ self.view).T
+
+    def __to_window(self, clip):
+        ndc = clip[:, :3] / clip[:, 3:]
+        window = np.empty_like(ndc)
+        window[:, 0] = (ndc[:, 0] + 1) * 0.5 * self.width
+        window[:, 1] = (ndc[:, 1] + 1) * 0.5 * self.height
+        window[:, 2] = (ndc[:, 2] + 1) * 0.5
+        return window
+
+    @staticmethod
+    def __clip_near(clip):
+        distances = clip[:, 2] + clip[:, 3]
+        if np.all(distances >= 0):
+            return clip
+        result = []
+        for index in range(len(clip)):
+            current, following = clip[index], clip[(index + 1) % len(clip)]
+            current_distance = distances[index]
+            following_distance = distances[(index + 1) % len(clip)]
+            if current_distance >= 0:
+                result.append(current)
+            if (current_distance >= 0) != (following_distance >= 0):
+                t = current_distance / (current_distance - following_distance)
+                result.append(current + t * (following - current))
+        return np.array(result).reshape(-1, 4)
+
+    @staticmethod
+    def __to_bytes(colors, count):
+        colors = np.asarray(colors, dtype=np.float64)
+        if colors.ndim == 1:
+            colors = np.broadcast_to(colors[:3], (count, 3))
+        colors = np.clip(colors[:, :3], 0, 1)
+        return np.round(colors * 255).astype(np.uint8)
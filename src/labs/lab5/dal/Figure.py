@@ -1,10 +1,49 @@
 import numpy as np
 
+DEFAULT_VERTEX_COLOR = (0, 0, 100)
+DEFAULT_EDGE_COLOR = (1, 0, 0)
+DEFAULT_FACE_COLOR = (0, 1, 0)
+IDENTITY = np.identity(4)
+
+
+def face_borders(face_indices, face_offsets):
+    """
+    :param face_indices: Vertex indices of the face corners, face after face.
+    :param face_offsets: Offsets of the faces in face_indices (F + 1).
+    :return: Vertex index pairs of the face borders (M x 2).
+    """
+    face_offsets = np.asarray(face_offsets)
+    starts = face_offsets[:-1]
+    counts = np.diff(face_offsets)
+    # every corner is joined with the next one, the last one with the first one
+    following = np.arange(1, len(face_indices) + 1)
+    following[face_offsets[1:][counts > 0] - 1] = starts[counts > 0]
+    return np.stack([face_indices, face_indices[following]], axis=1)
+
+
+def unique_edges(face_indices, face_offsets, vertex_count):
+    """
+    :param face_indices: Vertex indices of the face corners, face after face.
+    :param face_offsets: Offsets of the faces in face_indices (F + 1).
+    :param vertex_count: Number of vertices of the figure.
+    :return: Vertex index pairs (E x 2) of the face borders, every edge once.
+    """
+    borders = np.sort(face_borders(face_indices, face_offsets), axis=1)
+    borders = borders[borders[:, 0] != borders[:, 1]]
+    # a pair is encoded as one number, so np.unique sorts a flat array
+    keys = np.unique(borders[:, 0] * vertex_count + borders[:, 1])
+    return np.stack([keys // vertex_count, keys % vertex_count], axis=1)
+
 
 class Vertex:
     """
     Class representing a 3D vertex with color.
 
+    A vertex created on its own keeps its position, a vertex of a figure is a
+    view of one row of the figure arrays, so changes of the view change the
+    figure and the other way round. The position of a view is in world
+    coordinates, after the model matrix of the figure.
+
     Attributes
     ----------
     position : np.ndarray
@@ -14,22 +53,68 @@ class Vertex:
 
     Methods
     -------
-    position()
-        Returns the current position of the vertex as a tuple (x, y, z).
+    view(figure, index)
+        Returns the vertex of the figure with the given index.
     """
 
-    def __init__(self, x, y, z, color=(0, 0, 100)):
-        self.position = np.array([x, y, z], dtype=np.float32)
-        self.color = color
+    __slots__ = ("_figure", "_index", "_position", "_color")
+
+    def __init__(self, x, y, z, color=DEFAULT_VERTEX_COLOR):
+        self._figure = None
+        self._index = None
+        self._position = np.array([x, y, z], dtype=np.float32)
+        self._color = color
+
+    @classmethod
+    def view(cls, figure, index):
+        vertex = cls.__new__(cls)
+        vertex._bind(figure, index)
+        return vertex
 
+    def _bind(self, figure, index):
+        self._figure = figure
+        self._index = index
+        self._position = None
+        self._color = None
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
     def position(self):
-        return self.x, self.y, self.z
+        if self._figure is None:
+            return self._position
+        return self._figure.world_positions[self._index].copy()
+
+    @position.setter
+    def position(self, position):
+        if self._figure is None:
+            self._position = np.asarray(position, dtype=np.float32)
+        else:
+            self._figure.set_world_position(self._index, position)
+
+    @property
+    def color(self):
+        if self._figure is None:
+            return self._color
+        return tuple(self._figure.vertex_colors[self._index].tolist())
+
+    @color.setter
+    def color(self, color):
+        if self._figure is None:
+            self._color = color
+        else:
+            self._figure.vertex_colors[self._index] = color[:3]
+            self._figure.invalidate()
 
 
 class Edge:
     """
     Represents an edge in a graph, connecting two vertices.
 
+    An edge of a figure is a view of one row of the edge index array.
+
     Attributes
     ----------
     vertices : tuple of Vertex
@@ -50,63 +135,179 @@ class Edge:
         The color of the edge in RGB format. Default is (1, 0, 0).
     """
 
-    def __init__(self, start_vertex: Vertex, end_vertex: Vertex, color=(1, 0, 0)):
-        self.vertices = (start_vertex, end_vertex)
-        self.color = color
+    __slots__ = ("_figure", "_index", "_vertices", "_color")
+
+    def __init__(
+        self, start_vertex: Vertex, end_vertex: Vertex, color=DEFAULT_EDGE_COLOR
+    ):
+        self._figure = None
+        self._index = None
+        self._vertices = (start_vertex, end_vertex)
+        self._color = color
+
+    @classmethod
+    def view(cls, figure, index):
+        edge = cls.__new__(cls)
+        edge._bind(figure, index)
+        return edge
+
+    def _bind(self, figure, index):
+        self._figure = figure
+        self._index = index
+        self._vertices = None
+        self._color = None
+
+    @property
+    def vertices(self):
+        if self._figure is None:
+            return self._vertices
+        views = self._figure.vertices
+        start, end = self._figure.edge_indices[self._index].tolist()
+        return views[start], views[end]
+
+    @property
+    def color(self):
+        if self._figure is None:
+            return self._color
+        return tuple(self._figure.edge_colors[self._index].tolist())
+
+    @color.setter
+    def color(self, color):
+        if self._figure is None:
+            self._color = color
+        else:
+            self._figure.edge_colors[self._index] = color[:3]
+            self._figure.invalidate()
 
 
 class Face:
     """
     Class representing a polygonal Face.
 
+    A face of a figure is a view of one polygon of the face index array.
+
     :param vertices: List of Vertex objects representing the corners of the face.
     :type vertices: list[Vertex]
     :param color: RGB color value for the face, defaults to (0, 1, 0)
     :type color: tuple
     """
 
-    def __init__(self, vertices: list[Vertex], color=(0, 1, 0)):
-        self.vertices = vertices
-        self.color = color
+    __slots__ = ("_figure", "_index", "_vertices", "_color")
+
+    def __init__(self, vertices: list[Vertex], color=DEFAULT_FACE_COLOR):
+        self._figure = None
+        self._index = None
+        self._vertices = vertices
+        self._color = color
+
+    @classmethod
+    def view(cls, figure, index):
+        face = cls.__new__(cls)
+        face._bind(figure, index)
+        return face
+
+    def _bind(self, figure, index):
+        self._figure = figure
+        self._index = index
+        self._vertices = None
+        self._color = None
+
+    @property
+    def vertices(self):
+        if self._figure is None:
+            return self._vertices
+        views = self._figure.vertices
+        return [views[index] for index in self._figure.face(self._index).tolist()]
+
+    @property
+    def color(self):
+        if self._figure is None:
+            return self._color
+        return tuple(self._figure.face_colors[self._index].tolist())
+
+    @color.setter
+    def color(self, color):
+        if self._figure is None:
+            self._color = color
+        else:
+            self._figure.face_colors[self._index] = color[:3]
+            self._figure.invalidate()
 
 
 class FigureData:
     """
-    FigureData(vertices, edges, faces=None, color=(1, 1, 1), draw_mode='edges')
+    FigureData(vertices, edges, faces=None, color=(1, 1, 1), draw_mode='edges', figure_color=True)
 
     Represents a geometric figure consisting of vertices, edges, and optional faces.
 
+    The geometry is kept as arrays (struct of arrays): positions of all
+    vertices, pairs of vertex indices of the edges and the vertex indices of
+    all faces one after another with the offset of every face. Vertex, Edge
+    and Face objects are views of these arrays, so a figure of N vertices
+    takes 12 bytes per position instead of one object and one array per vertex.
+
+    Positions are kept in object space, the model matrix (4 x 4) moves them
+    into the world. Transforms only change the model matrix, the world
+    positions are computed with one matrix product when they are needed and
+    kept until the model matrix or the positions change.
+
     Parameters:
         vertices (list): A list of vertex coordinates or Vertex instances.
-        edges (list): A list of edge definitions, typically as pairs of vertex indices.
-        faces (list, optional): A list of face definitions. Default is None.
+        edges (list): A list of Edge instances, pairs of Vertex instances or pairs of vertex indices.
+        faces (list, optional): A list of Face instances, lists of Vertex instances or lists of vertex indices. Default is None.
         color (tuple): A tuple representing the RGB color of the figure. Default is (1, 1, 1).
-        draw_mode (str): Drawing mode, can be 'edges' or other modes. Default is 'edges'.
+        draw_mode (str): Drawing mode, can be 'points', 'edges' or 'faces'. Default is 'edges'.
+        figure_color (bool): Whether the whole figure is drawn with its color instead of the element colors. Default is True.
 
     Attributes:
-        vertices (list): List of Vertex instances representing the vertices of the figure.
-        edges (list): List of Edge instances representing the edges of the figure.
-        faces (list): List of Face instances representing the faces of the figure.
+        positions (np.ndarray): Positions of the vertices in object space (N x 3, float32), call invalidate() after changing the arrays in place.
+        model (np.ndarray): Model matrix (4 x 4) from object space to the world.
+        world_positions (np.ndarray): Read-only positions of the vertices in the world.
+        version (int): Number of changes of the arrays, vertex buffers are rebuilt when it changes.
+        vertex_colors (np.ndarray): Colors of the vertices (N x 3).
+        edge_indices (np.ndarray): Vertex indices of the edges (E x 2).
+        edge_colors (np.ndarray): Colors of the edges (E x 3).
+        face_indices (np.ndarray): Vertex indices of all faces one after another.
+        face_offsets (np.ndarray): Start of every face in face_indices and the total count (F + 1).
+        face_colors (np.ndarray): Colors of the faces (F x 3).
+        vertices (list): List of Vertex views of the figure.
+        edges (list): List of Edge views of the figure.
+        faces (list): List of Face views of the figure.
         color (tuple): RGB color of the figure.
         angle (list): A list of three angles (in degrees) representing the rotation of the figure around the x, y, and z axes.
         draw_mode (str): Mode in which the figure should be drawn.
         selected (bool): Indicates if the figure is selected.
-    """
 
-    def __init__(self, vertices, edges, faces=None, color=(1, 1, 1), draw_mode="edges"):
-        # Determine if vertices are already instances of Vertex
-        self.vertices = [v if isinstance(v, Vertex) else Vertex(*v) for v in vertices]
-        self.edges = [Edge(*e) for e in edges]
-        self.faces = [Face(f) for f in faces] if faces is not None else []
-        self.color = color
-        self.angle = [0, 0, 0]
-        self.draw_mode = draw_mode
-        self.selected = False
+    Methods:
+        from_arrays(positions, edges=None, faces=None, face_offsets=None, color=(1, 1, 1), draw_mode="edges", figure_color=True):
+            Creates a figure from arrays without Vertex, Edge and Face objects.
 
+        from_buffers(positions, vertex_colors, edge_indices, edge_colors, face_indices, face_offsets, face_colors, color=(1, 1, 1), draw_mode="edges", figure_color=True):
+            Creates a figure that keeps the given arrays without copying them, for example memory-mapped arrays of a scene file.
 
-class FigureData:
-    """
-    class FigureData:
+        center():
+            Returns the center (mean of the vertices) of the figure in the world.
+
+        bounds():
+            Returns the corners (minimum, maximum) of an axis-aligned box around the figure in the world.
+
+        bounding_sphere():
+            Returns the center and the radius of a sphere around the figure in the world.
+
+        set_world_position(index, position):
+            Moves a vertex to a world position.
+
+        invalidate():
+            Forgets the cached world positions and increments version after the arrays changed in place.
+
+        face(index):
+            Returns the vertex indices of the face.
+
+        face_borders():
+            Returns the vertex index pairs of the borders of all faces (K x 2).
+
+        copy():
+            Returns a figure with copies of the arrays.
     """
 
     def __init__(
@@ -118,18 +319,293 @@ class FigureData:
         draw_mode="edges",
         figure_color=True,
     ):
-        self.vertices = [v if isinstance(v, Vertex) else Vertex(*v) for v in vertices]
-        self.edges = [e if isinstance(e, Edge) else Edge(*e) for e in edges]
-        self.faces = (
-            [f if isinstance(f, Face) else Face(f) for f in faces]
-            if faces is not None
-            else []
+        vertices = list(vertices)
+        index_of = {
+            id(vertex): index
+            for index, vertex in enumerate(vertices)
+            if isinstance(vertex, Vertex)
+        }
+        positions = [
+            vertex.position if isinstance(vertex, Vertex) else vertex
+            for vertex in vertices
+        ]
+        vertex_colors = [
+            vertex.color if isinstance(vertex, Vertex) else DEFAULT_VERTEX_COLOR
+            for vertex in vertices
+        ]
+        edges = list(edges)
+        edge_pairs = [self.__indices(self.__corners(edge), index_of) for edge in edges]
+        edge_colors = [
+            edge.color if isinstance(edge, Edge) else DEFAULT_EDGE_COLOR
+            for edge in edges
+        ]
+        faces = list(faces) if faces is not None else []
+        polygons = [self.__indices(self.__corners(face), index_of) for face in faces]
+        face_colors = [
+            face.color if isinstance(face, Face) else DEFAULT_FACE_COLOR
+            for face in faces
+        ]
+        self.__set_arrays(positions, edge_pairs, polygons)
+        self.vertex_colors = self.__colors(vertex_colors, len(self.positions))
+        self.edge_colors = self.__colors(edge_colors, len(self.edge_indices))
+        self.face_colors = self.__colors(face_colors, len(self.face_offsets) - 1)
+        self.__set_attributes(color, draw_mode, figure_color)
+        # the given objects become views of the arrays, views of other figures are not moved
+        self._vertex_views = self.__views(vertices, Vertex)
+        self._edge_views = self.__views(edges, Edge)
+        self._face_views = self.__views(faces, Face)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        positions,
+        edges=None,
+        faces=None,
+        face_offsets=None,
+        color=(1, 1, 1),
+        draw_mode="edges",
+        figure_color=True,
+    ):
+        data = cls.__new__(cls)
+        if faces is not None and face_offsets is None:
+            faces = [np.asarray(face).ravel() for face in faces]
+        elif faces is not None:
+            faces = np.split(np.asarray(faces), np.asarray(face_offsets)[1:-1])
+        data.__set_arrays(positions, edges if edges is not None else [], faces or [])
+        data.vertex_colors = cls.__colors([], len(data.positions))
+        data.edge_colors = cls.__colors([], len(data.edge_indices))
+        data.face_colors = cls.__colors([], len(data.face_offsets) - 1)
+        data.vertex_colors[:] = DEFAULT_VERTEX_COLOR
+        data.edge_colors[:] = DEFAULT_EDGE_COLOR
+        data.face_colors[:] = DEFAULT_FACE_COLOR
+        data.__set_attributes(color, draw_mode, figure_color)
+        data._vertex_views = None
+        data._edge_views = None
+        data._face_views = None
+        return data
+
+    @classmethod
+    def from_buffers(
+        cls,
+        positions,
+        vertex_colors,
+        edge_indices,
+        edge_colors,
+        face_indices,
+        face_offsets,
+        face_colors,
+        color=(1, 1, 1),
+        draw_mode="edges",
+        figure_color=True,
+    ):
+        arrays = {
+            "positions": (positions, np.float32, (-1, 3)),
+            "vertex_colors": (vertex_colors, np.float32, (len(positions), 3)),
+            "edge_indices": (edge_indices, np.int64, (-1, 2)),
+            "edge_colors": (edge_colors, np.float32, (len(edge_indices), 3)),
+            "face_indices": (face_indices, np.int64, (-1,)),
+            "face_offsets": (face_offsets, np.int64, (-1,)),
+            "face_colors": (face_colors, np.float32, (len(face_offsets) - 1, 3)),
+        }
+        data = cls.__new__(cls)
+        for name, (array, dtype, shape) in arrays.items():
+            # only the types and the shapes are checked, the values are not read
+            if array.dtype != dtype or len(array.shape) != len(shape) or any(
+                size not in (-1, actual) for size, actual in zip(shape, array.shape)
+            ):
+                raise ValueError(f"Array '{name}' has a wrong type or shape")
+            setattr(data, name, array)
+        data.__set_attributes(color, draw_mode, figure_color)
+        data._vertex_views = None
+        data._edge_views = None
+        data._face_views = None
+        return data
+
+    @property
+    def vertices(self):
+        if self._vertex_views is None or len(self._vertex_views) != len(self.positions):
+            self._vertex_views = [
+                Vertex.view(self, index) for index in range(len(self.positions))
+            ]
+        return self._vertex_views
+
+    @property
+    def edges(self):
+        if self._edge_views is None or len(self._edge_views) != len(self.edge_indices):
+            self._edge_views = [
+                Edge.view(self, index) for index in range(len(self.edge_indices))
+            ]
+        return self._edge_views
+
+    @property
+    def faces(self):
+        count = len(self.face_offsets) - 1
+        if self._face_views is None or len(self._face_views) != count:
+            self._face_views = [Face.view(self, index) for index in range(count)]
+        return self._face_views
+
+    @property
+    def model(self):
+        return self._model
+
+    @model.setter
+    def model(self, model):
+        self._model = np.array(model, dtype=np.float64).reshape(4, 4)
+        self._world_positions = None
+        self._world_bounds = None
+
+    @property
+    def world_positions(self):
+        if self._world_positions is None:
+            if np.array_equal(self._model, IDENTITY):
+                world = self.positions.view()
+            else:
+                rotation = self._model[:3, :3].T.astype(np.float32)
+                translation = self._model[:3, 3].astype(np.float32)
+                world = self.positions @ rotation + translation
+            world.flags.writeable = False
+            self._world_positions = world
+        return self._world_positions
+
+    def center(self):
+        if self._center is None:
+            self._center = (
+                self.positions.mean(axis=0, dtype=np.float64)
+                if len(self.positions)
+                else np.zeros(3)
+            )
+        return self._model[:3, :3] @ self._center + self._model[:3, 3]
+
+    def bounds(self):
+        if self._world_bounds is None:
+            local_min, local_max = self.__local_bounds()
+            # the box of the 8 transformed corners of the box in object space
+            corners = np.array(
+                [
+                    [x, y, z]
+                    for x in (local_min[0], local_max[0])
+                    for y in (local_min[1], local_max[1])
+                    for z in (local_min[2], local_max[2])
+                ]
+            )
+            corners = corners @ self._model[:3, :3].T + self._model[:3, 3]
+            self._world_bounds = corners.min(axis=0), corners.max(axis=0)
+        return self._world_bounds
+
+    def bounding_sphere(self):
+        local_min, local_max = self.__local_bounds()
+        center = (local_min + local_max) / 2
+        scale = np.linalg.norm(self._model[:3, :3], axis=0).max()
+        radius = float(np.linalg.norm(local_max - center)) * scale
+        return self._model[:3, :3] @ center + self._model[:3, 3], radius
+
+    def set_world_position(self, index, position):
+        world = np.ones(4)
+        world[:3] = position
+        self.positions[index] = (np.linalg.inv(self._model) @ world)[:3]
+        self.invalidate()
+
+    def invalidate(self):
+        self._world_positions = None
+        self._center = None
+        self._local_bounds = None
+        self._world_bounds = None
+        self.version += 1
+
+    def face(self, index):
+        return self.face_indices[self.face_offsets[index] : self.face_offsets[index + 1]]
+
+    def face_borders(self):
+        return face_borders(self.face_indices, self.face_offsets)
+
+    def copy(self):
+        data = FigureData.from_arrays(
+            self.positions.copy(),
+            self.edge_indices.copy(),
+            self.face_indices.copy(),
+            self.face_offsets.copy(),
+            self.color,
+            self.draw_mode,
+            self.figure_color,
+        )
+        data.model = self.model
+        data.vertex_colors[:] = self.vertex_colors
+        data.edge_colors[:] = self.edge_colors
+        data.face_colors[:] = self.face_colors
+        data.angle = list(self.angle)
+        return data
+
+    def __set_arrays(self, positions, edges, faces):
+        self.positions = np.array(positions, dtype=np.float32).reshape(-1, 3)
+        self.edge_indices = np.array(edges, dtype=np.int64).reshape(-1, 2)
+        counts = [len(face) for face in faces]
+        self.face_offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self.face_indices = (
+            np.concatenate([np.asarray(face, dtype=np.int64) for face in faces])
+            if faces
+            else np.zeros(0, dtype=np.int64)
         )
+        count = len(self.positions)
+        for indices in (self.edge_indices, self.face_indices):
+            if indices.size and (indices.min() < 0 or indices.max() >= count):
+                raise ValueError("Vertex index is out of range")
+
+    def __set_attributes(self, color, draw_mode, figure_color):
+        self._model = IDENTITY.copy()
+        self._world_positions = None
+        self._center = None
+        self._local_bounds = None
+        self._world_bounds = None
+        self.version = 0
         self.color = color
         self.angle = [0, 0, 0]
         self.draw_mode = draw_mode
         self.selected = False
-        self.figure_color = True
+        self.figure_color = figure_color
+
+    def __local_bounds(self):
+        if self._local_bounds is None:
+            if len(self.positions):
+                positions = self.positions.astype(np.float64)
+                self._local_bounds = positions.min(axis=0), positions.max(axis=0)
+            else:
+                self._local_bounds = np.zeros(3), np.zeros(3)
+        return self._local_bounds
+
+    def __views(self, elements, view_class):
+        views = []
+        for index, element in enumerate(elements):
+            if isinstance(element, view_class) and element._figure is None:
+                element._bind(self, index)
+                views.append(element)
+            else:
+                views.append(view_class.view(self, index))
+        return views
+
+    @staticmethod
+    def __corners(element):
+        if isinstance(element, (Edge, Face)):
+            return element.vertices
+        return element
+
+    @staticmethod
+    def __indices(corners, index_of):
+        indices = []
+        for corner in corners:
+            if isinstance(corner, Vertex):
+                if id(corner) not in index_of:
+                    raise ValueError("Vertex is not a vertex of the figure")
+                indices.append(index_of[id(corner)])
+            else:
+                indices.append(int(corner))
+        return indices
+
+    @staticmethod
+    def __colors(colors, count):
+        result = np.zeros((count, 3), dtype=np.float32)
+        if colors:
+            result[:] = [tuple(color)[:3] for color in colors]
+        return result
 
 
 # Cube example
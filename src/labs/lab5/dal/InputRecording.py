@@ -0,0 +1,40 @@
+"""
+Module for saving and opening recordings of lab5 input. A recording is a JSON file
+with the size of the window, the render settings, the scene file the session started
+with and the timestamped events of the session: keyboard and mouse input, executed
+commands, window reshapes and drawn frames.
+"""
+
+import json
+import os
+
+RECORDING_FORMAT = "lab5-input"
+RECORDING_VERSION = 1
+
+
+def save_recording(path, recording):
+    """
+    :param path: Path to the recording (.json).
+    :param recording: Dictionary with the window, scene and events of a session.
+    """
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    content = dict(recording, format=RECORDING_FORMAT, version=RECORDING_VERSION)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(content, file, indent=1)
+
+
+def load_recording(path):
+    """
+    :param path: Path to the recording (.json).
+    :return: Dictionary with the window, scene and events of a session.
+    """
+    with open(path, encoding="utf-8") as file:
+        recording = json.load(file)
+    if recording.get("format") != RECORDING_FORMAT:
+        raise ValueError(f"'{path}' is not an input recording")
+    if recording.get("version") != RECORDING_VERSION:
+        version = recording.get("version")
+        raise ValueError(f"Input recording version {version} is not supported")
+    return recording
@@ -0,0 +1,260 @@
+"""
+Module for generating lab5 figures from parametric surfaces. Every generator builds
+the vertex and face arrays of a figure at the requested resolution without loops
+over the vertices, the edges of the figure are the borders of its faces.
+"""
+
+import numpy as np
+
+from labs.lab5.dal.Figure import FigureData, unique_edges
+
+# resolutions of the levels of detail of every generator, from the coarsest
+LOD_RESOLUTIONS = {
+    "UV sphere": [6, 12, 24, 48, 96],
+    "Icosphere": [0, 1, 2, 3, 4],
+    "Torus": [8, 16, 32, 64, 128],
+    "Cylinder": [6, 12, 24, 48, 96],
+    "Terrain": [8, 16, 32, 64, 128],
+}
+# the 12 vertices and 20 faces of an icosahedron
+GOLDEN_RATIO = (1 + 5**0.5) / 2
+ICOSAHEDRON_VERTICES = [
+    (-1, GOLDEN_RATIO, 0),
+    (1, GOLDEN_RATIO, 0),
+    (-1, -GOLDEN_RATIO, 0),
+    (1, -GOLDEN_RATIO, 0),
+    (0, -1, GOLDEN_RATIO),
+    (0, 1, GOLDEN_RATIO),
+    (0, -1, -GOLDEN_RATIO),
+    (0, 1, -GOLDEN_RATIO),
+    (GOLDEN_RATIO, 0, -1),
+    (GOLDEN_RATIO, 0, 1),
+    (-GOLDEN_RATIO, 0, -1),
+    (-GOLDEN_RATIO, 0, 1),
+]
+ICOSAHEDRON_FACES = [
+    (0, 11, 5),
+    (0, 5, 1),
+    (0, 1, 7),
+    (0, 7, 10),
+    (0, 10, 11),
+    (1, 5, 9),
+    (5, 11, 4),
+    (11, 10, 2),
+    (10, 7, 6),
+    (7, 1, 8),
+    (3, 9, 4),
+    (3, 4, 2),
+    (3, 2, 6),
+    (3, 6, 8),
+    (3, 8, 9),
+    (4, 9, 5),
+    (2, 4, 11),
+    (6, 2, 10),
+    (8, 6, 7),
+    (9, 8, 1),
+]
+
+
+def uv_sphere(segments=24, rings=None, radius=1.0, color=(1, 1, 1), draw_mode="edges"):
+    """
+    :param segments: Number of meridians.
+    :param rings: Number of parallels bands, segments // 2 by default.
+    :param radius: Radius of the sphere.
+    :return: FigureData of a sphere with quads between the parallels and triangles at the poles.
+    """
+    segments = max(int(segments), 3)
+    rings = max(int(rings or segments // 2), 2)
+    theta = np.linspace(0, np.pi, rings + 1)[1:-1]
+    phi = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    theta, phi = np.meshgrid(theta, phi, indexing="ij")
+    ring_positions = np.stack(
+        [np.sin(theta) * np.cos(phi), np.cos(theta), np.sin(theta) * np.sin(phi)], axis=-1
+    )
+    positions = np.concatenate(([(0, 1, 0), (0, -1, 0)], ring_positions.reshape(-1, 3)))
+    grid = 2 + np.arange((rings - 1) * segments).reshape(rings - 1, segments)
+    following = np.roll(grid, -1, axis=1)
+    top = np.stack([np.zeros(segments, np.int64), following[0], grid[0]], axis=1)
+    bottom = np.stack([np.ones(segments, np.int64), grid[-1], following[-1]], axis=1)
+    quads = np.stack([grid[:-1], following[:-1], following[1:], grid[1:]], axis=-1)
+    return _figure(
+        positions * radius,
+        [top, quads.reshape(-1, 4), bottom],
+        color,
+        draw_mode,
+    )
+
+
+def icosphere(subdivisions=2, radius=1.0, color=(1, 1, 1), draw_mode="edges"):
+    """
+    :param subdivisions: Number of times every triangle of an icosahedron is split into 4.
+    :param radius: Radius of the sphere.
+    :return: FigureData of a sphere of equal triangles.
+    """
+    positions = np.array(ICOSAHEDRON_VERTICES, dtype=np.float64)
+    triangles = np.array(ICOSAHEDRON_FACES, dtype=np.int64)
+    for _ in range(int(subdivisions)):
+        count = len(positions)
+        corners = triangles[:, [0, 1, 2]]
+        ends = triangles[:, [1, 2, 0]]
+        # every edge of the mesh gets one middle vertex, shared by its two triangles
+        keys = np.minimum(corners, ends) * count + np.maximum(corners, ends)
+        edge_keys, middle = np.unique(keys.ravel(), return_inverse=True)
+        first, second = edge_keys // count, edge_keys % count
+        positions = np.concatenate((positions, (positions[first] + positions[second]) / 2))
+        middle = count + middle.reshape(-1, 3)
+        a, b, c = triangles.T
+        ab, bc, ca = middle.T
+        triangles = np.concatenate(
+            [
+                np.stack([a, ab, ca], axis=1),
+                np.stack([b, bc, ab], axis=1),
+                np.stack([c, ca, bc], axis=1),
+                np.stack([ab, bc, ca], axis=1),
+            ]
+        )
+    positions /= np.linalg.norm(positions, axis=1, keepdims=True)
+    return _figure(positions * radius, [triangles], color, draw_mode)
+
+
+def torus(
+    segments=32,
+    sides=None,
+    major_radius=1.0,
+    minor_radius=0.4,
+    color=(1, 1, 1),
+    draw_mode="edges",
+):
+    """
+    :param segments: Number of segments around the main ring.
+    :param sides: Number of segments around the tube, segments // 2 by default.
+    :param major_radius: Distance from the center of the torus to the center of the tube.
+    :param minor_radius: Radius of the tube.
+    :return: FigureData of a torus of quads.
+    """
+    segments = max(int(segments), 3)
+    sides = max(int(sides or segments // 2), 3)
+    u = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    v = np.linspace(0, 2 * np.pi, sides, endpoint=False)
+    u, v = np.meshgrid(u, v, indexing="ij")
+    distance = major_radius + minor_radius * np.cos(v)
+    positions = np.stack(
+        [distance * np.cos(u), minor_radius * np.sin(v), distance * np.sin(u)], axis=-1
+    )
+    grid = np.arange(segments * sides).reshape(segments, sides)
+    return _figure(positions.reshape(-1, 3), [_wrapped_quads(grid)], color, draw_mode)
+
+
+def cylinder(
+    segments=24, radius=1.0, height=2.0, caps=True, color=(1, 1, 1), draw_mode="edges"
+):
+    """
+    :param segments: Number of segments around the cylinder.
+    :param radius: Radius of the cylinder.
+    :param height: Height of the cylinder, it is centered at the origin.
+    :param caps: Whether the top and the bottom are closed with one polygon each.
+    :return: FigureData of a cylinder with quad sides.
+    """
+    segments = max(int(segments), 3)
+    angles = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    circle = np.stack([np.cos(angles) * radius, np.sin(angles) * radius], axis=1)
+    positions = np.zeros((2, segments, 3))
+    positions[:, :, 0] = circle[:, 0]
+    positions[:, :, 2] = circle[:, 1]
+    positions[0, :, 1] = height / 2
+    positions[1, :, 1] = -height / 2
+    grid = np.arange(2 * segments).reshape(2, segments)
+    following = np.roll(grid, -1, axis=1)
+    faces = [np.stack([grid[0], following[0], following[1], grid[1]], axis=1)]
+    if caps:
+        faces += [grid[:1], grid[1:, ::-1]]
+    return _figure(positions.reshape(-1, 3), faces, color, draw_mode)
+
+
+def terrain(
+    heights, resolution=None, size=2.0, height_scale=1.0, color=(1, 1, 1), draw_mode="edges"
+):
+    """
+    :param heights: Heightmap (rows x columns), for example the brightness of an image.
+    :param resolution: Number of samples along the longer side, all samples of the heightmap by default.
+    :param size: Length of the longer side of the terrain, it is centered at the origin.
+    :param height_scale: Factor of the heights.
+    :return: FigureData of a grid of quads with the heights along the y axis.
+    """
+    heights = np.asarray(heights, dtype=np.float64)
+    if heights.ndim != 2 or min(heights.shape) < 2:
+        raise ValueError("Heightmap must be a 2D array of at least 2 x 2 values")
+    if resolution:
+        # the heightmap is sampled at evenly spaced rows and columns
+        scale = min(int(resolution), max(heights.shape)) / max(heights.shape)
+        rows = np.linspace(0, heights.shape[0] - 1, max(round(heights.shape[0] * scale), 2))
+        columns = np.linspace(0, heights.shape[1] - 1, max(round(heights.shape[1] * scale), 2))
+        heights = heights[np.round(rows).astype(np.int64)][:, np.round(columns).astype(np.int64)]
+    row_count, column_count = heights.shape
+    step = size / (max(row_count, column_count) - 1)
+    z, x = np.meshgrid(
+        (np.arange(row_count) - (row_count - 1) / 2) * step,
+        (np.arange(column_count) - (column_count - 1) / 2) * step,
+        indexing="ij",
+    )
+    positions = np.stack([x, heights * height_scale, z], axis=-1)
+    grid = np.arange(row_count * column_count).reshape(row_count, column_count)
+    quads = np.stack([grid[:-1, :-1], grid[:-1, 1:], grid[1:, 1:], grid[1:, :-1]], axis=-1)
+    return _figure(positions.reshape(-1, 3), [quads.reshape(-1, 4)], color, draw_mode)
+
+
+def generate(name, resolution=None, **parameters):
+    """
+    :param name: Name of the generator (UV sphere, Icosphere, Torus, Cylinder or Terrain).
+    :param resolution: Segments, subdivisions or samples of the figure, the default of the generator if None.
+    :param parameters: Other parameters of the generator.
+    :return: FigureData of the generated figure.
+    """
+    if name not in GENERATORS:
+        raise ValueError(f"Generator '{name}' does not exist")
+    generator, resolution_parameter = GENERATORS[name]
+    if resolution is not None:
+        parameters[resolution_parameter] = resolution
+    return generator(**parameters)
+
+
+def detail(name, resolution):
+    """
+    :param name: Name of the generator.
+    :param resolution: Resolution of a level of detail.
+    :return: Number of segments across the figure at the resolution.
+    """
+    if name == "Icosphere":
+        # an icosahedron has 5 triangles around a vertex, a subdivision doubles them
+        return 5 * 2 ** int(resolution)
+    return int(resolution)
+
+
+# every generator with the name of its resolution parameter
+GENERATORS = {
+    "UV sphere": (uv_sphere, "segments"),
+    "Icosphere": (icosphere, "subdivisions"),
+    "Torus": (torus, "segments"),
+    "Cylinder": (cylinder, "segments"),
+    "Terrain": (terrain, "resolution"),
+}
+
+
+def _wrapped_quads(grid):
+    right = np.roll(grid, -1, axis=1)
+    down = np.roll(grid, -1, axis=0)
+    diagonal = np.roll(right, -1, axis=0)
+    return np.stack([grid, right, diagonal, down], axis=-1).reshape(-1, 4)
+
+
+def _figure(positions, face_groups, color, draw_mode):
+    face_groups = [np.asarray(faces, dtype=np.int64) for faces in face_groups]
+    face_indices = np.concatenate([faces.ravel() for faces in face_groups])
+    counts = np.concatenate(
+        [np.full(len(faces), faces.shape[1], dtype=np.int64) for faces in face_groups]
+    )
+    face_offsets = np.concatenate(([0], np.cumsum(counts)))
+    edges = unique_edges(face_indices, face_offsets, len(positions))
+    return FigureData.from_arrays(
+        positions, edges, face_indices, face_offsets, color, draw_mode
+    )
@@ -0,0 +1,392 @@
+"""
+Module for importing OBJ, STL (ASCII and binary) and PLY (ASCII and binary) meshes
+as lab5 figures. Text files are parsed in chunks of lines straight into NumPy arrays,
+binary files are read with structured dtypes, no object is created per vertex.
+"""
+
+import re
+from itertools import islice
+from os.path import basename, getsize, splitext
+
+import numpy as np
+
+from labs.lab5.dal.Figure import FigureData, figures, unique_edges
+
+MESH_FORMATS = [".obj", ".stl", ".ply"]
+# lines parsed at once by the text parsers
+CHUNK_LINES = 65536
+STL_HEADER_SIZE = 84
+STL_TRIANGLE = np.dtype(
+    [("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attribute", "<u2")]
+)
+PLY_TYPES = {
+    "char": "i1",
+    "int8": "i1",
+    "uchar": "u1",
+    "uint8": "u1",
+    "short": "i2",
+    "int16": "i2",
+    "ushort": "u2",
+    "uint16": "u2",
+    "int": "i4",
+    "int32": "i4",
+    "uint": "u4",
+    "uint32": "u4",
+    "float": "f4",
+    "float32": "f4",
+    "double": "f8",
+    "float64": "f8",
+}
+PLY_BYTE_ORDERS = {"binary_little_endian": "<", "binary_big_endian": ">"}
+# texture and normal indices of OBJ face corners (1/2/3, 1//3)
+OBJ_CORNER_SUFFIX = re.compile(r"/\S*")
+
+
+def load_mesh(path, color=(1, 1, 1), draw_mode="faces"):
+    """
+    Reads a mesh file, vertices with equal positions are merged and the edges
+    of the figure are the borders of its faces.
+
+    :param path: Path to an .obj, .stl or .ply file.
+    :param color: Color of the figure.
+    :param draw_mode: Drawing mode of the figure (points, edges or faces).
+    :return: FigureData of the mesh.
+    """
+    extension = splitext(path)[1].lower()
+    parsers = {".obj": parse_obj, ".stl": parse_stl, ".ply": parse_ply}
+    if extension not in parsers:
+        raise ValueError(f"Mesh format '{extension}' is not supported.")
+    positions, face_indices, face_offsets, colors = parsers[extension](path)
+    return build_figure(positions, face_indices, face_offsets, colors, color, draw_mode)
+
+
+def register_mesh(path, name=None, color=(1, 1, 1), draw_mode="faces"):
+    """
+    Loads a mesh and adds it to the example figures, an example of the same name is not replaced.
+
+    :param path: Path to an .obj, .stl or .ply file.
+    :param name: Name of the figure, the file name without extension by default.
+    :param color: Color of the figure.
+    :param draw_mode: Drawing mode of the figure (points, edges or faces).
+    :return: Name of the registered figure.
+    """
+    name = name or splitext(basename(path))[0]
+    if name in figures:
+        raise ValueError(f"Figure '{name}' already exists.")
+    figures[name] = load_mesh(path, color, draw_mode)
+    return name
+
+
+def build_figure(
+    positions, face_indices, face_offsets, colors=None, color=(1, 1, 1), draw_mode="faces"
+):
+    """
+    :param positions: Vertex positions (N x 3).
+    :param face_indices: Vertex indices of the face corners, face after face.
+    :param face_offsets: Offsets of the faces in face_indices (F + 1).
+    :param colors: Vertex colors (N x 3) from 0 to 1, or None.
+    :param color: Color of the figure.
+    :param draw_mode: Drawing mode of the figure.
+    :return: FigureData with merged vertices and the face borders as edges.
+    """
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    face_indices = np.asarray(face_indices, dtype=np.int64)
+    if face_indices.size and (face_indices.min() < 0 or face_indices.max() >= len(positions)):
+        raise ValueError("Vertex index is out of range")
+    unique, inverse = merge_vertices(positions)
+    face_indices = inverse[face_indices]
+    data = FigureData.from_arrays(
+        unique,
+        unique_edges(face_indices, face_offsets, len(unique)),
+        face_indices,
+        face_offsets,
+        color,
+        draw_mode,
+    )
+    if colors is not None:
+        data.vertex_colors[inverse] = colors
+    return data
+
+
+def merge_vertices(positions):
+    """
+    :param positions: Vertex positions (N x 3, float32).
+    :return: Positions without repeats and the index of every vertex in them.
+    """
+    # equal floats have equal bits (after -0.0 becomes 0.0), sorting the bits
+    # by columns is several times faster than np.unique(axis=0)
+    bits = (positions + np.float32(0)).view(np.uint32)
+    order = np.lexsort((bits[:, 2], bits[:, 1], bits[:, 0]))
+    sorted_bits = bits[order]
+    first = np.ones(len(positions), dtype=bool)
+    first[1:] = np.any(sorted_bits[1:] != sorted_bits[:-1], axis=1)
+    inverse = np.empty(len(positions), dtype=np.int64)
+    inverse[order] = np.cumsum(first) - 1
+    return positions[order[first]], inverse
+
+
+def parse_obj(path):
+    """
+    Reads the vertices (v) and faces (f) of a Wavefront OBJ file, other lines are skipped.
+
+    :return: Positions, face indices, face offsets and None (no colors).
+    """
+    positions, corners, counts = [], [], []
+    vertex_count = 0
+    with open(path, encoding="utf-8", errors="replace") as file:
+        while True:
+            lines = list(islice(file, CHUNK_LINES))
+            if not lines:
+                break
+            vertex_lines, face_lines, face_bases = [], [], []
+            for line in lines:
+                prefix = line[:2]
+                if prefix in ("v ", "v\t"):
+                    vertex_lines.append(line[2:])
+                elif prefix in ("f ", "f\t"):
+                    face_lines.append(line[2:])
+                    face_bases.append(vertex_count + len(vertex_lines))
+            if vertex_lines:
+                positions.append(parse_rows(vertex_lines, 3))
+                vertex_count += len(vertex_lines)
+            if face_lines:
+                line_counts = np.fromiter(
+                    (len(line.split()) for line in face_lines), np.int64, len(face_lines)
+                )
+                text = OBJ_CORNER_SUFFIX.sub("", " ".join(face_lines))
+                values = np.array(text.split(), dtype=np.int64)
+                # indices start from 1, negative indices count back from the last vertex
+                bases = np.repeat(np.array(face_bases, dtype=np.int64), line_counts)
+                corners.append(np.where(values < 0, bases + values, values - 1))
+                counts.append(line_counts)
+    return _join(positions, corners, counts) + (None,)
+
+
+def parse_stl(path):
+    """
+    Reads the triangles of a binary or an ASCII STL file.
+
+    :return: Positions (3 per triangle), face indices, face offsets and None (no colors).
+    """
+    with open(path, "rb") as file:
+        header = file.read(STL_HEADER_SIZE)
+    if len(header) == STL_HEADER_SIZE:
+        count = int.from_bytes(header[80:], "little")
+        if STL_HEADER_SIZE + count * STL_TRIANGLE.itemsize == getsize(path):
+            triangles = np.fromfile(
+                path, dtype=STL_TRIANGLE, count=count, offset=STL_HEADER_SIZE
+            )
+            return _triangles(triangles["vertices"].reshape(-1, 3))
+    if not header.lstrip().startswith(b"solid"):
+        raise ValueError("File is not an STL mesh")
+    positions = []
+    with open(path, encoding="utf-8", errors="replace") as file:
+        while True:
+            lines = list(islice(file, CHUNK_LINES))
+            if not lines:
+                break
+            vertex_lines = [
+                line.lstrip()[6:] for line in lines if line.lstrip().startswith("vertex")
+            ]
+            if vertex_lines:
+                positions.append(parse_rows(vertex_lines, 3))
+    positions = np.concatenate(positions) if positions else np.zeros((0, 3))
+    if len(positions) % 3:
+        raise ValueError("STL facet must have 3 vertices")
+    return _triangles(positions)
+
+
+def parse_ply(path):
+    """
+    Reads the vertex and face elements of an ASCII or a binary PLY file.
+
+    :return: Positions, face indices, face offsets and vertex colors (red, green, blue) or None.
+    """
+    with open(path, "rb") as file:
+        file_format, elements = _ply_header(file)
+        vertices, faces = None, None
+        for name, count, properties in elements:
+            if vertices is not None and faces is not None:
+                break
+            if file_format == "ascii":
+                rows = _ply_ascii_rows(file, count, properties, name == "face")
+            else:
+                rows = _ply_binary_rows(
+                    file, count, properties, PLY_BYTE_ORDERS[file_format], name == "face"
+                )
+            if name == "vertex":
+                vertices = rows
+            elif name == "face":
+                faces = rows
+    if vertices is None:
+        raise ValueError("PLY file has no vertex element")
+    names = vertices.dtype.names
+    if not {"x", "y", "z"} <= set(names):
+        raise ValueError("PLY vertex must have x, y and z")
+    positions = np.stack([vertices["x"], vertices["y"], vertices["z"]], axis=1)
+    colors = None
+    if {"red", "green", "blue"} <= set(names):
+        colors = np.stack([vertices["red"], vertices["green"], vertices["blue"]], axis=1)
+        colors = colors.astype(np.float32)
+        if vertices.dtype["red"].kind in "iu":
+            colors /= 255
+    corners, counts = faces if faces is not None else (np.zeros(0, np.int64), np.zeros(0, np.int64))
+    return positions, corners, np.concatenate(([0], np.cumsum(counts))), colors
+
+
+def parse_rows(lines, columns):
+    """
+    :param lines: Text lines of numbers separated by whitespace.
+    :param columns: Number of leading columns to keep.
+    :return: Array of the first columns of every line (len(lines) x columns, float64).
+    """
+    widths = np.fromiter((len(line.split()) for line in lines), np.int64, len(lines))
+    width = int(widths[0])
+    if width >= columns and np.all(widths == width):
+        values = " ".join(lines).split()
+        return np.array(values, dtype=np.float64).reshape(-1, width)[:, :columns]
+    rows = [line.split()[:columns] for line in lines]
+    if any(len(row) < columns for row in rows):
+        raise ValueError(f"Line must have at least {columns} numbers")
+    return np.array(rows, dtype=np.float64)
+
+
+def _join(positions, corners, counts):
+    positions = np.concatenate(positions) if positions else np.zeros((0, 3))
+    corners = np.concatenate(corners) if corners else np.zeros(0, np.int64)
+    counts = np.concatenate(counts) if counts else np.zeros(0, np.int64)
+    return positions, corners, np.concatenate(([0], np.cumsum(counts)))
+
+
+def _triangles(positions):
+    indices = np.arange(len(positions), dtype=np.int64)
+    return positions, indices, np.arange(0, len(positions) + 1, 3), None
+
+
+def _ply_header(file):
+    if file.readline().strip() != b"ply":
+        raise ValueError("File is not a PLY mesh")
+    file_format = None
+    elements = []
+    while True:
+        line = file.readline()
+        if not line:
+            raise ValueError("PLY header has no end_header")
+        words = line.decode("ascii", errors="replace").split()
+        if not words or words[0] in ("comment", "obj_info"):
+            continue
+        if words[0] == "end_header":
+            break
+        if words[0] == "format":
+            file_format = words[1] if len(words) > 1 else None
+        elif words[0] == "element":
+            if len(words) != 3 or not words[2].isdigit():
+                raise ValueError(f"Wrong PLY element '{' '.join(words)}'")
+            elements.append((words[1], int(words[2]), []))
+        elif words[0] == "property" and elements:
+            if words[1:2] == ["list"] and len(words) == 5:
+                count_type, index_type = _ply_type(words[2]), _ply_type(words[3])
+                elements[-1][2].append((words[4], "list", count_type, index_type))
+            elif len(words) == 3:
+                elements[-1][2].append((words[2], _ply_type(words[1])))
+            else:
+                raise ValueError(f"Wrong PLY property '{' '.join(words)}'")
+    if file_format != "ascii" and file_format not in PLY_BYTE_ORDERS:
+        raise ValueError(f"PLY format '{file_format}' is not supported.")
+    return file_format, elements
+
+
+def _ply_type(name):
+    if name not in PLY_TYPES:
+        raise ValueError(f"PLY property type '{name}' is not supported.")
+    return PLY_TYPES[name]
+
+
+def _ply_dtype(properties, byte_order):
+    fields = []
+    for property in properties:
+        if property[1] == "list":
+            raise ValueError("PLY list property is only supported in faces")
+        fields.append((property[0], byte_order + property[1]))
+    return np.dtype(fields)
+
+
+def _ply_ascii_rows(file, count, properties, is_face):
+    if not is_face and all(property[1] != "list" for property in properties):
+        dtype = _ply_dtype(properties, "=")
+        chunks = []
+        remaining = count
+        while remaining:
+            lines = [line.decode() for line in islice(file, min(remaining, CHUNK_LINES))]
+            if not lines:
+                raise ValueError("PLY file ends before its elements")
+            rows = parse_rows(lines, len(properties))
+            chunks.append(np.rec.fromarrays(rows.T, dtype=dtype))
+            remaining -= len(lines)
+        return np.concatenate(chunks) if chunks else np.zeros(0, dtype)
+    lines = [line.decode() for line in islice(file, count)]
+    if not is_face:
+        return None
+    # the corner count and the corners are the first values of a face line
+    if lines:
+        rows = parse_rows(lines, 1)
+        corner_count = int(rows[0, 0])
+        if np.all(rows[:, 0] == corner_count):
+            rows = parse_rows(lines, corner_count + 1).astype(np.int64)
+            return rows[:, 1:].ravel(), rows[:, 0]
+    corners, counts = [], []
+    for line in lines:
+        values = line.split()
+        corner_count = int(values[0])
+        corners.extend(values[1 : corner_count + 1])
+        counts.append(corner_count)
+    return np.array(corners, dtype=np.int64), np.array(counts, dtype=np.int64)
+
+
+def _ply_binary_rows(file, count, properties, byte_order, is_face):
+    if not is_face:
+        dtype = _ply_dtype(properties, byte_order)
+        rows = np.fromfile(file, dtype=dtype, count=count)
+        if len(rows) != count:
+            raise ValueError("PLY file ends before its elements")
+        return rows
+    fields = []
+    list_type = None
+    for property in properties:
+        if property[1] == "list":
+            if list_type is not None:
+                raise ValueError("PLY face must have one list property")
+            list_type = (property[0], byte_order + property[2], byte_order + property[3])
+        elif list_type is None:
+            raise ValueError("PLY face list must be the first property")
+        else:
+            fields.append((property[0], byte_order + property[1]))
+    if list_type is None:
+        raise ValueError("PLY face has no vertex list")
+    name, count_type, index_type = list_type
+    start = file.tell()
+    first = np.fromfile(file, dtype=count_type, count=1)
+    file.seek(start)
+    if not count or not len(first):
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+    # usually every face has the same number of corners, so faces have a fixed size
+    corner_count = int(first[0])
+    dtype = np.dtype([("count", count_type), (name, index_type, (corner_count,))] + fields)
+    rows = np.fromfile(file, dtype=dtype, count=count)
+    if len(rows) == count and np.all(rows["count"] == corner_count):
+        return rows[name].astype(np.int64).ravel(), rows["count"].astype(np.int64)
+    file.seek(start)
+    return _ply_binary_faces(file, count, count_type, index_type, fields)
+
+
+def _ply_binary_faces(file, count, count_type, index_type, fields):
+    count_type, index_type = np.dtype(count_type), np.dtype(index_type)
+    rest = np.dtype(fields).itemsize if fields else 0
+    corners, counts = [], []
+    for _ in range(count):
+        corner_count = int(np.frombuffer(file.read(count_type.itemsize), count_type)[0])
+        corners.append(np.frombuffer(file.read(index_type.itemsize * corner_count), index_type))
+        counts.append(corner_count)
+        file.seek(rest, 1)
+    corners = np.concatenate(corners).astype(np.int64) if corners else np.zeros(0, np.int64)
+    return corners, np.array(counts, dtype=np.int64)
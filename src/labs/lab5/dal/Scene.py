@@ -8,6 +8,7 @@ class SceneData:
     Attributes:
         figures (list): A list to store the figures in the scene.
         selected_figure (object): The currently selected figure in the scene.
+        selected_figures (list): The figures selected with a rectangle, selected_figure is the first of them.
         is_rotating (bool): A flag indicating whether rotation is active.
         last_mouse_x (int): X-coordinate of the last mouse position.
         last_mouse_y (int): Y-coordinate of the last mouse position.
@@ -17,11 +18,14 @@ class SceneData:
         alpha (float): Transparency level.
         highlight_color (tuple): RGB values for highlight color.
         highlight_line_width (int): Line width for the highlighted figure.
+        lod_rows (int): Rows of the ASCII grid the scene is shown in, levels of detail are not updated if None.
+        culling (bool): Whether figures outside the view of the camera are skipped.
     """
 
     def __init__(self):
         self.figures = []
         self.selected_figure = None
+        self.selected_figures = []
         self.is_rotating = False
         self.last_mouse_x = 0
         self.last_mouse_y = 0
@@ -31,3 +35,5 @@ class SceneData:
         self.alpha = 0.2
         self.highlight_color = (1, 1, 1)
         self.highlight_line_width = 20
+        self.lod_rows = None
+        self.culling = True
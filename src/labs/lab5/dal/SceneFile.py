@@ -0,0 +1,224 @@
+"""
+Module for saving and opening lab5 scene files. A scene file is a JSON manifest
+(camera, settings, figures with their colors, draw modes and model matrices) next
+to a .npy file with the geometry arrays of all figures one after another. The
+geometry file is opened with np.load(mmap_mode="c"), the arrays of the figures are
+views of the mapped file, so opening a scene reads only the manifest and the pages
+of the arrays are read when they are used. Changes of the arrays are copied on
+write and never change the file.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from labs.lab5.dal.Camera import CameraData
+from labs.lab5.dal.Figure import FigureData
+
+SCENE_FORMAT = "lab5-scene"
+SCENE_VERSION = 1
+# every array starts at a multiple of it in the geometry file
+ALIGNMENT = 64
+FIGURE_ARRAYS = [
+    "positions",
+    "vertex_colors",
+    "edge_indices",
+    "edge_colors",
+    "face_indices",
+    "face_offsets",
+    "face_colors",
+]
+CAMERA_FIELDS = [
+    "position",
+    "target",
+    "up_vector",
+    "pitch",
+    "yaw",
+    "fovy",
+    "aspect",
+    "z_near",
+    "z_far",
+]
+
+
+class ArrayPacker:
+    """
+    ArrayPacker collects the arrays of a scene before they are saved, equal arrays
+    (for example the edges of figures of one example) are saved once.
+
+    Methods:
+        add(array):
+            Returns the number of the array in the geometry file.
+    """
+
+    def __init__(self):
+        self.arrays = []
+        self.numbers = {}
+
+    def add(self, array):
+        array = np.ascontiguousarray(array)
+        digest = hashlib.blake2b(array.view(np.uint8).ravel(), digest_size=16)
+        key = (array.dtype.str, array.shape, digest.hexdigest())
+        if key not in self.numbers:
+            self.numbers[key] = len(self.arrays)
+            self.arrays.append(array)
+        return self.numbers[key]
+
+
+def geometry_path(path):
+    """
+    :param path: Path to the manifest of a scene.
+    :return: Path to the geometry file of the scene.
+    """
+    return os.path.splitext(path)[0] + ".npy"
+
+
+def save_scene_file(path, manifest, arrays):
+    """
+    Writes the manifest and the geometry file. Both files are written next to
+    the old ones and replace them at the end, a scene that is open keeps its
+    mapped geometry.
+
+    :param path: Path to the manifest (.json).
+    :param manifest: JSON data of the scene, arrays are referenced by their numbers.
+    :param arrays: Arrays of the scene, usually ArrayPacker.arrays.
+    """
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    table = []
+    offset = 0
+    for array in arrays:
+        table.append(
+            {"offset": offset, "dtype": array.dtype.str, "shape": list(array.shape)}
+        )
+        offset += -(-array.nbytes // ALIGNMENT) * ALIGNMENT
+    blob_path = geometry_path(path)
+    temporary_blob = blob_path + ".tmp"
+    # an empty file can not be mapped
+    blob = np.lib.format.open_memmap(
+        temporary_blob, mode="w+", dtype=np.uint8, shape=(max(offset, ALIGNMENT),)
+    )
+    for array, entry in zip(arrays, table):
+        data = np.ascontiguousarray(array).view(np.uint8).ravel()
+        blob[entry["offset"] : entry["offset"] + len(data)] = data
+    blob.flush()
+    del blob
+    content = dict(manifest)
+    content.update(
+        format=SCENE_FORMAT,
+        version=SCENE_VERSION,
+        geometry=os.path.basename(blob_path),
+        arrays=table,
+    )
+    temporary_manifest = path + ".tmp"
+    with open(temporary_manifest, "w", encoding="utf-8") as file:
+        json.dump(content, file, indent=2)
+    os.replace(temporary_blob, blob_path)
+    os.replace(temporary_manifest, path)
+
+
+def load_scene_file(path):
+    """
+    :param path: Path to the manifest (.json).
+    :return: The manifest and the list of arrays, views of the mapped geometry file.
+    """
+    with open(path, encoding="utf-8") as file:
+        manifest = json.load(file)
+    if manifest.get("format") != SCENE_FORMAT:
+        raise ValueError(f"'{path}' is not a scene file")
+    if manifest.get("version") != SCENE_VERSION:
+        version = manifest.get("version")
+        raise ValueError(f"Scene file version {version} is not supported")
+    blob_path = os.path.join(os.path.dirname(path), manifest["geometry"])
+    blob = np.load(blob_path, mmap_mode="c")
+    arrays = []
+    for entry in manifest["arrays"]:
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        start = entry["offset"]
+        end = start + count * dtype.itemsize
+        if end > len(blob):
+            raise ValueError(f"Geometry file of '{path}' is too short")
+        # a view of the mapped file without the memmap subclass
+        arrays.append(np.asarray(blob[start:end]).view(dtype).reshape(entry["shape"]))
+    return manifest, arrays
+
+
+def scene_array(arrays, number):
+    """
+    :param arrays: Arrays of the scene file.
+    :param number: Number of an array from the manifest.
+    :return: The array of the number.
+    """
+    if type(number) is not int or not 0 <= number < len(arrays):
+        raise ValueError(f"Scene file has no array {number}")
+    return arrays[number]
+
+
+def figure_entry(data, packer):
+    """
+    :param data: FigureData to save.
+    :param packer: ArrayPacker of the scene.
+    :return: JSON data of the figure.
+    """
+    entry = {name: packer.add(getattr(data, name)) for name in FIGURE_ARRAYS}
+    entry.update(
+        color=[float(value) for value in data.color],
+        draw_mode=data.draw_mode,
+        figure_color=bool(data.figure_color),
+        angle=[float(value) for value in data.angle],
+        model=data.model.tolist(),
+    )
+    return entry
+
+
+def figure_data(entry, arrays, used=None):
+    """
+    :param entry: JSON data of a figure.
+    :param arrays: Arrays of the scene file.
+    :param used: Set of the numbers of arrays that other figures already have, the
+        figure gets copies of them, so changes of one figure do not change another.
+    :return: FigureData with the arrays of the scene file.
+    """
+    used = set() if used is None else used
+    buffers = []
+    for name in FIGURE_ARRAYS:
+        number = entry[name]
+        array = scene_array(arrays, number)
+        buffers.append(array.copy() if number in used else array)
+        used.add(number)
+    data = FigureData.from_buffers(
+        *buffers,
+        color=tuple(entry["color"]),
+        draw_mode=entry["draw_mode"],
+        figure_color=entry["figure_color"],
+    )
+    data.model = entry["model"]
+    data.angle = list(entry["angle"])
+    return data
+
+
+def camera_entry(camera):
+    """
+    :param camera: CameraData to save.
+    :return: JSON data of the camera.
+    """
+    return {
+        name: np.asarray(getattr(camera, name), dtype=np.float64).tolist()
+        for name in CAMERA_FIELDS
+    }
+
+
+def camera_data(entry):
+    """
+    :param entry: JSON data of a camera.
+    :return: CameraData of the scene file.
+    """
+    values = {name: entry[name] for name in CAMERA_FIELDS if name in entry}
+    for name in ("position", "target", "up_vector"):
+        if name in values:
+            values[name] = np.array(values[name], dtype=np.float32)
+    return CameraData(**values)
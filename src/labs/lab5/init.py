@@ -1,3 +1,6 @@
+import logging
+import os
+
 from config.settings_paths import settings_path_lab5
 from labs.lab5.bll.CameraWrapper import Camera
 from labs.lab5.bll.Controller import Controller
@@ -10,6 +13,24 @@ from labs.lab5.ui.Mouse import MouseHandler
 from shared.classes.dict_json import DictJsonDataAccess
 
 
+def set_up_logging(file_path):
+    """
+    Set up logging of the frame reports (render_loop.log_every) into a file.
+    The scene is drawn in place in the terminal, so nothing is logged to the console.
+
+    :param file_path: The path to the log file where log messages should be saved.
+    :return: None
+    """
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    file_handler = logging.FileHandler(file_path)
+    file_handler.setLevel(logging.INFO)
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    file_handler.setFormatter(formatter)
+    logging.basicConfig(level=logging.INFO, handlers=[file_handler])
+
+
 def camera_create():
     """
     :return: A Camera object initialized with default settings from a JSON file.
@@ -46,7 +67,7 @@ def create_scene():
     pyramid.rotate(45, 0, 0)
     pyramid.scale(1.1, 1.5, 0.4)
     pyramid.set_color("Red")
-    sphere = FigureWrapper.create("Sphere")
+    sphere = FigureWrapper.create_procedural("UV sphere")
     sphere.translate(-1, 3, 5)
     sphere.set_color("Blue")
     scene.add_figure(cube)
@@ -74,6 +95,7 @@ def main(settings_path=settings_path_lab5):
     """
     scene = create_scene()
     controller = set_up(scene, settings_path_lab5)
+    set_up_logging(controller.get_logger_path())
     menu = Ascii3DMenu(controller)
     menu.show()
 
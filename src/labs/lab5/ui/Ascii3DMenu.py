@@ -1,5 +1,10 @@
 from labs.lab5.bll.Controller import Controller
-from shared.classes.input import BoolInput, NumberBetweenInput, StringInput
+from shared.classes.input import (
+    BoolInput,
+    NumberBetweenInput,
+    StringInput,
+    VariantsInput,
+)
 from shared.classes.menu_builder import MenuBuilder
 from shared.interfaces.ui_interface import UIInterface
 
@@ -39,6 +44,27 @@ class Ascii3DMenu(UIInterface):
 
         def set_height(self):
             Handles the action of setting the height for the 3D scene. Prompts the user for a height value within a specified range.
+
+        def convert_images(self):
+            Converts an image file or a folder of images (frames) into ASCII art without OpenGL.
+
+        def set_color_mode(self):
+            Handles the action of choosing the color mode of the output (truecolor, 256, 16, mono or palette).
+
+        def set_render_backend(self):
+            Handles the action of choosing the render backend: an OpenGL window or the headless software rasterizer.
+
+        def import_mesh(self):
+            Handles the action of adding an OBJ, STL or PLY mesh file to the scene.
+
+        def save_scene_file(self):
+            Handles the action of saving the figures and the camera of the scene to a scene file.
+
+        def open_scene_file(self):
+            Handles the action of replacing the scene with a saved scene file.
+
+        def record_input(self):
+            Handles the action of specifying a name to record the input of the next scene.
     """
 
     def __init__(self, controller: Controller = None):
@@ -62,6 +88,13 @@ class Ascii3DMenu(UIInterface):
             .add_option("1", "1. Make scene\n", self.make_scene)
             .add_option("2", "2. Specify file to save\n", self.save_scene)
             .add_option("3", "3. Set height\n", self.set_height)
+            .add_option("4", "4. Convert images\n", self.convert_images)
+            .add_option("5", "5. Set color mode\n", self.set_color_mode)
+            .add_option("6", "6. Set render backend\n", self.set_render_backend)
+            .add_option("7", "7. Import mesh\n", self.import_mesh)
+            .add_option("8", "8. Save scene file\n", self.save_scene_file)
+            .add_option("9", "9. Open scene file\n", self.open_scene_file)
+            .add_option("10", "10. Specify file to record input\n", self.record_input)
             .add_stop_options(["0", "Exit", "exit"], "0. Exit")
             .build()
         )
@@ -96,3 +129,86 @@ class Ascii3DMenu(UIInterface):
         except:
             return
         self.controller.set_height(input)
+
+    def convert_images(self):
+        message = "Image file or folder: "
+        limit = 260  # hardcode variable of path length
+        path = StringInput().input(message, [1, limit], "Too long")
+        message = "Folder to save arts (empty to print): "
+        save_folder = input(message).strip() or None
+        try:
+            results = self.controller.convert_images([path], save_folder)
+        except (ValueError, OSError) as e:
+            print(e)
+            return
+        for image_path, arts, error in results:
+            if error:
+                print(f"{image_path}: {error}")
+            elif save_folder:
+                print(f"{image_path}: {len(arts)} frame(s) saved in {save_folder}")
+            else:
+                print(image_path)
+                print("\n\n".join(arts))
+
+    def set_color_mode(self):
+        modes = self.controller.get_color_modes()
+        modes_str = "/".join(modes)
+        message = f"Choose color mode ({modes_str}): "
+        result = VariantsInput().input(message, modes, "Wrong color mode")
+        try:
+            self.controller.set_color_mode(result)
+        except ValueError as e:
+            print(e)
+
+    def set_render_backend(self):
+        backends = self.controller.get_render_backends()
+        backends_str = "/".join(backends)
+        message = f"Choose render backend ({backends_str}): "
+        result = VariantsInput().input(message, backends, "Wrong render backend")
+        try:
+            self.controller.set_render_backend(result)
+        except (ValueError, OSError) as e:
+            print(e)
+
+    def import_mesh(self):
+        message = "Mesh file (.obj, .stl, .ply): "
+        limit = 260  # hardcode variable of path length
+        path = StringInput().input(message, [1, limit], "Too long")
+        try:
+            figure = self.controller.import_mesh(path)
+        except (ValueError, OSError) as e:
+            print(e)
+            return
+        vertex_count = len(figure.data.positions)
+        face_count = len(figure.data.face_offsets) - 1
+        print(f"Added mesh with {vertex_count} vertices and {face_count} faces")
+
+    def save_scene_file(self):
+        message = "Scene name: "
+        limit = 30  # hardcode variable of key length
+        name = StringInput().input(message, [1, limit], "Too long")
+        try:
+            path = self.controller.save_scene_file(name)
+        except (ValueError, OSError) as e:
+            print(e)
+            return
+        print(f"Scene saved in {path}")
+
+    def open_scene_file(self):
+        message = "Scene name: "
+        limit = 30  # hardcode variable of key length
+        name = StringInput().input(message, [1, limit], "Too long")
+        try:
+            path = self.controller.open_scene_file(name)
+        except (ValueError, KeyError, OSError) as e:
+            print(e)
+            return
+        figure_count = len(self.controller.scene.data.figures)
+        print(f"Opened {path} with {figure_count} figures")
+
+    def record_input(self):
+        message = "Recording name: "
+        limit = 30  # hardcode variable of key length
+        name = StringInput().input(message, [1, limit], "Too long")
+        self.controller.set_recording_name(name)
+        print(f"Input of the next scene will be recorded as {name}")
@@ -10,12 +10,18 @@ class KeyboardHandler:
 
         Methods:
 
-            __init__(self, controller=None):
-                Initializes the KeyboardHandler with an optional controller.
+            __init__(self, controller=None, recorder=None):
+                Initializes the KeyboardHandler with an optional controller and InputRecorder.
 
             set_controller(self, controller):
                 Sets the controller that the KeyboardHandler will use for processing key events.
 
+            set_recorder(self, recorder):
+                Sets the InputRecorder that logs the key events passed to the controller.
+
+            record(self, kind, *args):
+                Logs an event with the InputRecorder, does nothing without a recorder.
+
             special_keyboard_up(self, key, x, y):
                 Handles special key up events. Maps the key to a string representation if available, then calls keyboard_up method.
 
@@ -29,12 +35,20 @@ class KeyboardHandler:
                 Processes a key press event. Decodes the key from bytes to a string if necessary, maps the key to a new key if specified, handles key modifiers, and calls the controller's handle_keyboard method.
     """
 
-    def __init__(self, controller=None):
+    def __init__(self, controller=None, recorder=None):
         self.controller = controller
+        self.recorder = recorder
 
     def set_controller(self, controller):
         self.controller = controller
 
+    def set_recorder(self, recorder):
+        self.recorder = recorder
+
+    def record(self, kind, *args):
+        if self.recorder:
+            self.recorder.record(kind, *args)
+
     def special_keyboard_up(self, key, x, y):
         str_key = keys_map.get(key)
         if str_key:
@@ -52,6 +66,7 @@ class KeyboardHandler:
             except UnicodeDecodeError:
                 # can add more languages here
                 return
+        self.record("keyboard_up", key)
         self.controller.handle_keyboard_up(key)
 
     def keyboard(self, key, x, y):
@@ -68,4 +83,5 @@ class KeyboardHandler:
             key = new_key
         if modifiers:
             modifiers = keys_map.get(key)
+        self.record("keyboard", key, modifiers)
         self.controller.handle_keyboard(key, modifiers)
@@ -7,12 +7,18 @@ class MouseHandler:
 
     Methods:
 
-        __init__(controller=None):
-            Initializes the MouseHandler with an optional controller.
+        __init__(controller=None, recorder=None):
+            Initializes the MouseHandler with an optional controller and InputRecorder.
 
         set_controller(controller):
             Sets the controller to delegate mouse events to.
 
+        set_recorder(recorder):
+            Sets the InputRecorder that logs the mouse events passed to the controller.
+
+        record(kind, *args):
+            Logs an event with the InputRecorder, does nothing without a recorder.
+
         mouse(button, state, x, y):
             Handles mouse button events, passing the button, state, and coordinates to the controller.
 
@@ -23,17 +29,28 @@ class MouseHandler:
             Handles mouse motion events, passing the coordinates to the controller.
     """
 
-    def __init__(self, controller=None):
+    def __init__(self, controller=None, recorder=None):
         self.controller = controller
+        self.recorder = recorder
 
     def set_controller(self, controller):
         self.controller = controller
 
+    def set_recorder(self, recorder):
+        self.recorder = recorder
+
+    def record(self, kind, *args):
+        if self.recorder:
+            self.recorder.record(kind, *args)
+
     def mouse(self, button, state, x, y):
+        self.record("mouse", button, state, x, y)
         self.controller.handle_mouse(button, state, x, y)
 
     def wheel(self, wheel, direction, x, y):
+        self.record("wheel", wheel, direction, x, y)
         self.controller.handle_wheel(wheel, direction, x, y)
 
     def motion(self, x, y):
+        self.record("motion", x, y)
         self.controller.handle_motion(x, y)
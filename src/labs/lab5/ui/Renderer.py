@@ -1,8 +1,14 @@
+from contextlib import nullcontext
+
 import numpy as np
 from OpenGL.GL import *
 from OpenGL.GLU import *
 from OpenGL.GLUT import *
-from PIL import Image
+
+from labs.lab5.bll.AsciiMapper import AsciiMapper
+from labs.lab5.bll.ColorQuantizer import ColorQuantizer
+from labs.lab5.bll.SoftwareRasterizer import SoftwareRasterizer, perspective
+from shared.classes.ansi_writer import AnsiWriter
 
 
 class AsciiRenderer:
@@ -11,17 +17,41 @@ class AsciiRenderer:
 
     A class that converts graphical scenes rendered using OpenGL into ASCII art.
 
-    __init__(self, width=None, height=None, ascii_height=None, ascii_chars=None, color_palette=None)
-        Initialize the AsciiRenderer with desired attributes such as width, height, ASCII height, characters for ASCII representation, and an optional color palette.
+    __init__(self, width=None, height=None, ascii_height=None, ascii_chars=None, color_palette=None, color_mode="truecolor")
+        Initialize the AsciiRenderer with desired attributes such as width, height, ASCII height, characters for ASCII representation, an optional color palette and the color mode of the output.
 
     set_ascii_height(self, ascii_height)
         Set the height (number of rows) for the ASCII representation.
 
-    map_pixel_to_ascii(self, gray_value, color_value)
-        Map a pixel's grayscale value to a corresponding ASCII character and apply color using ANSI escape codes.
+    set_color_mode(self, color_mode)
+        Set the color mode of the output: truecolor, 256, 16, mono or palette (the colors of color_palette).
+
+    set_profiler(self, profiler)
+        Set the FrameProfiler that measures the stages of every frame (draw, read, resize, ascii, swap).
+
+    stage(self, name)
+        Context manager that times a stage of the frame with the profiler, does nothing without a profiler.
+
+    read_frame(self)
+        Capture the current OpenGL front buffer as a bottom-up RGB array.
+
+    frame_to_cells(self, frame)
+        Scale a bottom-up RGB frame and return the code points and color ids of its characters (see AsciiMapper.to_cells).
+
+    cells_to_ascii(self, codes, color_ids)
+        Convert code points and color ids into colored ASCII art, escape codes are emitted only when the color changes.
+
+    cell_escapes(self)
+        Return the escape codes of the color ids, None when the ids are packed 0xRRGGBB colors.
+
+    frame_to_ascii(self, frame)
+        Scale a bottom-up RGB frame and convert it into colored ASCII art in one vectorized pass: a brightness lookup table gives the characters and the shared AnsiWriter emits escape codes only when the color changes.
 
     render_to_ascii(self)
-        Capture the current OpenGL framebuffer, process the image to scale and convert it to grayscale, then generate an ASCII art representation of the image with color data.
+        Capture the current OpenGL framebuffer and convert it into ASCII art.
+
+    display_cells(self, scene_draw_callback)
+        Clear the OpenGL buffers, draw the scene using the provided callback function, update the display and return the code points and color ids of the frame.
 
     display(self, scene_draw_callback)
         Clear the OpenGL buffers, draw the scene using the provided callback function, convert the output to ASCII art, and update the display.
@@ -37,56 +67,75 @@ class AsciiRenderer:
         ascii_height=None,
         ascii_chars=None,
         color_palette=None,
+        color_mode="truecolor",
     ):
         self.width = width
         self.height = height
         self.ascii_height = ascii_height
         self.ascii_chars = ascii_chars
         self.color_palette = color_palette
+        self.writer = AnsiWriter()
+        self.mapper = AsciiMapper(ascii_chars, self.writer) if ascii_chars else None
+        self.color_mode = None
+        self.set_color_mode(color_mode)
+        self.profiler = None
 
     def set_ascii_height(self, ascii_height):
         self.ascii_height = ascii_height
 
-    def map_pixel_to_ascii(self, gray_value, color_value):
-        scale = gray_value / 255
-        char = self.ascii_chars[int(scale * (len(self.ascii_chars) - 1))]
-        r, g, b = color_value
-        return f"\033[38;2;{r};{g};{b}m{char}\033[0m"
+    def set_color_mode(self, color_mode):
+        quantizer = ColorQuantizer(color_mode, self.color_palette, self.writer)
+        self.color_mode = color_mode
+        if self.mapper:
+            self.mapper.set_quantizer(quantizer)
 
-    def render_to_ascii(self):
+    def set_profiler(self, profiler):
+        self.profiler = profiler
+
+    def stage(self, name):
+        return self.profiler.stage(name) if self.profiler else nullcontext()
+
+    def read_frame(self):
         glReadBuffer(GL_FRONT)
         pixels = glReadPixels(0, 0, self.width, self.height, GL_RGB, GL_UNSIGNED_BYTE)
-        image = Image.frombytes("RGB", (self.width, self.height), pixels)
-        height_to_width_ratio = 3
-        scaled_height = (
-            self.ascii_height if self.ascii_height else int(self.height * 0.2)
-        )
-        scaled_width = (
-            int(scaled_height * (self.width / self.height) * height_to_width_ratio)
-            if self.height and self.width
-            else int(scaled_height * 3)
-        )
-        image = image.resize((scaled_width, scaled_height), Image.NEAREST)
+        return np.frombuffer(pixels, dtype=np.uint8).reshape(self.height, self.width, 3)
+
+    def frame_to_cells(self, frame):
+        height, width = frame.shape[:2]
+        columns, rows = self.mapper.scaled_size(width, height, self.ascii_height)
+        # the frame is bottom-up like the OpenGL framebuffer, rows are flipped after resizing
+        with self.stage("resize"):
+            small_frame = self.mapper.resize(frame, columns, rows)[::-1]
+        with self.stage("ascii"):
+            return self.mapper.to_cells(small_frame)
 
-        grayscale_image = image.convert("L")
-        color_image = np.array(image)
+    def cells_to_ascii(self, codes, color_ids):
+        return self.mapper.cells_to_ascii(codes, color_ids)
 
-        pixel_data = np.array(grayscale_image)
+    def cell_escapes(self):
+        return self.mapper.cell_escapes()
 
-        ascii_image = []
-        for row, color_row in zip(pixel_data[::-1], color_image[::-1]):
-            ascii_row = "".join(map(self.map_pixel_to_ascii, row, color_row))
-            ascii_image.append(ascii_row)
+    def frame_to_ascii(self, frame):
+        return self.cells_to_ascii(*self.frame_to_cells(frame))
 
-        return "\n".join(ascii_image)
+    def render_to_ascii(self):
+        return self.frame_to_ascii(self.read_frame())
+
+    def display_cells(self, scene_draw_callback):
+        with self.stage("draw"):
+            glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+            glLoadIdentity()
+            scene_draw_callback()
+        # glReadPixels waits until the GPU finishes drawing, so the GPU time is in "read"
+        with self.stage("read"):
+            frame = self.read_frame()
+        cells = self.frame_to_cells(frame)
+        with self.stage("swap"):
+            glutSwapBuffers()
+        return cells
 
     def display(self, scene_draw_callback):
-        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
-        glLoadIdentity()
-        scene_draw_callback()
-        ascii_art = self.render_to_ascii()
-        glutSwapBuffers()
-        return ascii_art
+        return self.cells_to_ascii(*self.display_cells(scene_draw_callback))
 
     def reshape(self, width, height, fov, aspect, z_near, z_far):
         if height < 70:
@@ -99,3 +148,54 @@ class AsciiRenderer:
         glLoadIdentity()
         gluPerspective(fov, aspect, z_near, z_far)
         glMatrixMode(GL_MODELVIEW)
+
+
+class SoftwareAsciiRenderer(AsciiRenderer):
+    """
+    SoftwareAsciiRenderer:
+
+    An AsciiRenderer that draws scenes with the NumPy SoftwareRasterizer instead of OpenGL, so scenes are rendered without a window or a display.
+
+    __init__(self, width=None, height=None, ascii_height=None, ascii_chars=None, color_palette=None, color_mode="truecolor")
+        Initialize the renderer and a rasterizer with a framebuffer of the window size.
+
+    read_frame(self)
+        Return the bottom-up RGB framebuffer of the rasterizer.
+
+    display_cells(self, scene_draw_callback)
+        Clear the framebuffer, draw the scene with the callback that receives the rasterizer and return the code points and color ids of the frame.
+
+    reshape(self, width, height, fov, aspect, z_near, z_far)
+        Resize the framebuffer, the projection is taken from the scene camera on every draw.
+    """
+
+    def __init__(
+        self,
+        width=None,
+        height=None,
+        ascii_height=None,
+        ascii_chars=None,
+        color_palette=None,
+        color_mode="truecolor",
+    ):
+        super().__init__(
+            width, height, ascii_height, ascii_chars, color_palette, color_mode
+        )
+        self.rasterizer = SoftwareRasterizer(width, height)
+
+    def read_frame(self):
+        return self.rasterizer.frame
+
+    def display_cells(self, scene_draw_callback):
+        with self.stage("draw"):
+            self.rasterizer.clear()
+            scene_draw_callback(self.rasterizer)
+        with self.stage("read"):
+            frame = self.read_frame()
+        return self.frame_to_cells(frame)
+
+    def reshape(self, width, height, fov, aspect, z_near, z_far):
+        self.width = width
+        self.height = max(height, 1)
+        self.rasterizer.resize(self.width, self.height)
+        self.rasterizer.set_projection(perspective(fov, aspect, z_near, z_far))
@@ -1,9 +1,8 @@
-import re
-
 from colorama import Fore, Style, init
 from tabulate import tabulate
 
 from labs.lab7.bll.ItemExtraction import extract_data_items
+from shared.services.ansi_escape import strip_ansi
 
 init(autoreset=True)
 
@@ -77,8 +76,7 @@ class DataStyler:
 
     @staticmethod
     def remove_styles(styled_text):
-        ansi_escape_pattern = re.compile(r"\x1B[@-_][0-?]*[ -/]*[@-~]")
-        return ansi_escape_pattern.sub("", styled_text)
+        return strip_ansi(styled_text)
 
     def get_available_fore_colors(self):
         return list(self.fore_colors.keys())
@@ -0,0 +1,166 @@
+"""
+This module provides the AnsiWriter class which builds colored terminal output
+with ANSI escape codes. Escape codes are emitted only when the color changes
+(run-length coloring) and every escape string is built once and cached.
+"""
+
+import numpy as np
+
+RESET = "\x1b[0m"
+MAX_CACHED_ESCAPES = 4096
+
+
+class AnsiWriter:
+    """
+    AnsiWriter builds colored strings for whole texts, spans and single cells.
+
+    A color can be a name from the color map, an (r, g, b) sequence for
+    24-bit colors or None for the default terminal color.
+
+    Methods:
+        __init__(color_map=None):
+            Initializes the writer with a mapping of color names to escape codes.
+
+        escape(color):
+            Returns the cached escape code for the color.
+
+        paint(text, color):
+            Paints the whole text with one color.
+
+        paint_spans(spans):
+            Paints (text, color) spans, merging neighbour spans with equal colors.
+
+        paint_cells(chars, colors):
+            Paints every character with its own color.
+
+        paint_rows(rows, rows_colors):
+            Paints rows of cells and joins them with line breaks.
+
+        paint_frame(codes, colors):
+            Paints a frame of code points with (r, g, b) colors of every cell.
+
+        paint_packed(codes, packed):
+            Paints a frame of code points with colors packed into integers 0xRRGGBB.
+
+        paint_codes(codes, color_ids, escapes):
+            Paints a frame of code points with color ids and their escape codes.
+
+        runs(colors):
+            Splits per-cell colors into (start, end, color) runs.
+    """
+
+    def __init__(self, color_map=None):
+        self.color_map = color_map if color_map else {}
+        self._escapes = {}
+
+    def escape(self, color):
+        key = color if color is None or isinstance(color, str) else tuple(color)
+        escape = self._escapes.get(key)
+        if escape is not None:
+            return escape
+        if key is None:
+            escape = ""
+        elif isinstance(key, str):
+            if key not in self.color_map:
+                raise ValueError(f"Color '{key}' is not supported.")
+            escape = self.color_map[key]
+        else:
+            r, g, b = key
+            escape = f"\x1b[38;2;{int(r)};{int(g)};{int(b)}m"
+        if len(self._escapes) >= MAX_CACHED_ESCAPES:
+            self._escapes.clear()
+        self._escapes[key] = escape
+        return escape
+
+    def paint(self, text, color):
+        return f"{self.escape(color)}{text}{RESET}"
+
+    def paint_spans(self, spans):
+        parts = []
+        current = ""
+        for text, color in spans:
+            if not text:
+                continue
+            escape = self.escape(color)
+            if escape != current:
+                parts.append(escape if escape else RESET)
+                current = escape
+            parts.append(text)
+        parts.append(RESET)
+        return "".join(parts)
+
+    def paint_cells(self, chars, colors):
+        return self.paint_rows([chars], [colors])
+
+    def paint_rows(self, rows, rows_colors):
+        parts = []
+        current = ""
+        for row_index, (chars, colors) in enumerate(zip(rows, rows_colors)):
+            if row_index:
+                parts.append("\n")
+            for start, end, color in self.runs(colors):
+                escape = self.escape(color)
+                if escape != current:
+                    parts.append(escape if escape else RESET)
+                    current = escape
+                parts.append("".join(chars[start:end]))
+        parts.append(RESET)
+        return "".join(parts)
+
+    def paint_frame(self, codes, colors):
+        colors = np.asarray(colors, dtype=np.int64)
+        packed = (colors[..., 0] << 16) | (colors[..., 1] << 8) | colors[..., 2]
+        return self.paint_packed(codes, packed)
+
+    def paint_packed(self, codes, packed):
+        flat = np.asarray(packed, dtype=np.int64).ravel()
+        is_start = np.ones(flat.shape, dtype=bool)
+        is_start[1:] = flat[1:] != flat[:-1]
+        # escapes are built only for colors that start a run
+        unique, inverse = np.unique(flat[is_start], return_inverse=True)
+        escapes = [
+            self.escape(((color >> 16) & 255, (color >> 8) & 255, color & 255))
+            for color in unique.tolist()
+        ]
+        return self.__paint_starts(codes, is_start, np.array(escapes, dtype=object)[inverse])
+
+    def paint_codes(self, codes, color_ids, escapes):
+        flat = np.asarray(color_ids).ravel()
+        is_start = np.ones(flat.shape, dtype=bool)
+        is_start[1:] = flat[1:] != flat[:-1]
+        escapes = np.asarray(escapes, dtype=object)
+        return self.__paint_starts(codes, is_start, escapes[flat[is_start]])
+
+    @staticmethod
+    def __paint_starts(codes, is_start, start_escapes):
+        codes = np.ascontiguousarray(codes, dtype=np.uint32)
+        height, width = codes.shape
+        if not codes.size:
+            return "\n".join([""] * height)
+        # every cell becomes its char, run starts are prefixed with the escape
+        # and the last cell of a row gets the line break
+        cells = codes.reshape(-1).view("<U1").astype(object)
+        cells[is_start] = start_escapes + cells[is_start]
+        cells[width - 1 : -1 : width] += "\n"
+        return "".join(cells.tolist()) + RESET
+
+    @staticmethod
+    def runs(colors):
+        if getattr(colors, "ndim", 1) == 2:
+            # NumPy array of colors, run borders are found in one vectorized pass
+            if not len(colors):
+                return []
+            changes = (colors[1:] != colors[:-1]).any(axis=1).nonzero()[0] + 1
+            starts = [0] + changes.tolist()
+            ends = starts[1:] + [len(colors)]
+            return [
+                (start, end, tuple(colors[start].tolist()))
+                for start, end in zip(starts, ends)
+            ]
+        result = []
+        start = 0
+        for index in range(1, len(colors) + 1):
+            if index == len(colors) or colors[index] != colors[start]:
+                result.append((start, index, colors[start]))
+                start = index
+        return result
@@ -0,0 +1,186 @@
+"""
+This module provides the TerminalScreen class which keeps the last frame shown
+in the terminal and writes only the cells that changed since then, using
+cursor-addressed ANSI output (frame diffing).
+"""
+
+import sys
+
+import numpy as np
+
+from shared.classes.ansi_writer import RESET, AnsiWriter
+
+HIDE_CURSOR = "\x1b[?25l"
+SHOW_CURSOR = "\x1b[?25h"
+CLEAR_SCREEN = "\x1b[2J"
+# unchanged cells between two changed runs are rewritten instead of moving the
+# cursor when the gap is shorter than a cursor move escape
+MERGE_GAP = 6
+DEFAULT_COLOR = -1
+
+
+def text_to_codes(rows, width=None):
+    """
+    Converts rows of text into an array of unicode code points.
+
+    :param rows: Rows of text, shorter rows are padded with spaces.
+    :param width: Width of the array, the longest row by default.
+    :return: Array of uint32 code points (rows x width).
+    """
+    if width is None:
+        width = max((len(row) for row in rows), default=0)
+    if width == 0:
+        return np.zeros((len(rows), 0), dtype=np.uint32)
+    padded = np.array([row[:width].ljust(width) for row in rows], dtype=f"<U{width}")
+    return padded.view(np.uint32).reshape(len(rows), width)
+
+
+def pack_rgb(colors):
+    """
+    :param colors: Array of (r, g, b) colors with the color in the last axis.
+    :return: Array of colors packed into integers 0xRRGGBB.
+    """
+    colors = np.asarray(colors, dtype=np.int64)
+    return (colors[..., 0] << 16) | (colors[..., 1] << 8) | colors[..., 2]
+
+
+class TerminalScreen:
+    """
+    TerminalScreen draws frames of characters at a fixed place of the terminal.
+
+    The previous frame is kept as arrays of code points and color ids, a new
+    frame is compared with it cell by cell and only runs of changed cells are
+    written after a cursor move escape, neighbour runs are merged when the gap
+    between them is short.
+
+    A color id is an index of the escapes if escape codes are given, an index
+    of the palette if a palette is given, otherwise it is a packed 0xRRGGBB
+    color, DEFAULT_COLOR (-1) is the terminal default.
+    Colors can be one id for the whole frame or an array of ids per cell.
+
+    Methods:
+        __init__(height, width, writer=None, palette=None, origin=(1, 1), stream=None, escapes=None):
+            Initializes an empty screen of the given size.
+
+        diff(chars, colors=None):
+            Returns the ANSI output that turns the previous frame into the new one.
+
+        draw(chars, colors=None):
+            Writes the difference into the stream, returns the number of written characters.
+
+        invalidate():
+            Forgets the previous frame, the next frame is written whole.
+
+        begin() / end():
+            Hides the cursor and clears the screen / restores the cursor below the frame.
+    """
+
+    def __init__(
+        self,
+        height,
+        width,
+        writer=None,
+        palette=None,
+        origin=(1, 1),
+        stream=None,
+        escapes=None,
+    ):
+        self.height = height
+        self.width = width
+        self.writer = writer if writer else AnsiWriter()
+        self.palette = palette
+        self.escapes = escapes
+        self.origin = origin
+        self.stream = stream if stream else sys.stdout
+        self._chars = None
+        self._colors = None
+        self.stats = {"frames": 0, "cells": 0, "bytes": 0}
+
+    def invalidate(self):
+        self._chars = None
+        self._colors = None
+
+    def diff(self, chars, colors=None):
+        chars = self.__fit(np.asarray(chars, dtype=np.uint32), 0x20)
+        if colors is None:
+            colors = DEFAULT_COLOR
+        colors = np.asarray(colors, dtype=np.int64)
+        if colors.ndim == 0:
+            colors = np.full(chars.shape, colors, dtype=np.int64)
+        colors = self.__fit(colors, DEFAULT_COLOR)
+        if self._chars is None:
+            changed = np.ones(chars.shape, dtype=bool)
+        else:
+            changed = (chars != self._chars) | (colors != self._colors)
+        self._chars = chars
+        self._colors = colors
+        self.stats["frames"] += 1
+        if not changed.any():
+            return ""
+        rows = chars.view(f"<U{self.width}").ravel()
+        top, left = self.origin
+        parts = []
+        current = None
+        for row in np.flatnonzero(changed.any(axis=1)):
+            for start, end in self.__row_runs(changed[row]):
+                parts.append(f"\x1b[{top + row};{left + start}H")
+                row_colors = colors[row, start:end]
+                borders = np.flatnonzero(row_colors[1:] != row_colors[:-1]) + 1
+                for span_start, span_end in zip(
+                    [0, *borders.tolist()], [*borders.tolist(), end - start]
+                ):
+                    color = int(row_colors[span_start])
+                    if color != current:
+                        parts.append(RESET + self.__escape(color))
+                        current = color
+                    parts.append(rows[row][start + span_start : start + span_end])
+                self.stats["cells"] += end - start
+        parts.append(RESET)
+        return "".join(parts)
+
+    def draw(self, chars, colors=None):
+        output = self.diff(chars, colors)
+        if output:
+            self.stream.write(output)
+            self.stream.flush()
+        self.stats["bytes"] += len(output)
+        return len(output)
+
+    def begin(self):
+        self.invalidate()
+        self.stream.write(HIDE_CURSOR + CLEAR_SCREEN)
+        self.stream.flush()
+
+    def end(self):
+        top, _ = self.origin
+        self.stream.write(f"{RESET}\x1b[{top + self.height};1H{SHOW_CURSOR}\n")
+        self.stream.flush()
+
+    def __escape(self, color):
+        if color == DEFAULT_COLOR:
+            return ""
+        if self.escapes is not None:
+            return self.escapes[color]
+        if self.palette is not None:
+            return self.writer.escape(self.palette[color])
+        return self.writer.escape(((color >> 16) & 255, (color >> 8) & 255, color & 255))
+
+    def __fit(self, array, fill):
+        if array.shape == (self.height, self.width):
+            return np.ascontiguousarray(array)
+        fitted = np.full((self.height, self.width), fill, dtype=array.dtype)
+        height = min(self.height, array.shape[0])
+        width = min(self.width, array.shape[1]) if array.ndim == 2 else 0
+        fitted[:height, :width] = array[:height, :width]
+        return fitted
+
+    @staticmethod
+    def __row_runs(changed_row):
+        edges = np.diff(np.concatenate(([0], changed_row.view(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        if len(starts) > 1:
+            keep = np.concatenate(([True], starts[1:] - ends[:-1] > MERGE_GAP))
+            starts = starts[keep]
+            ends = np.concatenate((ends[:-1][keep[1:]], ends[-1:]))
+        return zip(starts.tolist(), ends.tolist())
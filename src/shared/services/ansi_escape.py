@@ -0,0 +1,109 @@
+"""
+This module provides fast removal of ANSI escape sequences from text.
+
+Patterns are precompiled once for str and bytes and cover the ECMA-48 grammar:
+CSI sequences (colors, cursor moves), OSC strings (window titles, links)
+terminated by BEL or ST, DCS/SOS/PM/APC strings and the two-character escapes.
+The AnsiStripper class strips streamed chunks, keeping an escape sequence that
+is split between chunks until it is complete.
+"""
+
+import re
+
+ESC = "\x1b"
+
+_COMPLETE = (
+    r"\x1b(?:"
+    r"\[[0-?]*[ -/]*[@-~]"  # CSI: parameters, intermediates, final byte
+    r"|\][^\x07\x1b]*(?:\x07|\x1b\\)"  # OSC terminated by BEL or ST
+    r"|[PX^_][^\x1b]*\x1b\\"  # DCS, SOS, PM and APC terminated by ST
+    r"|[ -/]*[0-~]"  # nF, Fp, Fe and Fs escapes
+    r")"
+)
+_PARTIAL_TAIL = (
+    r"\x1b(?:"
+    r"\[[0-?]*[ -/]*"
+    r"|\][^\x07\x1b]*\x1b?"
+    r"|[PX^_][^\x1b]*\x1b?"
+    r"|[ -/]*"
+    r")\Z"
+)
+
+_CSI = r"\x1b\[[0-?]*[ -/]*[@-~]"
+
+ANSI_ESCAPE_PATTERN = re.compile(_COMPLETE + r"|\x9b[0-?]*[ -/]*[@-~]")
+ANSI_ESCAPE_BYTES_PATTERN = re.compile(_COMPLETE.encode("ascii"))
+CSI_PATTERN = re.compile(_CSI)
+CSI_BYTES_PATTERN = re.compile(_CSI.encode("ascii"))
+PARTIAL_ESCAPE_PATTERN = re.compile(_PARTIAL_TAIL)
+PARTIAL_ESCAPE_BYTES_PATTERN = re.compile(_PARTIAL_TAIL.encode("ascii"))
+
+
+def strip_ansi(data):
+    """
+    Removes all ANSI escape sequences from the data.
+
+    CSI sequences are by far the most common ones, so they are removed first
+    with a simple pattern and the full grammar runs only if escapes remain.
+
+    :param data: Text as str or bytes.
+    :return: The data of the same type without escape sequences.
+    """
+    if isinstance(data, str):
+        data = CSI_PATTERN.sub("", data)
+        if ESC not in data and "\x9b" not in data:
+            return data
+        return ANSI_ESCAPE_PATTERN.sub("", data)
+    data = CSI_BYTES_PATTERN.sub(b"", data)
+    if b"\x1b" not in data:
+        return data
+    return ANSI_ESCAPE_BYTES_PATTERN.sub(b"", data)
+
+
+class AnsiStripper:
+    """
+    Streaming ANSI escape stripper.
+
+    Methods:
+        feed(chunk):
+            Strips the chunk and returns the text that is complete so far.
+
+        flush():
+            Returns the rest of the stream, an unfinished escape sequence is dropped.
+    """
+
+    def __init__(self):
+        self._pending = None
+        self._empty = ""
+
+    def feed(self, chunk):
+        data = self._pending + chunk if self._pending else chunk
+        self._pending = None
+        self._empty = data[:0]
+        tail_start = self.__partial_tail_start(data)
+        if tail_start is not None:
+            self._pending = data[tail_start:]
+            data = data[:tail_start]
+        return strip_ansi(data)
+
+    def flush(self):
+        self._pending = None
+        return self._empty
+
+    @staticmethod
+    def __partial_tail_start(data):
+        # an unfinished sequence holds at most one more ESC (the start of ST),
+        # so only the two last ESC positions can begin it
+        if isinstance(data, str):
+            esc, partial = ESC, PARTIAL_ESCAPE_PATTERN
+        else:
+            esc, partial = b"\x1b", PARTIAL_ESCAPE_BYTES_PATTERN
+        last = data.rfind(esc)
+        if last == -1:
+            return None
+        previous = data.rfind(esc, 0, last)
+        if previous != -1 and partial.match(data, previous):
+            return previous
+        if partial.match(data, last):
+            return last
+        return None
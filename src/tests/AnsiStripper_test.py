@@ -0,0 +1,43 @@
+import unittest
+
+from shared.services.ansi_escape import AnsiStripper, strip_ansi
+
+
+class TestAnsiStripper(unittest.TestCase):
+    """
+    Unit tests for strip_ansi and the streaming AnsiStripper.
+    """
+
+    def test_strip_colors(self):
+        text = "\x1b[38;2;255;0;0m@\x1b[0m\x1b[1;31mred\x1b[0m plain"
+        self.assertEqual(strip_ansi(text), "@red plain")
+
+    def test_strip_cursor_and_osc(self):
+        text = "\x1b[2J\x1b[10;5Htitle\x1b]0;window\x07 and\x1b]8;;link\x1b\\ end\x1b7"
+        self.assertEqual(strip_ansi(text), "title and end")
+
+    def test_strip_bytes(self):
+        data = b"\x1b[32mgreen\x1b[0m \xd0\x9f"
+        self.assertEqual(strip_ansi(data), b"green \xd0\x9f")
+
+    def test_text_without_escapes_unchanged(self):
+        text = "no colors [here] m"
+        self.assertIs(strip_ansi(text), text)
+
+    def test_stream_split_sequences(self):
+        text = "\x1b[38;2;1;2;3mab\x1b[0mcd\x1b]0;title\x1b\\ef\x1b[1m"
+        for size in range(1, 8):
+            stripper = AnsiStripper()
+            chunks = [text[i : i + size] for i in range(0, len(text), size)]
+            result = "".join(stripper.feed(chunk) for chunk in chunks)
+            result += stripper.flush()
+            self.assertEqual(result, "abcdef", f"chunk size {size}")
+
+    def test_stream_bytes(self):
+        stripper = AnsiStripper()
+        result = stripper.feed(b"a\x1b[3") + stripper.feed(b"1mb") + stripper.flush()
+        self.assertEqual(result, b"ab")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+
+from shared.classes.ansi_writer import RESET, AnsiWriter
+from shared.classes.terminal_screen import text_to_codes
+
+
+class TestAnsiWriter(unittest.TestCase):
+    """
+    Unit tests for run-length painting of rows and whole frames.
+    """
+
+    def setUp(self):
+        self.writer = AnsiWriter()
+        rng = np.random.default_rng(0)
+        self.rows = ["".join(rng.choice(list("@#%.:"), 30)) for _ in range(6)]
+        self.colors = rng.integers(0, 2, (6, 30, 3)) * 255
+
+    def test_frame_is_same_as_rows(self):
+        codes = text_to_codes(self.rows)
+        self.assertEqual(
+            self.writer.paint_frame(codes, self.colors),
+            self.writer.paint_rows(self.rows, self.colors),
+        )
+
+    def test_escape_only_on_color_change(self):
+        codes = text_to_codes(["ab", "cd"])
+        colors = np.zeros((2, 2, 3), dtype=int)
+        colors[1, 1] = (255, 0, 0)
+        painted = self.writer.paint_frame(codes, colors)
+        self.assertEqual(
+            painted, "\x1b[38;2;0;0;0mab\nc\x1b[38;2;255;0;0md" + RESET
+        )
+
+    def test_codes_with_palette(self):
+        codes = text_to_codes(["abc"])
+        painted = self.writer.paint_codes(codes, [[0, 0, 1]], ["<0>", "<1>"])
+        self.assertEqual(painted, "<0>ab<1>c" + RESET)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from labs.lab3.bll.ColoramaPainter import ColoramaPainter
+from labs.lab3.ui.AsciiHttpServer import AsciiHttpServer
+from shared.classes.ascii_generator import AsciiGenerator
+
+SETTINGS = {"font": "block", "width": 40, "alignment": "left", "max_width": 100}
+
+
+class SlowGenerator(AsciiGenerator):
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate(self, data, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.05)
+        return f"{kwargs['font']}:{data.upper()}"
+
+    def is_font_break_lines(self, font):
+        return True
+
+    def get_fonts(self):
+        return ["block", "thin"]
+
+    def get_font_char_height(self, font):
+        return 1
+
+    def get_font_char_width(self, font):
+        return 1
+
+
+class TestAsciiHttpServer(unittest.TestCase):
+    """
+    Unit tests for the asyncio ASCII art HTTP service.
+    """
+
+    def setUp(self):
+        self.generator = SlowGenerator()
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.server = AsciiHttpServer(
+            self.generator,
+            ColoramaPainter(),
+            port=0,
+            executor=self.executor,
+            settings=SETTINGS,
+        )
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    async def request(self, target, headers=""):
+        reader, writer = await asyncio.open_connection(self.server.host, self.server.port)
+        writer.write(
+            f"GET {target} HTTP/1.1\r\nHost: test\r\n{headers}Connection: close\r\n\r\n".encode()
+        )
+        response = await reader.read()
+        writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        lines = head.decode().split("\r\n")
+        status = int(lines[0].split()[1])
+        headers = dict(line.split(": ", 1) for line in lines[1:])
+        return status, headers, body.decode()
+
+    def run_with_server(self, scenario):
+        async def main():
+            await self.server.start()
+            try:
+                return await scenario()
+            finally:
+                self.server.close()
+
+        return asyncio.run(main())
+
+    def test_render_and_etag(self):
+        async def scenario():
+            first = await self.request("/render?text=hi&width=20")
+            etag = first[1]["ETag"]
+            second = await self.request(
+                "/render?text=hi&width=20", f"If-None-Match: {etag}\r\n"
+            )
+            return first, second
+
+        (status, headers, body), (cached_status, _, cached_body) = self.run_with_server(
+            scenario
+        )
+        self.assertEqual(status, 200)
+        self.assertEqual(body, "block:HI" + " " * 11)
+        self.assertEqual(cached_status, 304)
+        self.assertEqual(cached_body, "")
+        self.assertEqual(self.generator.calls, 1)
+        self.assertEqual(self.server.stats["hits"], 1)
+
+    def test_identical_requests_are_coalesced(self):
+        async def scenario():
+            return await asyncio.gather(
+                *(self.request("/render?text=same&font=thin") for _ in range(5))
+            )
+
+        responses = self.run_with_server(scenario)
+        self.assertEqual({body for _, _, body in responses}, {"thin:SAME" + " " * 30})
+        self.assertEqual(self.generator.calls, 1)
+        self.assertEqual(self.server.stats["coalesced"], 4)
+
+    def test_bad_parameters(self):
+        async def scenario():
+            return [
+                await self.request(target)
+                for target in (
+                    "/render",
+                    "/render?text=a&font=missing",
+                    "/render?text=a&width=1000",
+                    "/render?text=a&color=purple",
+                    "/other?text=a",
+                )
+            ]
+
+        statuses = [status for status, _, _ in self.run_with_server(scenario)]
+        self.assertEqual(statuses, [400, 400, 400, 400, 404])
+        self.assertEqual(self.generator.calls, 0)
+
+    def test_cancelled_leading_render(self):
+        async def scenario():
+            params = ("again", "block", 20, "left", None)
+            leader = asyncio.create_task(self.server.render(*params))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.create_task(self.server.render(*params))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            # the waiter renders the art itself instead of waiting forever
+            _, body = await asyncio.wait_for(waiter, 1)
+            return leader, body
+
+        leader, body = self.run_with_server(scenario)
+        self.assertTrue(leader.cancelled())
+        self.assertEqual(body.decode(), "block:AGAIN" + " " * 8)
+        self.assertEqual(self.generator.calls, 2)
+        self.assertEqual(self.server.stats["coalesced"], 1)
+
+    def test_too_long_line(self):
+        async def scenario():
+            return await self.request("/render?text=" + "a" * 70000)
+
+        status, headers, _ = self.run_with_server(scenario)
+        self.assertEqual(status, 400)
+        self.assertEqual(headers["Connection"], "close")
+
+    def test_post_body_is_skipped(self):
+        async def scenario():
+            reader, writer = await asyncio.open_connection(
+                self.server.host, self.server.port
+            )
+            writer.write(
+                b"POST /render HTTP/1.1\r\nHost: test\r\nContent-Length: 11\r\n\r\n"
+                b"text=ignore"
+                b"GET /render?text=hi&width=20 HTTP/1.1\r\nHost: test\r\n"
+                b"Connection: close\r\n\r\n"
+            )
+            response = await reader.read()
+            writer.close()
+            return response.decode()
+
+        response = self.run_with_server(scenario)
+        self.assertIn("HTTP/1.1 405", response)
+        self.assertIn("HTTP/1.1 200", response)
+        self.assertTrue(response.endswith("block:HI" + " " * 11))
+
+
+if __name__ == "__main__":
+    unittest.main()
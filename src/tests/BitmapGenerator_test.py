@@ -0,0 +1,46 @@
+import unittest
+
+from labs.lab4.bll.BitmapGenerator import BitmapGenerator
+from labs.lab4.bll.CustomGenerator import CustomGenerator
+
+
+class TestBitmapGenerator(unittest.TestCase):
+    """
+    Unit tests for the NumPy glyph engine, checked against CustomGenerator output.
+    """
+
+    def test_same_as_custom_generator(self):
+        for font in ["cap", "oleh_cap"]:
+            for width in [30, 80, 200]:
+                text = "Hello, world 2024! ~"
+                self.assertEqual(
+                    BitmapGenerator.generate(text, font=font, width=width),
+                    CustomGenerator.generate(text, font=font, width=width),
+                )
+
+    def test_symbols_mapping(self):
+        art = BitmapGenerator.generate(
+            "-", font="cap", bright_symbol="#", empty_symbol="."
+        )
+        self.assertEqual(set(art) - {"\n"}, {"#", "."})
+        self.assertEqual(
+            art.replace("#", "@").replace(".", " "),
+            CustomGenerator.generate("-", font="cap"),
+        )
+
+    def test_scale(self):
+        art = BitmapGenerator.generate("ab", font="cap", width=80).splitlines()
+        scaled = BitmapGenerator.generate("ab", font="cap", width=80, scale=2).splitlines()
+        self.assertEqual(len(scaled), 2 * len(art))
+        for row_index, row in enumerate(art):
+            doubled = "".join(char * 2 for char in row)
+            self.assertEqual(scaled[2 * row_index], doubled)
+            self.assertEqual(scaled[2 * row_index + 1], doubled)
+
+    def test_too_small_width(self):
+        with self.assertRaises(ValueError):
+            BitmapGenerator.generate("a", font="cap", width=8, scale=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+
+import numpy as np
+
+from labs.lab5.bll.AsciiMapper import AsciiMapper
+from labs.lab5.bll.ColorQuantizer import ColorQuantizer
+from shared.services.ansi_escape import strip_ansi
+
+ASCII_CHARS = ["@", "#", "S", "%", "?", "*", "+", ";", ":", ",", "."]
+COLOR_PALETTE = [
+    {"r": 255, "g": 0, "b": 0},
+    {"r": 0, "g": 255, "b": 0},
+    {"r": 0, "g": 0, "b": 255},
+]
+
+
+class TestColorQuantizer(unittest.TestCase):
+    """
+    Unit tests for the color modes of the ASCII renderer.
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.pixels = rng.integers(0, 256, (24, 80, 3), dtype=np.uint8)
+
+    def test_palette_colors_map_to_themselves(self):
+        quantizer = ColorQuantizer("palette", COLOR_PALETTE)
+        pixels = np.array([[[255, 0, 0], [0, 255, 0], [0, 0, 255], [250, 10, 5]]])
+        self.assertEqual(quantizer.quantize(pixels).tolist(), [[0, 1, 2, 0]])
+
+    def test_lookup_table_is_close_to_exact_nearest_color(self):
+        for mode in ["256", "16"]:
+            quantizer = ColorQuantizer(mode)
+            pixels = self.pixels.reshape(-1, 3).astype(np.int64)
+            palette = quantizer.palette.astype(np.int64)
+            distances = ((pixels[:, None] - palette[None]) ** 2).sum(axis=2)
+            best = distances.min(axis=1)
+            chosen = distances[np.arange(len(pixels)), quantizer.quantize(pixels)]
+            # the table is built for the centers of 8x8x8 cells
+            self.assertTrue(np.all(np.sqrt(chosen) - np.sqrt(best) <= 8 * np.sqrt(3)))
+
+    def test_modes_keep_characters_and_shrink_output(self):
+        plain = AsciiMapper(ASCII_CHARS).to_ascii(self.pixels, is_colored=False)
+        sizes = {}
+        for mode in ["truecolor", "256", "16", "mono", "palette"]:
+            quantizer = ColorQuantizer(mode, COLOR_PALETTE)
+            art = AsciiMapper(ASCII_CHARS, quantizer=quantizer).to_ascii(self.pixels)
+            self.assertEqual(strip_ansi(art), plain)
+            sizes[mode] = len(art)
+        self.assertEqual(sizes["mono"], len(plain))
+        self.assertLess(sizes["256"], sizes["truecolor"])
+        self.assertLess(sizes["16"], sizes["256"])
+        self.assertLess(sizes["palette"], sizes["truecolor"])
+
+    def test_unknown_mode_and_empty_palette(self):
+        with self.assertRaises(ValueError):
+            ColorQuantizer("8")
+        with self.assertRaises(ValueError):
+            ColorQuantizer("palette", [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+
+from labs.lab5.bll.Culling import BoundingVolumeHierarchy, boxes_in_frustum, frustum_planes
+from labs.lab5.bll.FigureWrapper import FigureWrapper
+from labs.lab5.bll.Scene import Scene
+from labs.lab5.bll.SoftwareRasterizer import look_at, perspective
+
+
+class TestCulling(unittest.TestCase):
+    """
+    Unit tests for the bounds of lab5 figures and the frustum culling of scenes.
+    """
+
+    def setUp(self):
+        # a camera at (0, 0, 10) looking at the origin
+        view = look_at((0, 0, 10), (0, 0, 0), (0, 1, 0))
+        self.view_projection = perspective(45, 1, 0.1, 100) @ view
+        self.planes = frustum_planes(self.view_projection)
+
+    def test_bounds_follow_transforms(self):
+        figure = FigureWrapper.create("Cube")
+        np.testing.assert_allclose(figure.data.bounds()[0], [-1, -1, -1])
+        figure.translate(5, 0, 0)
+        figure.scale(2, 1, 1)
+        minimum, maximum = figure.data.bounds()
+        np.testing.assert_allclose(minimum, [3, -1, -1])
+        np.testing.assert_allclose(maximum, [7, 1, 1])
+        center, radius = figure.data.bounding_sphere()
+        np.testing.assert_allclose(center, [5, 0, 0])
+        self.assertAlmostEqual(radius, 2 * 3**0.5)
+
+    def test_boxes_in_frustum(self):
+        minimums = np.array([[-1, -1, -1], [50, 0, 0], [-1, -1, 20], [-1, -1, -200]])
+        mask = boxes_in_frustum(self.planes, minimums, minimums + 2)
+        self.assertEqual(mask.tolist(), [True, False, False, False])
+
+    def test_hierarchy_matches_testing_every_box(self):
+        rng = np.random.default_rng(1)
+        minimums = rng.uniform(-60, 60, (500, 3))
+        maximums = minimums + rng.uniform(0, 3, (500, 3))
+        expected = np.flatnonzero(boxes_in_frustum(self.planes, minimums, maximums))
+        bvh = BoundingVolumeHierarchy(minimums, maximums)
+        self.assertEqual(bvh.query(self.planes).tolist(), expected.tolist())
+        minimums[:, 0] += 30
+        maximums[:, 0] += 30
+        bvh.refit(minimums, maximums)
+        expected = np.flatnonzero(boxes_in_frustum(self.planes, minimums, maximums))
+        self.assertEqual(bvh.query(self.planes).tolist(), expected.tolist())
+
+    def test_scene_skips_invisible_figures(self):
+        scene = Scene()
+        for index in range(100):
+            figure = FigureWrapper.create("Cube")
+            figure.translate(index * 3 - 150, 0, 0)
+            scene.add_figure(figure)
+        visible = scene.visible_figures(self.view_projection)
+        self.assertEqual(scene.stats, {"figures": 100, "visible": len(visible)})
+        self.assertTrue(0 < len(visible) < 10)
+        scene.data.culling = False
+        self.assertEqual(len(scene.visible_figures(self.view_projection)), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+import numpy as np
+
+from labs.lab5.bll.FigureBuffers import FigureBuffers, fan_triangles
+from labs.lab5.bll.FigureWrapper import FigureWrapper
+from labs.lab5.dal.Figure import FigureData
+
+
+class TestFigureBuffers(unittest.TestCase):
+    """
+    Unit tests for the vertex arrays of lab5 figures.
+    """
+
+    def setUp(self):
+        positions = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0), (0, 0, 1)]
+        self.data = FigureData.from_arrays(
+            positions, [[0, 1], [1, 2]], [0, 1, 2, 3, 0, 1, 4], [0, 4, 7]
+        )
+        self.data.face_colors[1] = (1, 0, 0)
+        self.buffers = FigureBuffers(self.data, use_vbo=False)
+
+    def test_fan_triangles(self):
+        self.assertEqual(
+            fan_triangles([0, 4, 7, 9]).tolist(), [[0, 1, 2], [0, 2, 3], [4, 5, 6]]
+        )
+
+    def test_figure_color_shares_positions(self):
+        faces = self.buffers.arrays("faces")
+        self.assertIsNone(faces["colors"])
+        self.assertEqual(faces["indices"].tolist(), [0, 1, 2, 0, 2, 3, 0, 1, 4])
+        self.assertEqual(self.buffers.arrays("edges")["indices"].tolist(), [0, 1, 1, 2])
+        self.assertEqual(len(self.buffers.arrays("points")["positions"]), 5)
+
+    def test_element_colors_are_copied_per_corner(self):
+        self.data.figure_color = False
+        faces = self.buffers.arrays("faces", alpha=0.5)
+        self.assertEqual(faces["positions"].shape, (7, 3))
+        self.assertEqual(faces["colors"][:, 3].tolist(), [0.5] * 7)
+        self.assertEqual(faces["colors"][4:, :3].tolist(), [[1, 0, 0]] * 3)
+        edges = self.buffers.arrays("edges")
+        np.testing.assert_array_equal(edges["positions"][2:], self.data.positions[[1, 2]])
+        self.assertEqual(len(edges["colors"]), 4)
+
+    def test_arrays_are_rebuilt_only_after_changes(self):
+        figure = FigureWrapper(self.data)
+        first = self.buffers.arrays("edges")
+        figure.rotate(30, 0, 0)
+        figure.translate(1, 0, 0)
+        self.assertIs(self.buffers.arrays("edges"), first)
+        figure.set_color((0, 0, 1))
+        self.assertIsNot(self.buffers.arrays("edges"), first)
+        self.data.vertices[0].position = (2, 2, 2)
+        self.assertEqual(self.buffers.stats["builds"], 2)
+        self.buffers.arrays("edges")
+        self.assertEqual(self.buffers.stats["builds"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+import numpy as np
+
+from labs.lab5.bll.FigureWrapper import FigureWrapper
+from labs.lab5.dal.Figure import Edge, Face, FigureData, Vertex
+
+
+class TestFigureData(unittest.TestCase):
+    """
+    Unit tests for the array storage of lab5 figures and its views.
+    """
+
+    def setUp(self):
+        self.vertices = [Vertex(0, 0, 0), Vertex(1, 0, 0), Vertex(1, 1, 0), Vertex(0, 1, 0)]
+        v = self.vertices
+        self.data = FigureData(
+            v,
+            [Edge(v[0], v[1]), Edge(v[1], v[2], color=(0, 0, 1))],
+            [Face(v), [0, 1, 2]],
+        )
+
+    def test_objects_become_views_of_the_arrays(self):
+        self.assertEqual(self.data.positions.shape, (4, 3))
+        self.assertEqual(self.data.edge_indices.tolist(), [[0, 1], [1, 2]])
+        self.assertEqual(self.data.face_offsets.tolist(), [0, 4, 7])
+        self.vertices[2].position += 1
+        self.assertEqual(self.data.positions[2].tolist(), [2, 2, 1])
+        self.data.positions[1] = (5, 5, 5)
+        self.assertEqual(self.data.edges[0].vertices[1].position.tolist(), [5, 5, 5])
+        self.assertIs(self.data.faces[0].vertices[3], self.vertices[3])
+        self.assertEqual(self.data.edges[1].color, (0, 0, 1))
+
+    def test_from_arrays_matches_objects(self):
+        data = FigureData.from_arrays(
+            self.data.positions, [[0, 1], [1, 2]], [0, 1, 2, 3, 0, 1, 2], [0, 4, 7]
+        )
+        np.testing.assert_array_equal(data.face_indices, self.data.face_indices)
+        self.assertEqual(
+            data.face_borders().tolist(),
+            [[0, 1], [1, 2], [2, 3], [3, 0], [0, 1], [1, 2], [2, 0]],
+        )
+        self.assertEqual([vertex.index for vertex in data.faces[1].vertices], [0, 1, 2])
+        with self.assertRaises(ValueError):
+            FigureData.from_arrays(self.data.positions, [[0, 4]])
+
+    def test_transforms_match_per_vertex_math(self):
+        figure = FigureWrapper(self.data.copy())
+        expected = self.data.positions.astype(np.float64)
+        center = expected.mean(axis=0)
+        angle = np.radians(30)
+        rotation = np.array(
+            [
+                [np.cos(angle), -np.sin(angle), 0],
+                [np.sin(angle), np.cos(angle), 0],
+                [0, 0, 1],
+            ]
+        )
+        expected = np.array([rotation @ (p - center) + center for p in expected])
+        figure.rotate(0, 0, 30)
+        figure.translate(1, 2, 3)
+        np.testing.assert_allclose(
+            figure.data.world_positions, expected + [1, 2, 3], atol=1e-5
+        )
+        np.testing.assert_array_equal(self.data.positions[0], [0, 0, 0])
+
+    def test_examples_are_copied(self):
+        first = FigureWrapper.create("Cube")
+        second = FigureWrapper.create("Cube")
+        first.translate(1, 0, 0)
+        self.assertFalse(
+            np.array_equal(first.data.world_positions, second.data.world_positions)
+        )
+
+    def test_transforms_only_change_the_model_matrix(self):
+        figure = FigureWrapper(self.data.copy())
+        positions = figure.data.positions.copy()
+        figure.scale(2, 2, 2)
+        figure.rotate(90, 0, 0)
+        np.testing.assert_array_equal(figure.data.positions, positions)
+        np.testing.assert_allclose(figure.data.center(), positions.mean(axis=0), atol=1e-6)
+        world = figure.data.world_positions
+        self.assertIs(figure.data.world_positions, world)
+        self.assertFalse(world.flags.writeable)
+        figure.data.vertices[0].position = (7, 8, 9)
+        self.assertIsNot(figure.data.world_positions, world)
+        np.testing.assert_allclose(figure.data.vertices[0].position, [7, 8, 9], atol=1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
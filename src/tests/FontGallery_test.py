@@ -0,0 +1,68 @@
+import unittest
+
+from labs.lab3.bll.FontGallery import FontGallery
+from shared.classes.ascii_generator import AsciiGenerator
+
+
+class CountingGenerator(AsciiGenerator):
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, data, **kwargs):
+        self.calls.append(kwargs["font"])
+        if kwargs["font"] == "broken":
+            raise ValueError("Can't render")
+        return f"{kwargs['font']}:{data}:{kwargs['width']}"
+
+    def is_font_break_lines(self, font):
+        return True
+
+    def get_fonts(self):
+        return ["block", "broken", "thin"]
+
+    def get_font_char_height(self, font):
+        return 1
+
+    def get_font_char_width(self, font):
+        return 1
+
+
+class TestFontGallery(unittest.TestCase):
+    """
+    Unit tests for rendering a text with every font of a generator.
+    """
+
+    def setUp(self):
+        self.generator = CountingGenerator()
+        self.gallery = FontGallery(self.generator, workers=1, cache_size=4)
+
+    def test_render_skips_failing_fonts(self):
+        arts = list(self.gallery.render_all_fonts("hi", 40))
+        self.assertEqual(arts, [("block", "block:hi:40"), ("thin", "thin:hi:40")])
+        self.assertEqual(self.generator.calls, ["block", "broken", "thin"])
+
+    def test_cache_hit(self):
+        list(self.gallery.render_all_fonts("hi", 40))
+        arts = dict(self.gallery.render_all_fonts("hi", 40))
+        self.assertEqual(arts, {"block": "block:hi:40", "thin": "thin:hi:40"})
+        # failed fonts are cached too and are not rendered again
+        self.assertEqual(len(self.generator.calls), 3)
+        list(self.gallery.render_all_fonts("hi", 20, ["thin"]))
+        self.assertEqual(self.generator.calls[-1], "thin")
+        self.gallery.clear_cache()
+        list(self.gallery.render_all_fonts("hi", 40, ["block"]))
+        self.assertEqual(len(self.generator.calls), 5)
+
+    def test_cache_is_bounded(self):
+        list(self.gallery.render_all_fonts("one", 40))
+        # the cached block art is used, so the least recently used one is broken
+        list(self.gallery.render_all_fonts("one", 40, ["block"]))
+        list(self.gallery.render_all_fonts("two", 40, ["block", "thin"]))
+        self.assertEqual(len(self.gallery._cache), 4)
+        self.generator.calls.clear()
+        list(self.gallery.render_all_fonts("one", 40))
+        self.assertEqual(self.generator.calls, ["broken"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from labs.lab5.bll.FramePacer import FramePacer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFramePacer(unittest.TestCase):
+    """
+    Unit tests for pacing the redisplays of the lab5 scene.
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.pacer = FramePacer(10, self.clock)
+
+    def test_requests_between_frames_are_coalesced(self):
+        self.assertTrue(self.pacer.request())
+        self.pacer.frame_started()
+        self.pacer.frame_finished()
+        self.clock.now = 0.02
+        self.assertFalse(self.pacer.request())
+        self.assertFalse(self.pacer.request())
+        self.assertAlmostEqual(self.pacer.delay(), 0.08)
+        self.clock.now = 0.1
+        self.assertTrue(self.pacer.should_render())
+        self.pacer.frame_started()
+        self.assertEqual(self.pacer.stats["frames"], 2)
+        self.assertEqual(self.pacer.stats["coalesced"], 1)
+        self.assertFalse(self.pacer.should_render())
+
+    def test_slow_frame_drops_frames(self):
+        self.pacer.request()
+        self.pacer.frame_started()
+        self.clock.now = 0.25
+        self.assertEqual(self.pacer.frame_finished(), 2)
+        self.assertEqual(self.pacer.stats["dropped"], 2)
+
+    def test_zero_fps_disables_pacing(self):
+        pacer = FramePacer(0, self.clock)
+        for _ in range(3):
+            self.assertTrue(pacer.request())
+            pacer.frame_started()
+            self.assertEqual(pacer.frame_finished(), 0)
+        with self.assertRaises(ValueError):
+            pacer.set_target_fps(-1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from labs.lab5.bll.FrameProfiler import FrameProfiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFrameProfiler(unittest.TestCase):
+    """
+    Unit tests for measuring the stages of rendered frames.
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.profiler = FrameProfiler(window=2, clock=self.clock)
+
+    def render(self, draw, write, pause):
+        self.profiler.begin_frame()
+        with self.profiler.stage("write"):
+            self.clock.now += write
+        with self.profiler.stage("draw"):
+            self.clock.now += draw
+        self.clock.now += pause
+        return self.profiler.end_frame()
+
+    def test_stage_times_are_averaged_over_the_window(self):
+        self.render(0.5, 0.5, 0)
+        self.render(0.010, 0.002, 0.088)
+        timings = self.render(0.020, 0.004, 0.076)
+        self.assertAlmostEqual(timings["frame"], 0.1)
+        averages = self.profiler.averages()
+        self.assertAlmostEqual(averages["draw"], 0.015)
+        self.assertAlmostEqual(averages["write"], 0.003)
+        self.assertAlmostEqual(self.profiler.fps(), 10)
+
+    def test_summary_lists_stages_in_frame_order(self):
+        self.render(0.010, 0.002, 0)
+        summary = self.profiler.summary({"dropped": 3})
+        self.assertLess(summary.index("draw 10.0"), summary.index("write 2.0"))
+        self.assertTrue(summary.endswith("dropped 3"))
+
+    def test_stage_outside_of_frame_is_ignored(self):
+        with self.profiler.stage("draw"):
+            self.clock.now += 1
+        self.assertEqual(self.profiler.end_frame(), {})
+        self.assertEqual(self.profiler.averages(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from labs.lab5.bll.AsciiMapper import AsciiMapper
+from labs.lab5.bll.ImageConverter import ImageConverter
+from shared.services.ansi_escape import strip_ansi
+
+ASCII_CHARS = ["@", "#", "S", "%", "?", "*", "+", ";", ":", ",", "."]
+
+
+def legacy_ascii(image, ascii_height):
+    width, height = image.size
+    scaled_width = int(ascii_height * (width / height) * 3)
+    image = image.resize((scaled_width, ascii_height), Image.NEAREST)
+    gray = np.array(image.convert("L"))
+    return "\n".join(
+        "".join(ASCII_CHARS[int(value / 255 * (len(ASCII_CHARS) - 1))] for value in row)
+        for row in gray
+    )
+
+
+class TestImageConverter(unittest.TestCase):
+    """
+    Unit tests for converting images into ASCII art without OpenGL.
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.pixels = rng.integers(0, 256, (97, 131, 3), dtype=np.uint8)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def save(self, name, pixels):
+        path = os.path.join(self.folder.name, name)
+        Image.fromarray(pixels).save(path)
+        return path
+
+    def test_same_as_pil_mapping(self):
+        mapper = AsciiMapper(ASCII_CHARS)
+        for height in (5, 15, 40):
+            art = mapper.image_to_ascii(self.pixels, height, is_colored=False)
+            self.assertEqual(art, legacy_ascii(Image.fromarray(self.pixels), height))
+
+    def test_tiny_and_narrow_images(self):
+        mapper = AsciiMapper(ASCII_CHARS)
+        wide = np.zeros((4, 40, 3), dtype=np.uint8)
+        narrow = np.zeros((1000, 10, 3), dtype=np.uint8)
+        self.assertEqual(mapper.scaled_size(40, 4), (30, 1))
+        self.assertEqual(mapper.scaled_size(10, 1000, 15), (1, 15))
+        self.assertEqual(mapper.image_to_ascii(wide, is_colored=False), "@" * 30)
+        self.assertEqual(
+            mapper.image_to_ascii(narrow, 15, is_colored=False), "\n".join(["@"] * 15)
+        )
+
+    def test_colored_art(self):
+        mapper = AsciiMapper(ASCII_CHARS)
+        colored = mapper.image_to_ascii(self.pixels, 10)
+        self.assertIn("\x1b[38;2;", colored)
+        self.assertEqual(
+            strip_ansi(colored), mapper.image_to_ascii(self.pixels, 10, is_colored=False)
+        )
+
+    def test_folder_is_read_in_natural_order(self):
+        for index in (10, 2, 1):
+            self.save(f"frame_{index}.png", self.pixels)
+        names = [path.name for path in ImageConverter.find_images(self.folder.name)]
+        self.assertEqual(names, ["frame_1.png", "frame_2.png", "frame_10.png"])
+
+    def test_batch_saves_every_frame(self):
+        frames = [Image.fromarray(self.pixels), Image.fromarray(255 - self.pixels)]
+        gif_path = os.path.join(self.folder.name, "clip.gif")
+        frames[0].save(gif_path, save_all=True, append_images=frames[1:])
+        self.save("still.png", self.pixels)
+        save_folder = os.path.join(self.folder.name, "arts")
+        converter = ImageConverter(ASCII_CHARS, 8, is_colored=False, workers=2)
+        results = converter.convert_batch([self.folder.name], save_folder)
+        self.assertEqual(sorted(len(arts) for _, arts, _ in results), [1, 2])
+        self.assertEqual(
+            sorted(os.listdir(save_folder)),
+            ["clip_0000.txt", "clip_0001.txt", "still.txt"],
+        )
+
+    def test_batch_skips_broken_files(self):
+        broken_path = os.path.join(self.folder.name, "broken.png")
+        with open(broken_path, "wb") as file:
+            file.write(b"not an image")
+        self.save("still.png", self.pixels)
+        converter = ImageConverter(ASCII_CHARS, 8, is_colored=False, workers=2)
+        results = {
+            path.name: (arts, error)
+            for path, arts, error in converter.convert_batch([self.folder.name])
+        }
+        self.assertEqual(results["broken.png"][0], [])
+        self.assertIn("broken.png", results["broken.png"][1])
+        self.assertEqual(len(results["still.png"][0]), 1)
+        self.assertIsNone(results["still.png"][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
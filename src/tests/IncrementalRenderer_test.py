@@ -0,0 +1,51 @@
+import unittest
+
+from labs.lab3.bll.IncrementalRenderer import FigletGlyphs, IncrementalRenderer
+from labs.lab3.bll.PyfigletGenerator import PyfigletGenerator
+from labs.lab4.bll.CustomGenerator import CustomGenerator
+
+EDITS = ["h", "he", "hel", "hello", "hello world", "hello wor", "help world", "yes"]
+
+
+class TestIncrementalRenderer(unittest.TestCase):
+    """
+    Unit tests for rendering edited text by re-rendering only its changed tail.
+    """
+
+    def assert_same_as_generator(self, generator, font, width):
+        renderer = IncrementalRenderer(generator, font, width)
+        for text in EDITS:
+            self.assertEqual(
+                renderer.render(text), generator.generate(text, font=font, width=width)
+            )
+        return renderer
+
+    def test_custom_font(self):
+        renderer = self.assert_same_as_generator(CustomGenerator(), "cap", 30)
+        self.assertGreater(renderer.stats["reused_columns"], 0)
+        self.assertEqual(renderer.stats["full_renders"], 0)
+
+    def test_custom_font_with_replace_string(self):
+        self.assert_same_as_generator(CustomGenerator(), "oleh_cap", 30)
+
+    def test_full_width_figlet_font(self):
+        self.assertTrue(FigletGlyphs.is_full_width("future"))
+        self.assertFalse(FigletGlyphs.is_full_width("standard"))
+        renderer = self.assert_same_as_generator(PyfigletGenerator(), "future", 200)
+        self.assertGreater(renderer.stats["reused_columns"], 0)
+        self.assertEqual(renderer.stats["full_renders"], 0)
+
+    def test_smushing_font_falls_back(self):
+        renderer = self.assert_same_as_generator(PyfigletGenerator(), "standard", 80)
+        self.assertEqual(renderer.stats["full_renders"], len(EDITS))
+
+    def test_only_changed_tail_is_rendered(self):
+        renderer = IncrementalRenderer(CustomGenerator(), "cap", 60)
+        renderer.render("a" * 20)
+        rendered = renderer.stats["rendered_columns"]
+        renderer.render("a" * 19 + "b")
+        self.assertEqual(renderer.stats["rendered_columns"] - rendered, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
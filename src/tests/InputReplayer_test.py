@@ -0,0 +1,169 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from OpenGL.GLUT import GLUT_DOWN, GLUT_LEFT_BUTTON
+
+from config.settings_paths import settings_path_lab5
+from labs.lab5.bll.CameraWrapper import Camera
+from labs.lab5.bll.Controller import Controller
+from labs.lab5.bll.FigureWrapper import FigureWrapper
+from labs.lab5.bll.InputRecorder import InputRecorder
+from labs.lab5.bll.InputReplayer import InputReplayer
+from labs.lab5.bll.Scene import Scene
+from labs.lab5.dal.InputRecording import load_recording, save_recording
+from labs.lab5.ui.Keyboard import KeyboardHandler
+from labs.lab5.ui.Mouse import MouseHandler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        self.now += 0.25
+        return self.now
+
+
+class FakeController:
+    def __init__(self):
+        self.calls = []
+
+    def handle_keyboard_up(self, key):
+        self.calls.append(("keyboard_up", key))
+
+    def handle_mouse(self, button, state, x, y):
+        self.calls.append(("mouse", button, state, x, y))
+
+    def handle_motion(self, x, y):
+        self.calls.append(("motion", x, y))
+
+
+class TestInputReplayer(unittest.TestCase):
+    """
+    Unit tests for recording lab5 input and replaying it without a window.
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        # the controller creates its default text file in the working folder
+        self.working_folder = os.getcwd()
+        os.chdir(self.folder.name)
+        self.settings_path = os.path.join(self.folder.name, "settings.json")
+        shutil.copy(settings_path_lab5, self.settings_path)
+        scene = Scene()
+        scene.set_camera(Camera.create((0, 0, 10), (0, 0, 0), (0, 1, 0)))
+        for x in (-2, 2):
+            cube = FigureWrapper.create("Cube")
+            cube.translate(x, 0, 0)
+            scene.add_figure(cube)
+        scene.save(os.path.join(self.folder.name, "start.json"))
+        self.recording = {
+            "window": [160, 100],
+            "scene": "start.json",
+            "settings": {"ascii_height": 10},
+            "events": [
+                {"time": 0.0, "kind": "frame", "args": []},
+                {"time": 0.1, "kind": "keyboard", "args": ["a", None]},
+                {"time": 0.1, "kind": "command", "args": ["translate_left"]},
+                {"time": 0.2, "kind": "frame", "args": []},
+                {"time": 0.3, "kind": "keyboard_up", "args": ["a"]},
+                {"time": 0.4, "kind": "mouse", "args": [GLUT_LEFT_BUTTON, GLUT_DOWN, 120, 50]},
+                {"time": 0.5, "kind": "keyboard", "args": ["w", None]},
+                {"time": 0.5, "kind": "command", "args": ["translate_forward"]},
+                {"time": 0.6, "kind": "frame", "args": []},
+            ],
+        }
+
+    def tearDown(self):
+        os.chdir(self.working_folder)
+        self.folder.cleanup()
+
+    def create_controller(self):
+        scene = Scene()
+        scene.set_camera(Camera.create((0, 0, 10), (0, 0, 0), (0, 1, 0)))
+        return Controller(scene, KeyboardHandler(), MouseHandler(), self.settings_path)
+
+    def replay(self, recording):
+        replayer = InputReplayer(self.create_controller(), FakeClock())
+        return replayer.replay(recording, self.folder.name)
+
+    def test_replay_is_deterministic(self):
+        first = self.replay(self.recording)
+        second = self.replay(self.recording)
+        self.assertTrue(first["commands_match"])
+        self.assertEqual(len(first["frames"]), 3)
+        self.assertEqual(
+            [frame["hash"] for frame in first["frames"]],
+            [frame["hash"] for frame in second["frames"]],
+        )
+        self.assertEqual([frame["time"] for frame in first["frames"]], [0.0, 0.2, 0.6])
+        self.assertEqual(first["frames"][0]["ms"], 250)
+        hashes = [frame["hash"] for frame in first["frames"]]
+        # the camera moved left, then the clicked figure moved forward
+        self.assertEqual(len(set(hashes)), 3)
+
+    def test_changed_input_is_detected(self):
+        events = self.recording["events"]
+        events[1] = {"time": 0.1, "kind": "keyboard", "args": ["d", None]}
+        report = self.replay(self.recording)
+        self.assertFalse(report["commands_match"])
+
+    def test_controller_records_and_saves(self):
+        controller = self.create_controller()
+        controller.set_up_renderer("software")
+        controller.settings.set("scenes_folder", self.folder.name + "/")
+        controller.set_recording_name("session")
+        controller.start_recording()
+        controller.reshape(160, 100)
+        controller.mouse_handler.wheel(0, 1, 80, 50)
+        controller.mouse_handler.motion(10, 20)
+        controller.execute_command("unknown")
+        path = controller.stop_recording()
+        self.assertIsNone(controller.stop_recording())
+        recording = load_recording(path)
+        self.assertEqual(recording["scene"], "session.start.json")
+        self.assertEqual(
+            [(event["kind"], event["args"]) for event in recording["events"]],
+            [
+                ("reshape", [160, 100]),
+                ("wheel", [0, 1, 80, 50]),
+                ("command", ["zoom_up"]),
+                ("motion", [10, 20]),
+            ],
+        )
+        report = InputReplayer(self.create_controller()).replay(recording, self.folder.name)
+        self.assertTrue(report["commands_match"])
+
+    def test_handlers_record_events(self):
+        recorder = InputRecorder(FakeClock())
+        controller = FakeController()
+        keyboard = KeyboardHandler(controller, recorder)
+        mouse = MouseHandler(controller, recorder)
+        mouse.motion(1, 2)
+        recorder.start((10, 20))
+        keyboard.keyboard_up(b"a", 0, 0)
+        mouse.mouse(0, 1, 3, 4)
+        recorder.stop()
+        mouse.motion(5, 6)
+        self.assertEqual(len(controller.calls), 4)
+        self.assertEqual(
+            recorder.recording()["events"],
+            [
+                {"time": 0.25, "kind": "keyboard_up", "args": ["a"]},
+                {"time": 0.5, "kind": "mouse", "args": [0, 1, 3, 4]},
+            ],
+        )
+
+    def test_recording_errors(self):
+        path = os.path.join(self.folder.name, "input.json")
+        save_recording(path, self.recording)
+        self.assertEqual(load_recording(path)["events"], self.recording["events"])
+        scene_path = os.path.join(self.folder.name, "start.json")
+        with self.assertRaises(ValueError):
+            load_recording(scene_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
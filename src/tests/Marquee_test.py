@@ -0,0 +1,32 @@
+import unittest
+
+from labs.lab3.bll.Marquee import Marquee
+
+
+class TestMarquee(unittest.TestCase):
+    """
+    Unit tests for slicing scrolling banner frames from one rendered buffer.
+    """
+
+    def test_frames_are_slices_with_wrap(self):
+        marquee = Marquee("abcd\nefgh", 3, gap=2)
+        self.assertEqual(marquee.cycle, 6)
+        self.assertEqual(marquee.frame_text(0), "abc\nefg")
+        self.assertEqual(marquee.frame_text(4), "  a\n  e")
+        self.assertEqual(marquee.frame_text(10), marquee.frame_text(4))
+
+    def test_frames_generator_steps(self):
+        marquee = Marquee("abcd", 2, gap=0)
+        frames = marquee.frames(step=1)
+        texts = [next(frames).tobytes() for _ in range(5)]
+        self.assertEqual(texts[0], texts[4])
+        self.assertNotEqual(texts[0], texts[1])
+
+    def test_narrow_art_fills_the_viewport(self):
+        marquee = Marquee("ab", 5, gap=0)
+        self.assertEqual(marquee.cycle, 5)
+        self.assertEqual(marquee.frame_text(0), "ab   ")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from labs.lab5.bll.FigureWrapper import FigureWrapper
+from labs.lab5.bll.LevelOfDetail import LevelOfDetail, projected_rows
+from labs.lab5.dal.MeshGenerator import LOD_RESOLUTIONS, generate
+
+
+class TestMeshGenerator(unittest.TestCase):
+    """
+    Unit tests for the procedural figures of lab5 and their levels of detail.
+    """
+
+    def test_closed_surfaces(self):
+        # vertices - edges + faces is 2 for a sphere and 0 for a torus
+        for name, euler in [("UV sphere", 2), ("Icosphere", 2), ("Cylinder", 2), ("Torus", 0)]:
+            for resolution in LOD_RESOLUTIONS[name][:3]:
+                data = generate(name, resolution)
+                faces = len(data.face_offsets) - 1
+                self.assertEqual(
+                    len(data.positions) - len(data.edge_indices) + faces, euler, name
+                )
+        sphere = generate("Icosphere", 2, radius=3)
+        np.testing.assert_allclose(np.linalg.norm(sphere.positions, axis=1), 3, rtol=1e-6)
+
+    def test_terrain_from_heightmap(self):
+        heights = np.arange(12, dtype=float).reshape(3, 4)
+        data = generate("Terrain", heights=heights, size=3)
+        self.assertEqual(len(data.positions), 12)
+        self.assertEqual(len(data.face_offsets) - 1, 6)
+        self.assertEqual(data.positions[:, 1].tolist(), list(range(12)))
+        self.assertEqual(data.positions[:, 0].min(), -1.5)
+        coarse = generate("Terrain", 2, heights=np.zeros((10, 20)))
+        self.assertEqual(len(coarse.positions), 2 * 2)
+
+    def test_level_selection(self):
+        lod = LevelOfDetail("UV sphere", [6, 12, 24])
+        self.assertEqual([lod.select(rows) for rows in (1, 3, 6, 11, 100)], [0, 0, 1, 2, 2])
+        self.assertIsNone(lod.levels[1])
+        self.assertAlmostEqual(lod.radius(), 1.0, places=5)
+        near = projected_rows((0, 0, 0), 1, (0, 0, 5), 90, 20)
+        far = projected_rows((0, 0, 0), 1, (0, 0, 50), 90, 20)
+        self.assertAlmostEqual(near, 4.0)
+        self.assertAlmostEqual(far, 0.4)
+        self.assertEqual(projected_rows((0, 0, 0), 1, (0, 0, 0.5), 90, 20), float("inf"))
+
+    def test_levels_keep_the_figure_state(self):
+        figure = FigureWrapper.create_procedural("Icosphere")
+        figure.set_color((1, 0, 0))
+        figure.translate(1, 2, 3)
+        figure.data.selected = True
+        coarse = figure.data
+        figure.update_level_of_detail(100)
+        self.assertIsNot(figure.data, coarse)
+        self.assertEqual(len(figure.data.positions), len(generate("Icosphere", 4).positions))
+        np.testing.assert_array_equal(figure.data.model, coarse.model)
+        self.assertEqual(figure.data.color, (1, 0, 0))
+        self.assertTrue(figure.data.selected)
+        self.assertAlmostEqual(figure.bounding_radius(), 1.0, places=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
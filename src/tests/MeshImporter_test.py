@@ -0,0 +1,125 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from labs.lab5.dal.Figure import figures
+from labs.lab5.dal.MeshImporter import STL_TRIANGLE, load_mesh, register_mesh
+
+# two triangles of a unit square, they share the edge (1, 0, 0) - (0, 1, 0)
+SQUARE = [
+    [(0, 0, 0), (1, 0, 0), (0, 1, 0)],
+    [(1, 0, 0), (1, 1, 0), (0, 1, 0)],
+]
+
+
+class TestMeshImporter(unittest.TestCase):
+    """
+    Unit tests for the OBJ, STL and PLY importers of lab5.
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.folder.name, name)
+        with open(path, "wb") as file:
+            file.write(content.encode() if isinstance(content, str) else content)
+        return path
+
+    def assert_square(self, data):
+        self.assertEqual(data.positions.shape, (4, 3))
+        self.assertEqual(len(data.edge_indices), 5)
+        self.assertEqual(data.face_offsets.tolist(), [0, 3, 6])
+        corners = data.positions[data.face_indices].tolist()
+        self.assertEqual(corners, [list(map(float, p)) for face in SQUARE for p in face])
+
+    def test_obj_faces_with_slashes_and_negative_indices(self):
+        path = self.write(
+            "square.obj",
+            "# square\no square\nv 0 0 0\nv 1 0 0\nv 0 1 0\nvt 0 0\n"
+            "f 1/1 2/1 3/1\nv 1 1 0\nf -3//1 -1//1 -2//1\n",
+        )
+        self.assert_square(load_mesh(path))
+
+    def test_binary_and_ascii_stl(self):
+        triangles = np.zeros(2, dtype=STL_TRIANGLE)
+        triangles["vertices"] = SQUARE
+        binary = self.write(
+            "binary.stl",
+            b"solid but binary".ljust(80, b" ")
+            + np.uint32(2).tobytes()
+            + triangles.tobytes(),
+        )
+        self.assert_square(load_mesh(binary))
+        facets = "".join(
+            "facet normal 0 0 1\nouter loop\n"
+            + "".join(f"vertex {x} {y} {z}\n" for x, y, z in face)
+            + "endloop\nendfacet\n"
+            for face in SQUARE
+        )
+        self.assert_square(load_mesh(self.write("ascii.stl", f"solid s\n{facets}endsolid s\n")))
+
+    def test_ascii_and_binary_ply(self):
+        header = (
+            "ply\nformat {}\ncomment square\nelement vertex 4\n"
+            "property float x\nproperty float y\nproperty float z\n"
+            "property uchar red\nproperty uchar green\nproperty uchar blue\n"
+            "element face 2\nproperty list uchar int vertex_indices\nend_header\n"
+        )
+        ascii_path = self.write(
+            "ascii.ply",
+            header.format("ascii 1.0")
+            + "0 0 0 255 0 0\n1 0 0 0 255 0\n0 1 0 0 0 255\n1 1 0 255 255 255\n"
+            + "3 0 1 2\n3 1 3 2\n",
+        )
+        vertices = np.array(
+            [(0, 0, 0, 255, 0, 0), (1, 0, 0, 0, 255, 0), (0, 1, 0, 0, 0, 255), (1, 1, 0, 255, 255, 255)],
+            dtype=[("x", "<f4"), ("y", "<f4"), ("z", "<f4"), ("r", "u1"), ("g", "u1"), ("b", "u1")],
+        )
+        faces = np.array([(3, (0, 1, 2)), (3, (1, 3, 2))], dtype=[("n", "u1"), ("i", "<i4", (3,))])
+        binary_path = self.write(
+            "binary.ply",
+            header.format("binary_little_endian 1.0").encode()
+            + vertices.tobytes()
+            + faces.tobytes(),
+        )
+        for path in (ascii_path, binary_path):
+            data = load_mesh(path)
+            self.assert_square(data)
+            red = data.vertex_colors[np.all(data.positions == 0, axis=1)]
+            self.assertEqual(red.tolist(), [[1, 0, 0]])
+
+    def test_register_and_errors(self):
+        path = self.write("quad.obj", "v 0 0 0\nv 1 0 0\nv 1 1 0\nv 0 1 0\nf 1 2 3 4\n")
+        self.assertEqual(register_mesh(path), "quad")
+        try:
+            self.assertEqual(len(figures["quad"].edge_indices), 4)
+            # an imported mesh does not replace an example of the same name
+            with self.assertRaises(ValueError):
+                register_mesh(path)
+            with self.assertRaises(ValueError):
+                register_mesh(path, "Cube")
+        finally:
+            del figures["quad"]
+        self.assertEqual(len(figures["Cube"].positions), 8)
+        with self.assertRaises(ValueError):
+            load_mesh(self.write("broken.obj", "v 0 0 0\nf 1 2 3\n"))
+        with self.assertRaises(ValueError):
+            load_mesh(self.write("mesh.3ds", ""))
+        header = "ply\nformat ascii 1.0\nelement vertex 1\n{}end_header\n0 0 0\n"
+        for properties in (
+            "property decimal x\nproperty float y\nproperty float z\n",
+            "property float x\nproperty float y\nproperty float\n",
+            "element face\n",
+        ):
+            with self.assertRaises(ValueError):
+                load_mesh(self.write("broken.ply", header.format(properties)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import tempfile
+import unittest
+
+from labs.lab4.bll.base_font import base_font
+from labs.lab4.bll.CustomGenerator import BUILTIN_FONTS, CustomGenerator
+from labs.lab4.bll.FontCompiler import FontCompiler
+from labs.lab4.dal.PackedFont import PackedFont
+
+FLF_FONT = """flf2a$ 2 1 4 -1 1
+test font
+ $@
+ $@@
+!@
+!@@
+"""
+
+
+class TestPackedFont(unittest.TestCase):
+    """
+    Unit tests for compiling fonts into the packed format and loading them back.
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "cap.afnt")
+        FontCompiler.compile_dict_font(base_font, self.path)
+        self.font = PackedFont(self.path)
+
+    def tearDown(self):
+        self.font.close()
+        self.folder.cleanup()
+
+    def test_header_values(self):
+        self.assertEqual(self.font["height"], base_font["height"])
+        self.assertEqual(self.font["width"], base_font["width"])
+        self.assertEqual(self.font["name"], base_font["name"])
+        self.assertTrue(self.font["is_breaks_lines"])
+        self.assertNotIn("replace_string", self.font)
+
+    def test_glyphs_round_trip(self):
+        symbols = self.font["symbols"]
+        self.assertEqual(len(symbols), len(base_font["symbols"]))
+        for char in "abc019?":
+            self.assertEqual(symbols[char], base_font["symbols"][char])
+        self.assertNotIn("~", symbols)
+
+    def test_generate_same_as_dict_font(self):
+        CustomGenerator.add_font("packed_cap", self.font)
+        try:
+            text = "hello, world 2024!"
+            self.assertEqual(
+                CustomGenerator.generate(text, font="packed_cap", width=60),
+                CustomGenerator.generate(text, font="cap", width=60),
+            )
+        finally:
+            del CustomGenerator.fonts["packed_cap"]
+
+    def test_compile_flf(self):
+        flf_path = os.path.join(self.folder.name, "tiny.flf")
+        with open(flf_path, "w", encoding="utf-8") as file:
+            file.write(FLF_FONT)
+        font = PackedFont(FontCompiler.compile_flf_font(flf_path))
+        self.assertEqual(font["height"], 2)
+        self.assertEqual(font["name"], "tiny")
+        self.assertEqual(font["symbols"]["!"], ["#", "#"])
+        self.assertEqual(font["symbols"][" "], ["  ", "  "])
+        font.close()
+
+    def test_close_with_atlas_arrays(self):
+        codes, widths, bitmaps = self.font.atlas()
+        # the arrays still use the map, it is closed when they are collected
+        self.font.close()
+        self.assertEqual(len(codes), len(base_font["symbols"]))
+        self.assertEqual(int(widths[0]), len(base_font["symbols"][chr(codes[0])][0]))
+        self.assertEqual(self.font["height"], base_font["height"])
+
+    def test_compile_builtin_fonts(self):
+        save_folder = os.path.join(self.folder.name, "fonts")
+        paths = FontCompiler.compile_builtin_fonts(save_folder)
+        self.assertEqual([path.stem for path in paths], list(BUILTIN_FONTS))
+        self.assertEqual(FontCompiler.compile_builtin_fonts(save_folder), [])
+        font = PackedFont(paths[1])
+        self.assertEqual(font["replace_string"], "oleh")
+        self.assertEqual(font["symbols"]["a"], base_font["symbols"]["a"])
+        font.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+
+import numpy as np
+
+from labs.lab5.bll.CameraWrapper import Camera
+from labs.lab5.bll.Culling import ray_boxes
+from labs.lab5.bll.FigureWrapper import FigureWrapper
+from labs.lab5.bll.Picking import ray_triangles, screen_ray
+from labs.lab5.bll.Scene import Scene
+from labs.lab5.bll.SoftwareRasterizer import look_at, perspective
+from labs.lab5.dal.Figure import FigureData
+
+
+class TestPicking(unittest.TestCase):
+    """
+    Unit tests for the ray picking of lab5 figures.
+    """
+
+    def setUp(self):
+        # a camera at (0, 0, 10) looking at the origin
+        view = look_at((0, 0, 10), (0, 0, 0), (0, 1, 0))
+        self.view_projection = perspective(45, 1, 0.1, 100) @ view
+
+    def test_screen_ray(self):
+        origin, direction = screen_ray(50, 50, 101, 101, self.view_projection)
+        np.testing.assert_allclose(origin, [0, 0, 9.9], atol=1e-9)
+        np.testing.assert_allclose(direction, [0, 0, -1], atol=1e-9)
+        _, corner = screen_ray(0, 0, 101, 101, self.view_projection)
+        self.assertTrue(corner[0] < 0 < corner[1])
+
+    def test_ray_triangles_and_boxes(self):
+        corners = np.array([[0, 0, 0], [0, 0, -2], [5, 5, 0]], dtype=float)
+        edges = np.array([[1, 0, 0], [1, 0, 0], [1, 0, 0]], dtype=float)
+        others = np.array([[0, 1, 0], [0, 1, 0], [0, 1, 0]], dtype=float)
+        distances = ray_triangles((0.2, 0.2, 5), (0, 0, -1), corners, edges, others)
+        np.testing.assert_allclose(distances, [5, 7, np.inf])
+        minimums = [[-1, -1, -1], [2, 2, 2], [-1, -1, 4]]
+        maximums = [[1, 1, 1], [3, 3, 3], [1, 1, 6]]
+        distances = ray_boxes((0, 0, 5), (0, 0, -1), minimums, maximums)
+        np.testing.assert_allclose(distances, [4, np.inf, 0])
+
+    def test_scene_picks_the_nearest_figure(self):
+        scene = Scene()
+        figures = []
+        for z in (-4, 0, 3):
+            figure = FigureWrapper.create("Cube")
+            figure.translate(0, 0, z)
+            scene.add_figure(figure)
+            figures.append(figure)
+        origin, direction = screen_ray(50, 50, 101, 101, self.view_projection)
+        figure, distance = scene.pick(origin, direction)
+        self.assertIs(figure, figures[2])
+        self.assertAlmostEqual(distance, 5.9)
+        figures[2].translate(10, 0, 0)
+        self.assertIs(scene.pick(origin, direction)[0], figures[1])
+        self.assertIsNone(scene.pick(origin, (0, 1, 0))[0])
+
+    def test_large_mesh_matches_every_triangle(self):
+        figure = FigureWrapper.create_procedural("UV sphere", 96)
+        figure.scale(2, 1, 1)
+        figure.translate(1, 0, 0)
+        data = figure.data
+        # every face is split into triangles in the world, without the cache of the figure
+        triangles = []
+        for start, end in zip(data.face_offsets[:-1], data.face_offsets[1:]):
+            face = data.world_positions[data.face_indices[start:end]]
+            triangles += [(face[0], face[i], face[i + 1]) for i in range(1, len(face) - 1)]
+        triangles = np.array(triangles)
+        rng = np.random.default_rng(2)
+        for _ in range(50):
+            origin, direction = rng.uniform(-4, 4, 3), rng.normal(size=3)
+            expected = ray_triangles(
+                origin,
+                direction,
+                triangles[:, 0],
+                triangles[:, 1] - triangles[:, 0],
+                triangles[:, 2] - triangles[:, 0],
+            ).min()
+            distance = figure.intersect_ray(origin, direction)
+            self.assertAlmostEqual(distance, expected, places=6)
+
+    def test_figures_without_faces_use_their_box(self):
+        positions = np.array([[-1, -1, 0], [1, 1, 0]], dtype=np.float32)
+        figure = FigureWrapper(FigureData.from_arrays(positions, [[0, 1]]))
+        self.assertAlmostEqual(figure.intersect_ray((0, 0, 5), (0, 0, -1)), 5)
+        self.assertEqual(figure.intersect_ray((3, 0, 5), (0, 0, -1)), np.inf)
+
+    def test_picker_uses_the_camera_data(self):
+        scene = Scene()
+        scene.set_camera(Camera.create((0, 0, 10), (0, 0, 0), (0, 1, 0), fovy=45))
+        scene.picker.set_viewport(101, 101)
+        np.testing.assert_allclose(
+            scene.picker.view_projection(), self.view_projection, atol=1e-6
+        )
+        cube = FigureWrapper.create("Cube")
+        scene.add_figure(cube)
+        scene.handle_click(50, 50, 0)
+        self.assertIs(scene.data.selected_figure, cube)
+        self.assertTrue(cube.data.selected)
+        scene.handle_click(0, 0, 0)
+        self.assertIsNone(scene.data.selected_figure)
+        self.assertFalse(cube.data.selected)
+        # the camera moved, the cached matrices are computed again
+        scene.data.camera.translate(5, 0, 0)
+        self.assertIsNone(scene.picker.pick(50, 50))
+
+    def test_pick_rect_and_frame_bounds(self):
+        scene = Scene()
+        scene.set_camera(Camera.create((0, 0, 10), (0, 0, 0), (0, 1, 0), fovy=45))
+        scene.picker.set_viewport(101, 101)
+        figures = []
+        for x in (-3, 0, 3):
+            figure = FigureWrapper.create("Pyramid")
+            figure.translate(x, 0, 0)
+            scene.add_figure(figure)
+            figures.append(figure)
+        self.assertEqual(scene.picker.pick_rect(0, 0, 100, 100), figures)
+        self.assertEqual(scene.picker.pick_rect(45, 45, 55, 55), figures[1:2])
+        self.assertEqual(scene.picker.pick_rect(0, 0, 5, 5), [])
+        scene.select_rect(75, 0, 100, 100)
+        self.assertEqual(scene.data.selected_figures, figures[2:])
+        self.assertIs(scene.data.selected_figure, figures[2])
+        figures[0].translate(0, 0, 5)
+        self.assertIs(scene.picker.pick(50, 50), figures[1])
+        # a figure moved into the ray is picked after the next frame
+        figures[0].translate(3, 0, 0)
+        self.assertIs(scene.picker.pick(50, 50), figures[1])
+        scene.invalidate()
+        self.assertIs(scene.picker.pick(50, 50), figures[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
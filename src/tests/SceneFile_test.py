@@ -0,0 +1,137 @@
+import json
+import mmap
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from labs.lab5.bll.CameraWrapper import Camera
+from labs.lab5.bll.FigureWrapper import FigureWrapper
+from labs.lab5.bll.Scene import Scene
+from labs.lab5.dal.SceneFile import geometry_path, load_scene_file
+
+
+class TestSceneFile(unittest.TestCase):
+    """
+    Unit tests for saving and opening lab5 scene files.
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, "scenes", "scene.json")
+        self.scene = Scene()
+        self.scene.set_camera(Camera.create((1, 2, 10), (0, 0, 0), (0, 1, 0), fovy=50))
+        self.scene.data.highlight_color = (1, 0, 0)
+        for x in (-2, 2):
+            cube = FigureWrapper.create("Cube")
+            cube.translate(x, 0, 0)
+            cube.rotate(10, 20, 30)
+            self.scene.add_figure(cube)
+        self.scene.data.figures[1].set_color((0, 0, 1))
+        self.scene.data.figures[1].set_draw_mode("faces")
+        terrain = FigureWrapper.create_procedural("Terrain", heights=np.eye(20))
+        terrain.update_level_of_detail(100)
+        self.scene.add_figure(terrain)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_round_trip(self):
+        self.scene.save(self.path)
+        loaded = Scene()
+        loaded.load(self.path)
+        self.assertEqual(len(loaded.data.figures), 3)
+        for saved, figure in zip(self.scene.data.figures, loaded.data.figures):
+            np.testing.assert_array_equal(
+                figure.data.world_positions, saved.data.world_positions
+            )
+            np.testing.assert_array_equal(figure.data.edge_indices, saved.data.edge_indices)
+            np.testing.assert_array_equal(figure.data.face_offsets, saved.data.face_offsets)
+            self.assertEqual(figure.data.color, saved.data.color)
+            self.assertEqual(figure.data.draw_mode, saved.data.draw_mode)
+        camera = loaded.data.camera.data
+        np.testing.assert_allclose(camera.position, [1, 2, 10])
+        self.assertEqual(camera.fovy, 50)
+        self.assertEqual(loaded.data.highlight_color, (1, 0, 0))
+        # the terrain keeps its levels of detail and the shown level
+        terrain = loaded.data.figures[2]
+        self.assertEqual(terrain.lod.levels.index(terrain.data), 4)
+        terrain.update_level_of_detail(1)
+        self.assertEqual(len(terrain.data.positions), 8 * 8)
+        np.testing.assert_array_equal(terrain.lod.parameters["heights"], np.eye(20))
+
+    def test_geometry_is_mapped_and_shared(self):
+        self.scene.save(self.path)
+        manifest, arrays = load_scene_file(self.path)
+        with open(self.path, encoding="utf-8") as file:
+            self.assertEqual(json.load(file)["geometry"], "scene.npy")
+        first, second = manifest["figures"][:2]
+        # the cubes have the same vertices and edges, they are saved once
+        self.assertEqual(first["positions"], second["positions"])
+        self.assertEqual(first["edge_indices"], second["edge_indices"])
+        self.assertNotEqual(first["vertex_colors"], second["vertex_colors"])
+        base = arrays[0]
+        while isinstance(base, np.ndarray) and not isinstance(base, np.memmap):
+            base = base.base
+        self.assertIsInstance(base, (np.memmap, mmap.mmap))
+        # changes of an open scene do not change the file until it is saved
+        loaded = Scene()
+        loaded.load(self.path)
+        loaded.data.figures[0].data.vertices[0].position = (5, 5, 5)
+        np.testing.assert_array_equal(
+            loaded.data.figures[1].data.positions,
+            self.scene.data.figures[1].data.positions,
+        )
+        reopened = Scene()
+        reopened.load(self.path)
+        np.testing.assert_array_equal(
+            reopened.data.figures[0].data.positions,
+            self.scene.data.figures[0].data.positions,
+        )
+        loaded.save(self.path)
+        reopened.load(self.path)
+        moved = reopened.data.figures[0].data.world_positions[0]
+        np.testing.assert_allclose(moved, [5, 5, 5], atol=1e-5)
+        self.assertTrue(os.path.exists(geometry_path(self.path)))
+
+    def test_errors(self):
+        path = os.path.join(self.folder.name, "other.json")
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"figures": []}, file)
+        with self.assertRaises(ValueError):
+            Scene().load(path)
+        with self.assertRaises(OSError):
+            Scene().load(os.path.join(self.folder.name, "missing.json"))
+        self.scene.save(self.path)
+        with open(self.path, encoding="utf-8") as file:
+            manifest = json.load(file)
+        for name, value in (("positions", 100), ("positions", -1), ("lod", None)):
+            broken = json.loads(json.dumps(manifest))
+            if name == "lod":
+                broken["figures"][2]["lod"]["level"] = 9
+            else:
+                broken["figures"][0][name] = value
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump(broken, file)
+            with self.assertRaises(ValueError):
+                Scene().load(self.path)
+
+    def test_load_releases_buffers(self):
+        class Buffers:
+            released = 0
+
+            def release(self):
+                Buffers.released += 1
+
+        self.scene.save(self.path)
+        old_figures = list(self.scene.data.figures)
+        for figure in old_figures:
+            figure._buffers = Buffers()
+        self.scene.load(self.path)
+        self.assertEqual(Buffers.released, 3)
+        self.assertTrue(all(figure._buffers is None for figure in old_figures))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+from labs.lab5.bll.SoftwareRasterizer import SoftwareRasterizer, look_at, perspective
+from labs.lab5.ui.Renderer import SoftwareAsciiRenderer
+from shared.services.ansi_escape import strip_ansi
+
+ASCII_CHARS = ["@", "#", "S", "%", "?", "*", "+", ";", ":", ",", "."]
+
+
+def square(z, size=1.0):
+    return [(-size, -size, z), (size, -size, z), (size, size, z), (-size, size, z)]
+
+
+class TestSoftwareRasterizer(unittest.TestCase):
+    """
+    Unit tests for the NumPy software rasterizer of lab5.
+    """
+
+    def setUp(self):
+        self.rasterizer = SoftwareRasterizer(64, 48)
+        self.rasterizer.set_view(look_at((0, 0, 5), (0, 0, 0), (0, 1, 0)))
+        self.rasterizer.set_projection(perspective(45, 64 / 48, 0.1, 100))
+
+    def test_matrices_match_glu(self):
+        view = look_at((1, 2, 3), (1, 2, 0), (0, 1, 0))
+        np.testing.assert_allclose(view[:3, 3], [-1, -2, -3])
+        projection = perspective(90, 2, 1, 3)
+        np.testing.assert_allclose(projection[:2, :2], [[0.5, 0], [0, 1]])
+        np.testing.assert_allclose(projection[2:, 2:], [[-2, -3], [-1, 0]])
+        # the near plane maps to depth 0, the far plane to depth 1
+        self.rasterizer.set_projection(perspective(45, 64 / 48, 1, 9))
+        depths = self.rasterizer.project([(0, 0, 4), (0, 0, -4)])[:, 2]
+        np.testing.assert_allclose(depths, [0, 1], atol=1e-9)
+
+    def test_depth_test_keeps_the_nearest_polygon(self):
+        red, green = (1, 0, 0), (0, 1, 0)
+        self.rasterizer.draw_polygons([square(1)], [red])
+        self.rasterizer.draw_polygons([square(0, 2)], [green])
+        frame = self.rasterizer.frame
+        self.assertEqual(frame[24, 32].tolist(), [255, 0, 0])
+        self.assertEqual(frame[24, 2].tolist(), [0, 0, 0])
+        green_cells = np.all(frame == [0, 255, 0], axis=2)
+        self.assertTrue(green_cells.any())
+        self.assertFalse(green_cells[20:28, 28:36].any())
+
+    def test_lines_are_clipped_by_the_near_plane(self):
+        self.rasterizer.draw_lines([(0, 0, 0)], [(0, 0, 10)], (1, 1, 1))
+        self.rasterizer.draw_lines([(-1, 0, 0)], [(1, 0, 0)], (0, 0, 1), width=3)
+        blue = np.all(self.rasterizer.frame == [0, 0, 255], axis=2)
+        blue_rows = np.flatnonzero(blue.any(axis=1))
+        self.assertEqual(len(blue_rows), 3)
+        self.assertEqual(self.rasterizer.stats["lines"], 2)
+
+    def test_headless_render_is_deterministic(self):
+        renderer = SoftwareAsciiRenderer(64, 48, 8, ASCII_CHARS)
+
+        def draw(rasterizer):
+            rasterizer.set_view(self.rasterizer.view)
+            rasterizer.set_projection(self.rasterizer.projection)
+            rasterizer.draw_polygons([square(0)], [(1, 1, 1)])
+
+        first = renderer.display(draw)
+        frame = renderer.read_frame().copy()
+        self.assertEqual(renderer.display(draw), first)
+        np.testing.assert_array_equal(renderer.read_frame(), frame)
+        rows = strip_ansi(first).split("\n")
+        self.assertEqual(len(rows), 8)
+        self.assertIn(".", rows[4])
+        self.assertEqual(set(rows[0]), {"@"})
+
+
+if __name__ == "__main__":
+    unittest.main()
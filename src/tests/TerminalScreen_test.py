@@ -0,0 +1,61 @@
+import io
+import unittest
+
+import numpy as np
+
+from shared.classes.terminal_screen import TerminalScreen, pack_rgb, text_to_codes
+from shared.services.ansi_escape import strip_ansi
+
+
+class TestTerminalScreen(unittest.TestCase):
+    """
+    Unit tests for writing only the changed cells of terminal frames.
+    """
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        self.screen = TerminalScreen(2, 10, origin=(3, 1), stream=self.stream)
+
+    def test_first_frame_is_written_whole(self):
+        output = self.screen.diff(text_to_codes(["hello", "world"], 10))
+        self.assertIn("\x1b[3;1H", output)
+        self.assertIn("\x1b[4;1H", output)
+        self.assertEqual(strip_ansi(output), "hello     world     ")
+
+    def test_only_changed_cells_are_written(self):
+        self.screen.diff(text_to_codes(["hello", "world"], 10))
+        output = self.screen.diff(text_to_codes(["hello", "worlD"], 10))
+        self.assertEqual(output.count("\x1b[4;5H"), 1)
+        self.assertNotIn("\x1b[3;", output)
+        self.assertEqual(strip_ansi(output), "D")
+        self.assertEqual(self.screen.diff(text_to_codes(["hello", "worlD"], 10)), "")
+
+    def test_close_runs_are_merged(self):
+        self.screen.diff(text_to_codes(["abcdefghij", ""], 10))
+        output = self.screen.diff(text_to_codes(["AbcdEfghij", ""], 10))
+        self.assertEqual(strip_ansi(output), "AbcdE")
+        self.assertEqual(output.count("H"), 1)
+
+    def test_color_change_rewrites_cells(self):
+        chars = text_to_codes(["ab", "cd"], 10)
+        self.screen.diff(chars)
+        colors = np.full((2, 10), -1)
+        colors[1, 0] = pack_rgb([255, 0, 0])
+        output = self.screen.diff(chars, colors)
+        self.assertIn("\x1b[38;2;255;0;0m", output)
+        self.assertEqual(strip_ansi(output), "c")
+
+    def test_color_ids_index_escapes(self):
+        escapes = ["\x1b[31m", "\x1b[38;5;46m"]
+        screen = TerminalScreen(1, 4, stream=self.stream, escapes=escapes)
+        output = screen.diff(text_to_codes(["abcd"]), [[0, 0, 1, 1]])
+        self.assertIn("\x1b[31mab", output)
+        self.assertIn("\x1b[38;5;46mcd", output)
+
+    def test_draw_writes_into_stream(self):
+        written = self.screen.draw(text_to_codes(["x"], 10), 0)
+        self.assertEqual(len(self.stream.getvalue()), written)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from labs.lab3.bll.PyfigletGenerator import PyfigletGenerator
+from labs.lab3.bll.TextLayout import TextLayout
+from labs.lab4.bll.CustomGenerator import CustomGenerator
+
+TEXT = "the quick brown fox jumps over the lazy dog"
+
+
+class TestTextLayout(unittest.TestCase):
+    """
+    Unit tests for fitting text into width and height limits with real glyph widths.
+    """
+
+    def test_words_are_kept_whole(self):
+        layout = TextLayout(CustomGenerator())
+        lines = layout.fit(TEXT, "cap", 60, 10)
+        self.assertEqual(" ".join(lines), TEXT)
+        for line in lines:
+            widths = sum(layout.glyph_width("cap", char) for char in line)
+            self.assertLessEqual(widths, 60)
+
+    def test_lines_are_limited(self):
+        layout = TextLayout(CustomGenerator())
+        lines = layout.fit(TEXT, "cap", 60, 2)
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(TEXT.startswith(" ".join(lines)))
+
+    def test_fitted_figlet_lines_are_not_wrapped(self):
+        generator = PyfigletGenerator()
+        layout = TextLayout(generator)
+        for font in ("standard", "slant", "banner"):
+            lines = layout.fit(TEXT, font, 70, 4)
+            self.assertTrue(lines)
+            for line in lines:
+                self.assertEqual(
+                    generator.generate(line, font=font, width=70),
+                    generator.generate(line, font=font, width=1000),
+                )
+
+    def test_kerning_fits_more_than_glyph_widths(self):
+        layout = TextLayout(PyfigletGenerator())
+        text = "abcdefghijklmnopqrstuvwxyz"
+        count = layout.fit_line(text, "standard", 60)
+        widths = sum(layout.glyph_width("standard", char) for char in text[:count])
+        self.assertGreater(widths, 59)
+
+
+if __name__ == "__main__":
+    unittest.main()